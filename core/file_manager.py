@@ -3,11 +3,20 @@ Git Merge Orchestrator - 文件级管理器
 负责文件级处理，替代原有的组分配系统，实现更精确的文件级任务分配和合并
 """
 
-import json
+import os
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 from config import WORK_DIR_NAME
+from utils.file_helper import load_json_file, dump_json_file, ensure_dir
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# 计入"待处理"负载的文件状态
+_PENDING_STATUSES = frozenset({"assigned", "in_progress"})
 
 
 class FileManager:
@@ -17,8 +26,17 @@ class FileManager:
         self.repo_path = Path(repo_path)
         self.ignore_manager = ignore_manager
         self.work_dir = self.repo_path / WORK_DIR_NAME
-        self.work_dir.mkdir(exist_ok=True)
+        ensure_dir(self.work_dir)
         self.file_plan_path = self.work_dir / "file_plan.json"
+        # 二进制副本，仅在安装了 msgpack 时读写；JSON 仍是权威格式
+        self.file_plan_msgpack_path = self.work_dir / "file_plan.msgpack"
+
+        # 只读查询使用的计划缓存: ((mtime_ns, size), file_plan)
+        self._plan_cache = (None, None)
+        # 缓存计划对应的 路径 -> file_info 索引，随缓存一同失效
+        self._path_index = None
+        # 缓存计划对应的完成统计: (file_plan, stats)，计划重新加载后自动失效
+        self._completion_stats = (None, None)
 
     def create_file_plan(
         self, source_branch, target_branch, integration_branch, changed_files
@@ -64,16 +82,79 @@ class FileManager:
 
     def save_file_plan(self, file_plan):
         """保存文件级计划"""
-        with open(self.file_plan_path, "w", encoding="utf-8") as f:
-            json.dump(file_plan, f, indent=2, ensure_ascii=False)
+        dump_json_file(file_plan, self.file_plan_path)
+        self._plan_cache = (None, None)
+        self._path_index = None
+
+        if msgpack is not None:
+            try:
+                with open(self.file_plan_msgpack_path, "wb") as f:
+                    f.write(msgpack.packb(file_plan, use_bin_type=True))
+            except (OSError, TypeError, ValueError):
+                # 副本写入失败不影响 JSON，删除可能残留的不完整副本
+                self._remove_msgpack_copy()
 
     def load_file_plan(self):
         """加载文件级计划"""
         if not self.file_plan_path.exists():
             return None
 
-        with open(self.file_plan_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        file_plan = self._load_msgpack_copy()
+        if file_plan is not None:
+            return file_plan
+
+        return load_json_file(self.file_plan_path)
+
+    def _load_msgpack_copy(self):
+        """读取不早于 JSON 的 msgpack 副本，不可用时返回None"""
+        if msgpack is None:
+            return None
+
+        try:
+            if (
+                self.file_plan_msgpack_path.stat().st_mtime_ns
+                < self.file_plan_path.stat().st_mtime_ns
+            ):
+                return None
+            with open(self.file_plan_msgpack_path, "rb") as f:
+                return msgpack.unpackb(f.read(), raw=False)
+        except (OSError, ValueError):
+            return None
+
+    def _remove_msgpack_copy(self):
+        """删除 msgpack 副本"""
+        try:
+            self.file_plan_msgpack_path.unlink()
+        except OSError:
+            pass
+
+    def _read_file_plan(self):
+        """只读方式加载计划，文件未变化（mtime与大小一致）时复用缓存
+
+        返回的对象被多个查询共享，调用方不得修改；需要修改请使用 load_file_plan。
+        """
+        try:
+            st = os.stat(self.file_plan_path)
+        except OSError:
+            return None
+
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if self._plan_cache[0] == stat_key:
+            return self._plan_cache[1]
+
+        file_plan = self.load_file_plan()
+        self._path_index = None
+        if file_plan is not None:
+            self._plan_cache = (stat_key, file_plan)
+        return file_plan
+
+    @staticmethod
+    def _build_path_index(files):
+        """构建 路径 -> file_info 索引（路径重复时保留第一条，与线性查找一致）"""
+        index = {}
+        for file_info in files:
+            index.setdefault(file_info["path"], file_info)
+        return index
 
     def assign_file_to_contributor(self, file_path, assignee, reason=""):
         """将文件分配给贡献者"""
@@ -81,21 +162,21 @@ class FileManager:
         if not file_plan:
             return False
 
-        for file_info in file_plan["files"]:
-            if file_info["path"] == file_path:
-                file_info["assignee"] = assignee
-                file_info["status"] = "assigned"
-                file_info["assigned_at"] = datetime.now().isoformat()
-                file_info["assignment_reason"] = reason
+        file_info = self._build_path_index(file_plan["files"]).get(file_path)
+        if file_info is None:
+            return False
 
-                self.save_file_plan(file_plan)
-                return True
+        file_info["assignee"] = assignee
+        file_info["status"] = "assigned"
+        file_info["assigned_at"] = datetime.now().isoformat()
+        file_info["assignment_reason"] = reason
 
-        return False
+        self.save_file_plan(file_plan)
+        return True
 
     def get_files_by_assignee(self, assignee):
         """获取指定负责人的所有文件"""
-        file_plan = self.load_file_plan()
+        file_plan = self._read_file_plan()
         if not file_plan:
             return []
 
@@ -105,7 +186,7 @@ class FileManager:
 
     def get_files_by_directory(self, directory):
         """获取指定目录的所有文件"""
-        file_plan = self.load_file_plan()
+        file_plan = self._read_file_plan()
         if not file_plan:
             return []
 
@@ -113,7 +194,7 @@ class FileManager:
 
     def get_files_by_status(self, status):
         """获取指定状态的文件"""
-        file_plan = self.load_file_plan()
+        file_plan = self._read_file_plan()
         if not file_plan:
             return []
 
@@ -125,17 +206,17 @@ class FileManager:
         if not file_plan:
             return False
 
-        for file_info in file_plan["files"]:
-            if file_info["path"] == file_path:
-                file_info["status"] = "completed"
-                file_info["completed_at"] = datetime.now().isoformat()
-                if notes:
-                    file_info["notes"] = notes
+        file_info = self._build_path_index(file_plan["files"]).get(file_path)
+        if file_info is None:
+            return False
 
-                self.save_file_plan(file_plan)
-                return True
+        file_info["status"] = "completed"
+        file_info["completed_at"] = datetime.now().isoformat()
+        if notes:
+            file_info["notes"] = notes
 
-        return False
+        self.save_file_plan(file_plan)
+        return True
 
     def mark_assignee_files_completed(self, assignee):
         """标记指定负责人的所有文件为已完成"""
@@ -162,7 +243,7 @@ class FileManager:
 
     def get_completion_stats(self):
         """获取完成统计"""
-        file_plan = self.load_file_plan()
+        file_plan = self._read_file_plan()
         if not file_plan:
             return {
                 "total_files": 0,
@@ -172,14 +253,23 @@ class FileManager:
                 "in_progress_files": 0,
             }
 
+        if self._completion_stats[0] is file_plan:
+            return dict(self._completion_stats[1])
+
         files = file_plan["files"]
         total_files = len(files)
-        assigned_files = len([f for f in files if f["assignee"]])
-        completed_files = len([f for f in files if f["status"] == "completed"])
-        pending_files = len([f for f in files if f["status"] == "pending"])
-        in_progress_files = len([f for f in files if f["status"] == "in_progress"])
+        assigned_files = 0
+        status_counts = defaultdict(int)
+        for file_info in files:
+            if file_info["assignee"]:
+                assigned_files += 1
+            status_counts[file_info["status"]] += 1
+
+        completed_files = status_counts["completed"]
+        pending_files = status_counts["pending"]
+        in_progress_files = status_counts["in_progress"]
 
-        return {
+        stats = {
             "total_files": total_files,
             "assigned_files": assigned_files,
             "completed_files": completed_files,
@@ -192,10 +282,12 @@ class FileManager:
             if total_files > 0
             else 0,
         }
+        self._completion_stats = (file_plan, stats)
+        return dict(stats)
 
     def get_workload_distribution(self):
         """获取工作负载分布"""
-        file_plan = self.load_file_plan()
+        file_plan = self._read_file_plan()
         if not file_plan:
             return {}
 
@@ -212,7 +304,7 @@ class FileManager:
 
             if file_info["status"] == "completed":
                 workload[assignee]["completed"] += 1
-            elif file_info["status"] in ["assigned", "in_progress"]:
+            elif file_info["status"] in _PENDING_STATUSES:
                 workload[assignee]["pending"] += 1
 
             workload[assignee]["assigned"] += 1
@@ -221,7 +313,7 @@ class FileManager:
 
     def get_directory_summary(self):
         """获取目录级汇总信息"""
-        file_plan = self.load_file_plan()
+        file_plan = self._read_file_plan()
         if not file_plan:
             return {}
 
@@ -255,15 +347,13 @@ class FileManager:
 
     def find_file_by_path(self, file_path):
         """根据路径查找文件信息"""
-        file_plan = self.load_file_plan()
+        file_plan = self._read_file_plan()
         if not file_plan:
             return None
 
-        for file_info in file_plan["files"]:
-            if file_info["path"] == file_path:
-                return file_info
-
-        return None
+        if self._path_index is None:
+            self._path_index = self._build_path_index(file_plan["files"])
+        return self._path_index.get(file_path)
 
     def update_file_priority(self, file_path, priority):
         """更新文件优先级"""
@@ -271,17 +361,17 @@ class FileManager:
         if not file_plan:
             return False
 
-        for file_info in file_plan["files"]:
-            if file_info["path"] == file_path:
-                file_info["priority"] = priority
-                self.save_file_plan(file_plan)
-                return True
+        file_info = self._build_path_index(file_plan["files"]).get(file_path)
+        if file_info is None:
+            return False
 
-        return False
+        file_info["priority"] = priority
+        self.save_file_plan(file_plan)
+        return True
 
     def get_files_by_priority(self, priority):
         """获取指定优先级的文件"""
-        file_plan = self.load_file_plan()
+        file_plan = self._read_file_plan()
         if not file_plan:
             return []
 
@@ -301,20 +391,18 @@ class FileManager:
 
         assigned_count = 0
         assignment_time = datetime.now().isoformat()
+        path_index = self._build_path_index(file_plan["files"])
 
         for assignment in assignments:
-            file_path = assignment.get("file_path")
-            assignee = assignment.get("assignee")
-            reason = assignment.get("reason", "")
-
-            for file_info in file_plan["files"]:
-                if file_info["path"] == file_path:
-                    file_info["assignee"] = assignee
-                    file_info["status"] = "assigned"
-                    file_info["assigned_at"] = assignment_time
-                    file_info["assignment_reason"] = reason
-                    assigned_count += 1
-                    break
+            file_info = path_index.get(assignment.get("file_path"))
+            if file_info is None:
+                continue
+
+            file_info["assignee"] = assignment.get("assignee")
+            file_info["status"] = "assigned"
+            file_info["assigned_at"] = assignment_time
+            file_info["assignment_reason"] = assignment.get("reason", "")
+            assigned_count += 1
 
         if assigned_count > 0:
             self.save_file_plan(file_plan)
@@ -596,13 +596,14 @@ echo " - 考虑在合并后创建临时分支备份"
 
     def merge_group(self, group_name, source_branch, target_branch, integration_branch):
         """合并指定组的文件 - 使用真正三路合并"""
-        plan = self.file_helper.load_plan()
-        if not plan:
+        # 只需查找单个组，流式读取计划，找到后即停止
+        groups = self.file_helper.iter_groups()
+        if groups is None:
             print("❌ 合并计划文件不存在，请先运行创建合并计划")
             return False
 
         # 找到对应组
-        group_info = self.file_helper.find_group_by_name(plan, group_name)
+        group_info = next((group for group in groups if group["name"] == group_name), None)
         if not group_info:
             print(f"❌ 未找到组: {group_name}")
             return False
@@ -4,6 +4,7 @@ Git Merge Orchestrator - 加速优化贡献者分析器
 """
 
 import json
+import re
 import hashlib
 import threading
 from datetime import datetime, timedelta
@@ -24,6 +25,11 @@ from utils.performance_monitor import (
 )
 from utils.smart_cache import get_cache_manager
 
+# 文件重要性评分规则（_sort_files_by_importance 使用）
+_CORE_ENTRY_FILES = frozenset({"main.py", "index.js", "index.ts", "app.py"})
+_IMPORTANCE_KEYWORD_RE = re.compile(r"main|core|entry|bootstrap")
+_CONFIG_FILE_SUFFIXES = (".json", ".yml", ".yaml", ".cfg", ".ini")
+
 
 class OptimizedContributorAnalyzer:
     """优化贡献者分析器 - 修复批量分析逻辑"""
@@ -580,10 +586,9 @@ class OptimizedContributorAnalyzer:
 
         def importance_score(file_path):
             score = 0
-            file_name = file_path.split("/")[-1]
 
             # 核心文件得分最高
-            if file_name in ["main.py", "index.js", "index.ts", "app.py"]:
+            if file_path.rpartition("/")[2] in _CORE_ENTRY_FILES:
                 score += 100
 
             # 根目录文件得分较高
@@ -591,14 +596,11 @@ class OptimizedContributorAnalyzer:
                 score += 50
 
             # 特定关键词加分
-            if any(
-                keyword in file_path.lower()
-                for keyword in ["main", "core", "entry", "bootstrap"]
-            ):
+            if _IMPORTANCE_KEYWORD_RE.search(file_path.lower()):
                 score += 30
 
             # 配置文件加分
-            if file_path.endswith((".json", ".yml", ".yaml", ".cfg", ".ini")):
+            if file_path.endswith(_CONFIG_FILE_SUFFIXES):
                 score += 20
 
             return score
@@ -115,7 +115,7 @@ class PlanManager:
 
     def check_status(self):
         """检查合并状态"""
-        plan = self.file_helper.load_plan()
+        plan = self.file_helper.read_plan()
         if not plan:
             print("❌ 合并计划文件不存在，请先运行创建合并计划")
             return
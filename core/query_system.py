@@ -3,13 +3,20 @@ Git Merge Orchestrator - 高级查询系统
 提供多维度查询功能，支持模糊匹配和反向查询
 """
 
+import os
 import re
 import difflib
-from typing import List, Dict, Any, Optional, Union, Set
+from typing import List, Dict, Any, Optional, Union, Set, Tuple
 from pathlib import Path
 import fnmatch
 from datetime import datetime
 
+# 合法的组状态
+_VALID_STATUSES = frozenset({"pending", "in_progress", "completed", "conflict"})
+
+# 视为"未分配"的负责人取值（任务分配器会写入"未分配"占位）
+_EMPTY_ASSIGNEES = frozenset({None, "", "未分配"})
+
 
 class QuerySystem:
     """高级查询系统 - 支持多维度查询和模糊匹配"""
@@ -27,6 +34,11 @@ class QuerySystem:
         self.contributor_analyzer = contributor_analyzer
         self.ignore_manager = ignore_manager
 
+        # 计划数据缓存: ((mtime_ns, size), plan_data)
+        self._plan_cache = (None, None)
+        # 查询建议词表缓存: (plan_data, (assignees, extensions, directories, statuses))
+        self._suggestion_vocab = (None, None)
+
         # 查询缓存
         self._query_cache = {}
         self._cache_timeout = 300  # 5分钟缓存过期
@@ -34,7 +46,46 @@ class QuerySystem:
         # 模糊匹配阈值
         self.fuzzy_threshold = 0.6
         
+    def _get_plan_file_path(self):
+        """获取计划文件路径，无法确定时返回None"""
+        if hasattr(self.plan_manager, "plan_file_path"):
+            return self.plan_manager.plan_file_path
+        file_manager = getattr(self.plan_manager, "file_manager", None)
+        return getattr(file_manager, "file_plan_path", None)
+
     def _load_plan_data(self):
+        """加载计划数据，文件未变化（mtime与大小一致）时直接返回缓存"""
+        stat_key = None
+        plan_path = self._get_plan_file_path()
+        if plan_path is not None:
+            try:
+                st = os.stat(plan_path)
+                stat_key = (st.st_mtime_ns, st.st_size)
+            except (OSError, TypeError):
+                stat_key = None
+
+        if stat_key is not None and self._plan_cache[0] == stat_key:
+            return self._plan_cache[1]
+
+        plan_data = self._load_plan_data_uncached()
+        if plan_data is not None:
+            self._annotate_groups(plan_data)
+        if stat_key is not None and plan_data is not None:
+            self._plan_cache = (stat_key, plan_data)
+        return plan_data
+
+    @staticmethod
+    def _annotate_groups(plan_data):
+        """为每个组预先计算分配标记和文件数，供各查询复用
+
+        查询系统只读取计划数据、从不回写，带下划线前缀的字段不会进入计划文件。
+        """
+        for group in plan_data.get("groups", []):
+            assignee = group.get("assignee")
+            group["_is_assigned"] = bool(assignee and assignee.strip())
+            group["_file_count"] = len(group.get("files", []))
+
+    def _load_plan_data_uncached(self):
         """统一的计划数据加载方法，兼容不同的计划管理器"""
         try:
             # 支持不同的计划管理器接口
@@ -60,20 +111,22 @@ class QuerySystem:
         try:
             # 创建虚拟组结构
             groups = []
+            append_group = groups.append
             for file_data in file_plan.get('files', []):
+                get = file_data.get
+                path = get('path', 'unknown')
                 # 每个文件作为一个组
-                group = {
-                    'name': f"file_{file_data.get('path', 'unknown')}",
-                    'group_name': file_data.get('path', 'unknown'),
-                    'files': [file_data.get('path', 'unknown')],
-                    'assignee': file_data.get('assignee', ''),
-                    'status': file_data.get('status', 'pending'),
-                    'assignment_reason': file_data.get('assignment_reason', ''),
-                    'created_at': file_data.get('created_at', ''),
-                    'updated_at': file_data.get('updated_at', ''),
+                append_group({
+                    'name': f"file_{path}",
+                    'group_name': path,
+                    'files': [path],
+                    'assignee': get('assignee', ''),
+                    'status': get('status', 'pending'),
+                    'assignment_reason': get('assignment_reason', ''),
+                    'created_at': get('created_at', ''),
+                    'updated_at': get('updated_at', ''),
                     'file_count': 1
-                }
-                groups.append(group)
+                })
                 
             # 返回转换后的计划
             converted_plan = dict(file_plan)
@@ -126,6 +179,11 @@ class QuerySystem:
                 },
             }
 
+            # 工作负载统计与组信息在同一次遍历中累计
+            workload_stats = result["summary"]["workload_stats"]
+            for assignee in matched_assignees:
+                workload_stats[assignee] = {"groups": 0, "files": 0}
+
             # 收集匹配的组和文件信息
             for group in plan_data["groups"]:
                 assignee = group.get("assignee", "")
@@ -134,7 +192,7 @@ class QuerySystem:
                         "group_name": group.get("group_name", ""),
                         "assignee": assignee,
                         "files": group.get("files", []),
-                        "file_count": len(group.get("files", [])),
+                        "file_count": group["_file_count"],
                         "status": group.get("status", "pending"),
                         "assignment_reason": group.get("assignment_reason", ""),
                         "created_at": group.get("created_at", ""),
@@ -145,23 +203,16 @@ class QuerySystem:
                     result["summary"]["total_files"] += group_info["file_count"]
                     result["summary"]["total_groups"] += 1
 
+                    assignee_workload = workload_stats[assignee]
+                    assignee_workload["groups"] += 1
+                    assignee_workload["files"] += group_info["file_count"]
+
                     # 统计状态分布
                     status = group_info["status"]
                     result["summary"]["status_breakdown"][status] = (
                         result["summary"]["status_breakdown"].get(status, 0) + 1
                     )
 
-            # 计算工作负载统计
-            for assignee in matched_assignees:
-                assignee_groups = [
-                    r for r in result["results"] if r["assignee"] == assignee
-                ]
-                assignee_files = sum(g["file_count"] for g in assignee_groups)
-                result["summary"]["workload_stats"][assignee] = {
-                    "groups": len(assignee_groups),
-                    "files": assignee_files,
-                }
-
             # 缓存结果
             self._cache_result(cache_key, result)
             return result
@@ -220,7 +271,7 @@ class QuerySystem:
                         "group_name": group.get("group_name", ""),
                         "assignee": group.get("assignee", ""),
                         "matched_files": matched_files,
-                        "total_files": len(group.get("files", [])),
+                        "total_files": group["_file_count"],
                         "match_count": len(matched_files),
                         "status": group.get("status", "pending"),
                         "assignment_reason": group.get("assignment_reason", ""),
@@ -289,7 +340,7 @@ class QuerySystem:
                     group_info = {
                         "group_name": group.get("group_name", ""),
                         "assignee": group.get("assignee", ""),
-                        "file_count": len(group.get("files", [])),
+                        "file_count": group["_file_count"],
                         "status": group.get("status", "pending"),
                         "assignment_reason": group.get("assignment_reason", ""),
                         "created_at": group.get("created_at", ""),
@@ -361,7 +412,7 @@ class QuerySystem:
                         "group_name": group.get("group_name", ""),
                         "assignee": group.get("assignee", ""),
                         "files": group.get("files", []),
-                        "file_count": len(group.get("files", [])),
+                        "file_count": group["_file_count"],
                         "status": group.get("status", "pending"),
                         "assignment_reason": group.get("assignment_reason", ""),
                         "created_at": group.get("created_at", ""),
@@ -378,7 +429,12 @@ class QuerySystem:
         except Exception as e:
             return self._error_result(f"高级查询过程中出现错误: {e}")
 
-    def reverse_query(self, criteria: Dict[str, Any]) -> Dict[str, Any]:
+    def reverse_query(
+        self,
+        criteria: Dict[str, Any],
+        limit: Optional[int] = None,
+        include_counts: bool = False,
+    ) -> Dict[str, Any]:
         """
         反向查询 - 根据结果特征查找满足条件的记录
         
@@ -388,6 +444,8 @@ class QuerySystem:
                 - overloaded: 查找工作量过重的负责人
                 - empty_groups: 查找空组
                 - conflicted: 查找有冲突的组
+            limit: 未分配文件列表最多返回的条数（None表示全部）
+            include_counts: 是否在results中附带 total_unassigned / problematic_count
                 
         Returns:
             Dict: 查询结果
@@ -411,12 +469,16 @@ class QuerySystem:
 
             # 查找未分配的文件
             if criteria.get("unassigned", False):
-                unassigned = self._find_unassigned_files(plan_data)
+                unassigned, total_unassigned = self._find_unassigned_files(
+                    plan_data, limit
+                )
                 result["results"]["unassigned_files"] = unassigned
-                if unassigned:
-                    result["summary"]["issues_found"] += len(unassigned)
+                if include_counts:
+                    result["results"]["total_unassigned"] = total_unassigned
+                if total_unassigned:
+                    result["summary"]["issues_found"] += total_unassigned
                     result["summary"]["recommendations"].append(
-                        f"发现 {len(unassigned)} 个未分配文件，建议重新分配"
+                        f"发现 {total_unassigned} 个未分配文件，建议重新分配"
                     )
 
             # 查找工作量过重的负责人
@@ -445,6 +507,8 @@ class QuerySystem:
             if criteria.get("problematic", False):
                 problematic = self._find_problematic_groups(plan_data)
                 result["results"]["problematic_groups"] = problematic
+                if include_counts:
+                    result["results"]["problematic_count"] = len(problematic)
                 if problematic:
                     result["summary"]["issues_found"] += len(problematic)
                     result["summary"]["recommendations"].append(
@@ -473,26 +537,9 @@ class QuerySystem:
             if not plan_data or "groups" not in plan_data:
                 return suggestions
 
-            # 收集所有可能的查询目标
-            assignees = set()
-            file_extensions = set()
-            directories = set()
-            statuses = set()
-
-            for group in plan_data["groups"]:
-                assignees.add(group.get("assignee", ""))
-                statuses.add(group.get("status", "pending"))
-
-                for file_path in group.get("files", []):
-                    # 文件扩展名
-                    ext = Path(file_path).suffix
-                    if ext:
-                        file_extensions.add(f"*{ext}")
-
-                    # 目录路径
-                    directory = str(Path(file_path).parent)
-                    if directory != ".":
-                        directories.add(f"{directory}/*")
+            assignees, file_extensions, directories, statuses = (
+                self._get_suggestion_vocabulary(plan_data)
+            )
 
             # 基于部分查询生成建议
             query_lower = partial_query.lower()
@@ -525,37 +572,68 @@ class QuerySystem:
 
     # === 私有辅助方法 ===
 
+    def _get_suggestion_vocabulary(self, plan_data: Dict):
+        """收集所有可能的查询目标，同一份计划数据只计算一次"""
+        cached_plan, vocabulary = self._suggestion_vocab
+        if cached_plan is plan_data:
+            return vocabulary
+
+        assignees = set()
+        file_extensions = set()
+        directories = set()
+        statuses = set()
+
+        for group in plan_data["groups"]:
+            assignees.add(group.get("assignee", ""))
+            statuses.add(group.get("status", "pending"))
+
+            for file_path in group.get("files", []):
+                path = Path(file_path)
+
+                # 文件扩展名
+                ext = path.suffix
+                if ext:
+                    file_extensions.add(f"*{ext}")
+
+                # 目录路径
+                directory = str(path.parent)
+                if directory != ".":
+                    directories.add(f"{directory}/*")
+
+        vocabulary = (assignees, file_extensions, directories, statuses)
+        self._suggestion_vocab = (plan_data, vocabulary)
+        return vocabulary
+
     def _match_assignees(
         self, name: str, groups: List[Dict], fuzzy: bool, exact_match: bool
     ) -> Set[str]:
         """匹配负责人姓名"""
         matched = set()
         all_assignees = {
-            group.get("assignee", "") for group in groups if group.get("assignee")
-        }
+            group.get("assignee") for group in groups
+        } - _EMPTY_ASSIGNEES
 
-        for assignee in all_assignees:
-            if not assignee:
-                continue
+        if exact_match:
+            if name in all_assignees:
+                matched.add(name)
+            return matched
 
-            if exact_match:
-                if assignee == name:
-                    matched.add(assignee)
-            elif fuzzy:
+        name_lower = name.lower()
+        for assignee in all_assignees:
+            assignee_lower = assignee.lower()
+            if fuzzy:
                 # 使用difflib进行模糊匹配
                 similarity = difflib.SequenceMatcher(
-                    None, name.lower(), assignee.lower()
+                    None, name_lower, assignee_lower
                 ).ratio()
                 if similarity >= self.fuzzy_threshold:
                     matched.add(assignee)
                 # 同时支持部分匹配
-                elif (
-                    name.lower() in assignee.lower() or assignee.lower() in name.lower()
-                ):
+                elif name_lower in assignee_lower or assignee_lower in name_lower:
                     matched.add(assignee)
             else:
                 # 精确匹配（不区分大小写）
-                if name.lower() == assignee.lower():
+                if name_lower == assignee_lower:
                     matched.add(assignee)
 
         return matched
@@ -605,7 +683,7 @@ class QuerySystem:
                 return False
 
         # 文件数量条件
-        file_count = len(group.get("files", []))
+        file_count = group["_file_count"]
         if "min_files" in criteria and file_count < criteria["min_files"]:
             return False
         if "max_files" in criteria and file_count > criteria["max_files"]:
@@ -637,13 +715,21 @@ class QuerySystem:
 
         return matched
 
-    def _find_unassigned_files(self, plan_data: Dict) -> List[str]:
-        """查找未分配的文件"""
+    def _find_unassigned_files(
+        self, plan_data: Dict, limit: Optional[int] = None
+    ) -> Tuple[List[str], int]:
+        """查找未分配的文件，返回 (最多limit条的文件列表, 未分配文件总数)"""
         unassigned = []
+        total = 0
         for group in plan_data["groups"]:
-            if not group.get("assignee") or group.get("assignee").strip() == "":
-                unassigned.extend(group.get("files", []))
-        return unassigned
+            if not group["_is_assigned"]:
+                files = group.get("files", [])
+                if limit is None:
+                    unassigned.extend(files)
+                elif len(unassigned) < limit:
+                    unassigned.extend(files[: limit - len(unassigned)])
+                total += len(files)
+        return unassigned, total
 
     def _find_overloaded_assignees(self, plan_data: Dict, max_files: int) -> List[Dict]:
         """查找工作量过重的负责人"""
@@ -655,7 +741,7 @@ class QuerySystem:
                 if assignee not in assignee_workload:
                     assignee_workload[assignee] = {"groups": 0, "files": 0}
                 assignee_workload[assignee]["groups"] += 1
-                assignee_workload[assignee]["files"] += len(group.get("files", []))
+                assignee_workload[assignee]["files"] += group["_file_count"]
 
         overloaded = []
         for assignee, workload in assignee_workload.items():
@@ -701,7 +787,7 @@ class QuerySystem:
 
             # 检查状态是否合理
             status = group.get("status", "pending")
-            if status not in ["pending", "in_progress", "completed", "conflict"]:
+            if status not in _VALID_STATUSES:
                 issues.append("invalid_status")
 
             if issues:
@@ -742,6 +828,8 @@ class QuerySystem:
     def clear_cache(self):
         """清除查询缓存"""
         self._query_cache.clear()
+        self._plan_cache = (None, None)
+        self._suggestion_vocab = (None, None)
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
@@ -526,6 +526,9 @@ echo ""
 
 """
 
+        # 三路合并文件集合，避免逐文件在列表中线性查找
+        modified_in_both = set(analysis["modified_in_both"])
+
         # 批量处理每个文件
         for file_info in file_list:
             file_path = file_info["path"]
@@ -534,7 +537,7 @@ echo "📄 处理文件: {file_path}"
 
 """
 
-            if file_path in analysis["modified_in_both"]:
+            if file_path in modified_in_both:
                 script_content += f"""
 # 创建临时目录用于三路合并
 TEMP_DIR=$(mktemp -d)
@@ -139,7 +139,7 @@ class GitMergeOrchestrator:
     def integration_branch(self):
         """获取集成分支名"""
         if self._integration_branch is None:
-            plan = self.file_helper.load_plan()
+            plan = self.file_helper.read_plan()
             if plan:
                 self._integration_branch = plan.get("integration_branch")
         return self._integration_branch
@@ -362,7 +362,7 @@ class GitMergeOrchestrator:
 
     def _show_full_group_names(self):
         """显示完整的组名列表"""
-        plan = self.file_helper.load_plan()
+        plan = self.file_helper.read_plan()
         if not plan:
             DisplayHelper.print_error("合并计划文件不存在，请先运行创建合并计划")
             return
@@ -519,7 +519,7 @@ class GitMergeOrchestrator:
 
     def view_group_details(self, group_name=None):
         """查看分组详细信息"""
-        plan = self.file_helper.load_plan()
+        plan = self.file_helper.read_plan()
         if not plan:
             DisplayHelper.print_error("合并计划文件不存在，请先运行创建合并计划")
             return []
@@ -582,7 +582,7 @@ class GitMergeOrchestrator:
 
     def show_assignment_reasons(self):
         """显示所有组的分配原因分析"""
-        plan = self.file_helper.load_plan()
+        plan = self.file_helper.read_plan()
         if not plan:
             DisplayHelper.print_error("合并计划文件不存在，请先运行创建合并计划")
             return
@@ -643,7 +643,7 @@ class GitMergeOrchestrator:
             return self.file_plan_manager.search_files_by_assignee(assignee_name)
 
         # 传统组模式的处理逻辑
-        plan = self.file_helper.load_plan()
+        plan = self.file_helper.read_plan()
         if not plan:
             DisplayHelper.print_error("合并计划文件不存在，请先运行创建合并计划")
             return []
@@ -98,6 +98,22 @@ def test_unassigned_query():
         print(f"   期望: {expected_unassigned}")
         print(f"   实际: {actual_unassigned}")
     
+    # 测试4: 限制返回条数并附带计数
+    print("\n🔍 测试4: 限制未分配文件返回条数")
+    limited_result = query_system.reverse_query(
+        {"unassigned": True, "problematic": True}, limit=2, include_counts=True
+    )
+    limited_files = limited_result["results"]["unassigned_files"]
+    total_unassigned = limited_result["results"]["total_unassigned"]
+    print(f"  返回文件数量: {len(limited_files)} / 总数: {total_unassigned}")
+
+    if limited_files == actual_unassigned[:2] and total_unassigned == len(
+        expected_unassigned
+    ):
+        print("✅ 测试通过: limit 与计数结果正确")
+    else:
+        print("❌ 测试失败: limit 或计数结果不正确")
+
     # 清理测试数据
     try:
         import os
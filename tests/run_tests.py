@@ -136,6 +136,40 @@ def run_category_test(category):
         return False
 
 
+def run_category_tests(categories):
+    """在同一进程中依次运行多个类别的测试
+
+    每个类别输出一行 "CATEGORY_RESULT:<类别>:PASS|FAIL" 供统一测试运行器解析。
+
+    Returns:
+        bool: 所有类别是否都通过
+    """
+    try:
+        from comprehensive_test import ComprehensiveTestSuite, test_stats
+    except Exception as e:
+        print(f"❌ 运行测试时出错: {e}")
+        return False
+
+    suite = ComprehensiveTestSuite()
+    all_passed = True
+
+    for category in categories:
+        total_before = test_stats.total_tests
+        failed_before = len(test_stats.failed_tests)
+        try:
+            suite.run_all_tests([category])
+            ran = test_stats.total_tests - total_before
+            passed = ran > 0 and len(test_stats.failed_tests) == failed_before
+        except Exception as e:
+            print(f"❌ 运行 {category} 测试时出错: {e}")
+            passed = False
+
+        all_passed = all_passed and passed
+        print(f"CATEGORY_RESULT:{category}:{'PASS' if passed else 'FAIL'}")
+
+    return all_passed
+
+
 def main():
     """主函数"""
     try:
@@ -199,12 +233,17 @@ if __name__ == "__main__":
             except Exception as e:
                 print(f"❌ 运行测试失败: {e}")
                 sys.exit(1)
+        elif sys.argv[1] == "--category" and len(sys.argv) > 2:
+            categories = [c.strip() for c in sys.argv[2].split(",") if c.strip()]
+            success = run_category_tests(categories)
+            sys.exit(0 if success else 1)
         elif sys.argv[1] == "--help":
             print("🧪 Git Merge Orchestrator 测试运行器")
             print("用法:")
             print("  python run_tests.py           # 交互式菜单")
             print("  python run_tests.py --health  # 快速健康检查")
             print("  python run_tests.py --full    # 完整测试套件")
+            print("  python run_tests.py --category config,performance  # 指定类别测试")
             print("  python run_tests.py --help    # 显示此帮助")
         else:
             print("❌ 未知参数，使用 --help 查看用法")
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+忽略规则匹配测试 - 表驱动地校验 should_ignore 与 filter_files 的结果
+
+filter_files 按匹配类型分轮批量筛选，should_ignore 走单个路径的专用
+匹配函数；两条路径必须对同一规则集给出相同结果，且符合预期。
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.ignore_manager import IgnoreManager
+
+
+# 测试仓库结构: 以/结尾的是目录，其余是文件
+REPO_STRUCTURE = [
+    "dist/",
+    "dist/app.js",
+    "build",  # 与目录规则同名的无扩展名文件
+    "src/main.py",
+    "src/dist/app.js",
+    "src/cache/data.txt",
+    "settings/dev.conf",
+    "app/settings/prod.json",
+    "app/settingsx/prod.json",
+    "docs/settings/api.md",
+    "lib/node_modules/pkg/index.js",
+    "node_modules/pkg/index.js",
+    "logs/debug.log",
+    "conf.d/",  # 名称带点的目录
+    "conf.d/app.conf",
+    "v1.2/",
+    "data.d/",
+    "app/site.d/",
+    "notes.d",  # 名称带点的文件
+]
+
+# (场景, 规则列表 [(pattern, type)], 用例列表 [(路径, 是否忽略)])
+MATCH_TABLE = [
+    (
+        "以/结尾的目录规则",
+        [("dist/", "glob"), ("build/", "glob"), ("out/", "glob")],
+        [
+            ("dist", True),  # 磁盘上是目录
+            ("dist/", True),
+            ("dist/app.js", True),
+            ("./dist/app.js", True),
+            ("src/dist/app.js", False),  # 单级目录规则只从根目录匹配
+            ("build", False),  # 磁盘上是文件
+            ("out/", True),  # 不存在的路径，结尾的/表示目录
+            ("out", False),  # 不存在且无结尾/，按文件处理
+            ("build/out.o", True),
+            ("distribution/a.js", False),
+            ("src/main.py", False),
+        ],
+    ),
+    (
+        "名称带点的目录规则",
+        [
+            ("conf.d/", "glob"),
+            ("v1.2/", "glob"),
+            ("data.d/", "glob"),
+            ("notes.d/", "glob"),
+            ("app/site.d/", "glob"),
+        ],
+        [
+            ("conf.d", True),  # 磁盘上是目录，不能按扩展名当作文件
+            ("conf.d/", True),
+            ("conf.d/app.conf", True),
+            ("v1.2", True),
+            ("v1.2/notes.md", True),
+            ("data.d", True),
+            ("notes.d", False),  # 磁盘上是文件
+            ("src/conf.d", False),
+            ("app/site.d", True),
+            ("x/app/site.d/a.txt", True),
+        ],
+    ),
+    (
+        "**/name/ 目录规则",
+        [("**/node_modules/", "glob"), ("**/cache/", "glob")],
+        [
+            ("node_modules/pkg/index.js", True),
+            ("lib/node_modules/pkg/index.js", True),
+            ("src/cache/data.txt", True),
+            ("src/cache.txt", False),
+            ("src/my_node_modules/a.js", False),
+            ("src/main.py", False),
+        ],
+    ),
+    (
+        "多级目录规则",
+        [("app/settings/", "glob")],
+        [
+            ("app/settings/prod.json", True),
+            ("x/app/settings/prod.json", True),  # 多级规则可出现在任意位置
+            ("app/settingsx/prod.json", False),
+            ("settings/dev.conf", False),
+            ("docs/settings/api.md", False),
+            ("app/settings.json", False),
+        ],
+    ),
+    (
+        "文件 glob 规则",
+        [("*.log", "glob"), ("docs/*.md", "glob"), ("Makefile", "glob")],
+        [
+            ("logs/debug.log", True),
+            ("debug.log", True),
+            ("docs/api.md", True),
+            ("docs/settings/api.md", True),  # fnmatch 的 * 可以跨越/
+            ("README.md", False),
+            ("src/Makefile", True),  # 不含/的模式匹配文件名
+            ("Makefile.am", False),
+        ],
+    ),
+    (
+        "带标志的正则规则",
+        [(r"(?i)\.LOG$", "regex"), (r"(?x) \.bak  $", "regex")],
+        [
+            ("logs/debug.log", True),
+            ("debug.LoG", True),
+            ("log.txt", False),
+            ("src/a.bak", True),
+            ("src/a.bak.py", False),
+        ],
+    ),
+    (
+        "带分组的正则规则",
+        [(r"^(src)/gen/", "regex"), (r"(tmp|cache)/\1/", "regex")],
+        [
+            ("src/gen/a.py", True),
+            ("lib/src/gen/a.py", False),
+            ("cache/cache/x.txt", True),
+            ("tmp/cache/x.txt", False),
+        ],
+    ),
+    (
+        "精确、前缀、后缀规则",
+        [("src/main.py", "exact"), ("logs/", "prefix"), (".conf", "suffix")],
+        [
+            ("src/main.py", True),
+            ("./src/main.py", True),
+            ("src/main.pyc", False),
+            ("logs/debug.log", True),
+            ("settings/dev.conf", True),
+            ("src/cache/data.txt", False),
+        ],
+    ),
+]
+
+
+def _create_repo():
+    """创建测试仓库目录"""
+    repo = Path(tempfile.mkdtemp(prefix="ignore_matching_"))
+    for entry in REPO_STRUCTURE:
+        path = repo / entry
+        if entry.endswith("/"):
+            path.mkdir(parents=True, exist_ok=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+    return repo
+
+
+def _create_manager(repo, rules):
+    """创建只包含指定规则的忽略管理器，编译推迟到第一次匹配"""
+    manager = IgnoreManager(str(repo))
+    manager.rules = [
+        {"pattern": pattern, "type": rule_type, "enabled": True, "source": "test"}
+        for pattern, rule_type in rules
+    ]
+    manager._rules_dirty = True
+    return manager
+
+
+def _check_cases(manager, cases, scenario):
+    """校验 filter_files 与 should_ignore 均符合预期，且两者结果一致"""
+    paths = [path for path, _ in cases]
+    expected_kept = [path for path, ignored in cases if not ignored]
+
+    # 先批量过滤，避免 should_ignore 的结果缓存影响 filter_files
+    assert manager.filter_files(paths) == expected_kept, scenario
+
+    for path, ignored in cases:
+        assert manager.should_ignore(path) == ignored, f"{scenario}: {path}"
+
+    # 逐个调用 should_ignore 的结果与批量过滤一致
+    kept_by_should_ignore = [path for path in paths if not manager.should_ignore(path)]
+    assert manager.filter_files(paths) == kept_by_should_ignore, scenario
+
+
+def test_match_table():
+    """按规则表校验 should_ignore 与 filter_files"""
+    repo = _create_repo()
+    try:
+        for scenario, rules, cases in MATCH_TABLE:
+            # 每个场景分别以 filter_files 和 should_ignore 作为第一次匹配
+            _check_cases(_create_manager(repo, rules), cases, scenario)
+
+            manager = _create_manager(repo, rules)
+            for path, ignored in cases:
+                assert manager.should_ignore(path) == ignored, f"{scenario}: {path}"
+            assert manager.filter_files([path for path, _ in cases]) == [
+                path for path, ignored in cases if not ignored
+            ], scenario
+    finally:
+        shutil.rmtree(repo)
+
+
+def _apply_rule_changes(manager):
+    """依次执行 add_rule / remove_rule / toggle_rule，每步之后校验匹配结果"""
+    cases = [
+        ("dist/app.js", True),
+        ("src/a.tmp", False),
+        ("src/main.py", False),
+        ("lib/node_modules/pkg/index.js", False),
+    ]
+    _check_cases(manager, cases, "初始规则")
+
+    assert manager.add_rule("*.tmp", "glob")
+    assert manager.add_rule("**/node_modules/", "glob")
+    cases = [
+        ("dist/app.js", True),
+        ("src/a.tmp", True),
+        ("src/main.py", False),
+        ("lib/node_modules/pkg/index.js", True),
+    ]
+    _check_cases(manager, cases, "add_rule 之后")
+
+    assert manager.remove_rule("dist/", "glob")
+    assert not manager.remove_rule("missing/", "glob")
+    cases = [
+        ("dist/app.js", False),
+        ("src/a.tmp", True),
+        ("lib/node_modules/pkg/index.js", True),
+    ]
+    _check_cases(manager, cases, "remove_rule 之后")
+
+    assert manager.toggle_rule("*.tmp")
+    cases = [("src/a.tmp", False), ("lib/node_modules/pkg/index.js", True)]
+    _check_cases(manager, cases, "toggle_rule 禁用之后")
+
+    assert manager.toggle_rule("*.tmp")
+    cases = [("src/a.tmp", True), ("lib/node_modules/pkg/index.js", True)]
+    _check_cases(manager, cases, "toggle_rule 重新启用之后")
+
+
+def test_rule_changes_before_first_match():
+    """第一次匹配之前修改规则（规则尚未编译）"""
+    repo = _create_repo()
+    try:
+        manager = _create_manager(repo, [("dist/", "glob")])
+        assert manager.add_rule("*.bak", "glob")
+        assert manager.toggle_rule("*.bak")
+        assert not manager.should_ignore("src/a.bak")
+        _apply_rule_changes(manager)
+        manager.flush()
+    finally:
+        shutil.rmtree(repo)
+
+
+def test_rule_changes_after_first_match():
+    """第一次匹配之后修改规则（需要增量编译或重新编译）"""
+    repo = _create_repo()
+    try:
+        manager = _create_manager(repo, [("dist/", "glob")])
+        assert manager.should_ignore("dist/app.js")
+        _apply_rule_changes(manager)
+        manager.flush()
+    finally:
+        shutil.rmtree(repo)
+
+
+def main():
+    """主测试函数"""
+    tests = [
+        test_match_table,
+        test_rule_changes_before_first_match,
+        test_rule_changes_after_first_match,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -3,9 +3,32 @@ Git Merge Orchestrator - 显示格式化工具
 负责用户界面显示、表格格式化和信息展示
 """
 
+import sys
 from collections import defaultdict
 from config import TABLE_CONFIGS, ACTIVITY_LEVELS, ASSIGNMENT_REASON_TYPES
 
+# 组名列需要自适应宽度的表格
+_GROUP_NAME_FIRST_TABLES = frozenset({"assignment_reasons", "assignee_tasks"})
+
+# 传统主菜单文本
+_MAIN_MENU_LINES = (
+    "\n📋 可用操作:\n",
+    "1. 分析分支分叉\n",
+    "2. 创建智能合并计划\n",
+    "3. 智能自动分配任务 (含活跃度过滤+备选方案)\n",
+    "4. 手动分配任务\n",
+    "5. 查看贡献者智能分析\n",
+    "6. 合并指定组\n",
+    "7. 搜索负责人任务\n",
+    "8. 合并指定负责人的所有任务\n",
+    "9. 检查状态 (可选择显示模式)\n",
+    "10. 查看分组详细信息\n",
+    "11. 查看分配原因分析\n",
+    "12. 完成状态管理 (标记完成/检查远程状态)\n",
+    "13. 完成最终合并\n",
+    "0. 退出\n",
+)
+
 
 class DisplayHelper:
     """显示格式化助手类"""
@@ -127,10 +150,7 @@ class DisplayHelper:
         elif table_name == "group_list" and len(max_widths) > 1:
             # 组名列（第1列）
             max_widths[1] = max(45, min(65, max_widths[1] + 2))
-        elif (
-            table_name in ["assignment_reasons", "assignee_tasks"]
-            and len(max_widths) > 0
-        ):
+        elif table_name in _GROUP_NAME_FIRST_TABLES and len(max_widths) > 0:
             # 组名列（第0列）
             max_widths[0] = max(45, min(65, max_widths[0] + 2))
 
@@ -197,13 +217,14 @@ class DisplayHelper:
     @staticmethod
     def format_assignment_summary(assignment_count, unassigned_groups):
         """格式化分配总结"""
-        summary = "\n📊 自动分配总结:\n"
-        summary += f"👥 任务分配:\n"
-
-        for person, count in sorted(
-            assignment_count.items(), key=lambda x: x[1], reverse=True
-        ):
-            summary += f" {person}: {count} 个任务\n"
+        lines = ["\n📊 自动分配总结:", "👥 任务分配:"]
+        lines.extend(
+            f" {person}: {count} 个任务"
+            for person, count in sorted(
+                assignment_count.items(), key=lambda x: x[1], reverse=True
+            )
+        )
+        summary = "\n".join(lines) + "\n"
 
         if unassigned_groups:
             summary += f"\n⚠️ 未分配的组 ({len(unassigned_groups)}个): "
@@ -219,21 +240,21 @@ class DisplayHelper:
         if not assignee_workload:
             return ""
 
-        distribution = "\n👥 负载分布:\n"
         sorted_workload = sorted(
             assignee_workload.items(), key=lambda x: x[1]["files"], reverse=True
         )
 
+        lines = ["\n👥 负载分布:"]
         for person, workload in sorted_workload:
             fallback_info = (
                 f"(含{workload['fallback']}个备选)" if workload["fallback"] > 0 else ""
             )
-            distribution += (
+            lines.append(
                 f" {person}: {workload['completed']}/{workload['groups']} 组完成, "
+                f"{workload['files']} 个文件 {fallback_info}"
             )
-            distribution += f"{workload['files']} 个文件 {fallback_info}\n"
 
-        return distribution.rstrip()
+        return "\n".join(lines).rstrip()
 
     @staticmethod
     def format_completion_stats(stats):
@@ -289,7 +310,7 @@ class DisplayHelper:
         print(f"\n📄 包含文件列表:")
         files = group.get("files", [])
         for i, file_path in enumerate(files, 1):
-            print(f"   {i:2d}. {file_path}")
+            print("   %2d. %s" % (i, file_path))
 
         # 贡献者分析
         contributors = group.get("contributors", {})
@@ -339,21 +360,7 @@ class DisplayHelper:
     @staticmethod
     def show_menu():
         """显示主菜单"""
-        print("\n📋 可用操作:")
-        print("1. 分析分支分叉")
-        print("2. 创建智能合并计划")
-        print("3. 智能自动分配任务 (含活跃度过滤+备选方案)")
-        print("4. 手动分配任务")
-        print("5. 查看贡献者智能分析")
-        print("6. 合并指定组")
-        print("7. 搜索负责人任务")
-        print("8. 合并指定负责人的所有任务")
-        print("9. 检查状态 (可选择显示模式)")
-        print("10. 查看分组详细信息")
-        print("11. 查看分配原因分析")
-        print("12. 完成状态管理 (标记完成/检查远程状态)")
-        print("13. 完成最终合并")
-        print("0. 退出")
+        sys.stdout.writelines(_MAIN_MENU_LINES)
 
     @staticmethod
     def print_section_header(title):
@@ -410,23 +417,23 @@ class DisplayHelper:
         if not workload:
             return ""
 
-        distribution = "\n👥 文件级负载分布:\n"
         sorted_workload = sorted(
             workload.items(), key=lambda x: x[1]["assigned"], reverse=True
         )
 
+        lines = ["\n👥 文件级负载分布:"]
         for person, load_info in sorted_workload:
             assigned = load_info["assigned"]
             completed = load_info["completed"]
             pending = load_info["pending"]
             completion_rate = (completed / assigned * 100) if assigned > 0 else 0
 
-            distribution += f" {person}: {assigned} 个文件 | "
-            distribution += (
-                f"完成: {completed} | 待处理: {pending} | 完成率: {completion_rate:.1f}%\n"
+            lines.append(
+                f" {person}: {assigned} 个文件 | "
+                f"完成: {completed} | 待处理: {pending} | 完成率: {completion_rate:.1f}%"
             )
 
-        return distribution.rstrip()
+        return "\n".join(lines).rstrip()
 
     @staticmethod
     def display_file_detail(file_info):
@@ -1,11 +1,63 @@
 """
 Git Merge Orchestrator - 扁平化菜单管理器
 简化的1级菜单系统，提供直接访问所有核心功能
+
+导入约定：轻量的标准库模块在模块顶部导入；只在个别菜单项中用到的
+较重模块（如 utils.display_utils）在对应处理函数内延迟导入。
 """
 
+import sys
+from pathlib import Path
+
+from config import WORK_DIR_NAME
 from ui.display_helper import DisplayHelper
 from ui.menu_commands import MenuCommands
 
+# 文件级计划路径（相对当前工作目录），用于判断处理模式
+_FILE_PLAN_PATH = Path(WORK_DIR_NAME) / "file_plan.json"
+
+# 退出主菜单的输入
+_QUIT_CHOICES = frozenset({"q", "quit", "exit", "0"})
+
+# 静态子菜单文本，整块写出
+_ADVANCED_QUERY_MENU_LINES = (
+    "🔍 高级查询系统\n",
+    "1. 按负责人查询\n",
+    "2. 按文件路径查询\n",
+    "3. 按状态查询\n",
+    "4. 返回主菜单\n",
+)
+
+_SEARCH_ASSIGN_MENU_LINES = (
+    "👤 任务搜索与分配\n",
+    "1. 搜索负责人任务\n",
+    "2. 手动分配任务\n",
+    "3. 返回主菜单\n",
+)
+
+_COMPLETION_MENU_LINES = (
+    "\n📝 标记选项:\n",
+    "1. 🎯 标记单个文件完成\n",
+    "2. 📋 标记负责人的所有任务完成\n",
+    "3. 📁 标记整个目录完成\n",
+    "4. 🔍 查看完成详情\n",
+    "5. 🌐 自动检测远程分支状态\n",
+    "6. 📊 查看团队整体进度\n",
+    "0. 返回主菜单\n",
+)
+
+_SETTINGS_MENU_LINES = (
+    "\n⚙️ 系统设置\n",
+    "-" * 30 + "\n",
+    "a. 🔧 切换合并策略\n",
+    "b. 🚫 管理忽略规则\n",
+    "c. 📈 查看性能统计\n",
+    "d. 🗑️ 清理缓存\n",
+    "e. 🔄 切换处理模式\n",
+    "f. 🎉 执行最终合并\n",
+    "0. 返回主菜单\n",
+)
+
 
 class FlatMenuManager:
     """扁平化菜单管理器 - 1级菜单直接访问所有功能"""
@@ -46,19 +98,19 @@ class FlatMenuManager:
         while True:
             try:
                 self._show_main_menu()
-                choice = input("\n请选择功能 (1-12, q退出, h帮助): ").strip().lower()
+                choice = input("\n请选择功能 (1-12, q退出, h帮助): ").strip().casefold()
 
                 if not choice:
                     continue
 
                 # 处理退出
-                if choice in ["q", "quit", "exit", "0"]:
+                if choice in _QUIT_CHOICES:
                     print("👋 感谢使用 Git Merge Orchestrator!")
                     break
 
                 # 处理快捷键
                 if choice in self.shortcuts:
-                    self.shortcuts[choice]()
+                    self._run_action(self.shortcuts[choice])
                     continue
 
                 # 处理核心功能
@@ -66,7 +118,7 @@ class FlatMenuManager:
                     func_name, func = self.core_functions[choice]
                     print(f"\n▶️ 执行: {func_name}")
                     print("-" * 50)
-                    func()
+                    self._run_action(func)
                 else:
                     DisplayHelper.print_warning(f"无效选择: {choice}")
                     print("💡 输入 1-12 选择功能，或 'h' 查看帮助")
@@ -80,6 +132,13 @@ class FlatMenuManager:
 
         print("\n程序已退出。")
 
+    def _run_action(self, action):
+        """执行菜单动作，Ctrl+C 只取消当前操作并返回菜单"""
+        try:
+            action()
+        except KeyboardInterrupt:
+            print("\n⏹️ 操作已取消")
+
     def _show_main_menu(self):
         """显示主菜单"""
         print("\n" + "=" * 60)
@@ -100,7 +159,7 @@ class FlatMenuManager:
                     name = "📄 合并指定文件"
                 else:
                     name = "📁 合并指定组"
-            print(f"  {key:2}. {name}")
+            print("  %-2s. %s" % (key, name))
         print(f"💡 快捷键: q=退出, h=帮助, s=状态")
 
     def _show_project_summary(self):
@@ -202,11 +261,7 @@ class FlatMenuManager:
 
     def _advanced_query(self):
         """高级查询系统"""
-        print("🔍 高级查询系统")
-        print("1. 按负责人查询")
-        print("2. 按文件路径查询")
-        print("3. 按状态查询")
-        print("4. 返回主菜单")
+        sys.stdout.writelines(_ADVANCED_QUERY_MENU_LINES)
 
         choice = input("请选择查询类型 (1-4): ").strip()
 
@@ -279,10 +334,7 @@ class FlatMenuManager:
 
     def _search_assign_tasks(self):
         """搜索/分配任务"""
-        print("👤 任务搜索与分配")
-        print("1. 搜索负责人任务")
-        print("2. 手动分配任务")
-        print("3. 返回主菜单")
+        sys.stdout.writelines(_SEARCH_ASSIGN_MENU_LINES)
 
         choice = input("请选择操作 (1-3): ").strip()
 
@@ -307,10 +359,7 @@ class FlatMenuManager:
 
     def _is_file_level_mode(self):
         """检查是否为文件级处理模式"""
-        from pathlib import Path
-
-        file_plan_path = Path(".merge_work/file_plan.json")
-        return file_plan_path.exists()
+        return _FILE_PLAN_PATH.exists()
 
     def _merge_file_or_group(self):
         """根据处理模式合并指定文件或组"""
@@ -363,6 +412,15 @@ class FlatMenuManager:
 
     def _show_completion_menu(self):
         """显示完成标记菜单"""
+        completion_actions = {
+            "1": self._mark_single_file,
+            "2": self._mark_assignee_tasks,
+            "3": self._mark_directory_tasks,
+            "4": self._view_completion_details,
+            "5": self._auto_detect_remote_status,
+            "6": self._view_team_progress,
+        }
+
         while True:
             print("\n🏁 标记完成")
             print("=" * 50)
@@ -380,36 +438,20 @@ class FlatMenuManager:
             except Exception as e:
                 print(f"⚠️ 无法获取状态信息: {e}")
 
-            print(f"\n📝 标记选项:")
-            print("1. 🎯 标记单个文件完成")
-            print("2. 📋 标记负责人的所有任务完成")
-            print("3. 📁 标记整个目录完成")
-            print("4. 🔍 查看完成详情")
-            print("5. 🌐 自动检测远程分支状态")
-            print("6. 📊 查看团队整体进度")
-            print("0. 返回主菜单")
+            sys.stdout.writelines(_COMPLETION_MENU_LINES)
 
             choice = input("\n请选择 (1-6, 0): ").strip()
 
-            if choice == "1":
-                self._mark_single_file()
-            elif choice == "2":
-                self._mark_assignee_tasks()
-            elif choice == "3":
-                self._mark_directory_tasks()
-            elif choice == "4":
-                self._view_completion_details()
-            elif choice == "5":
-                self._auto_detect_remote_status()
-            elif choice == "6":
-                self._view_team_progress()
-            elif choice == "0":
+            if choice == "0":
                 break
-            else:
+
+            action = completion_actions.get(choice)
+            if action is None:
                 print("❌ 无效选择，请输入0-6")
+            else:
+                self._run_action(action)
 
-            if choice != "0":
-                input("\n按回车键继续...")
+            input("\n按回车键继续...")
 
     def _mark_single_file(self):
         """标记单个文件完成"""
@@ -529,44 +571,48 @@ class FlatMenuManager:
 
     def _system_settings(self):
         """系统设置"""
+        settings_actions = {
+            "a": self._switch_merge_strategy,
+            "b": self._manage_ignore_rules,
+            "c": self.commands.show_performance_stats,
+            "d": self.commands.clean_cache,
+            "e": self._switch_processing_mode,
+            "f": self._execute_finalize_merge,
+        }
+
         while True:
-            print("\n⚙️ 系统设置")
-            print("-" * 30)
-            print("a. 🔧 切换合并策略")
-            print("b. 🚫 管理忽略规则")
-            print("c. 📈 查看性能统计")
-            print("d. 🗑️ 清理缓存")
-            print("e. 🔄 切换处理模式")
-            print("f. 🎉 执行最终合并")
-            print("0. 返回主菜单")
-
-            choice = input("\n请选择设置项 (a-f, 0): ").strip().lower()
-
-            if choice == "a":
-                if self.commands.switch_merge_strategy():
-                    print("✅ 策略切换成功")
-                else:
-                    print("❌ 策略切换取消")
-            elif choice == "b":
-                print("🚫 忽略规则管理功能开发中，请手动编辑 .merge_ignore 文件")
-            elif choice == "c":
-                self.commands.show_performance_stats()
-            elif choice == "d":
-                self.commands.clean_cache()
-            elif choice == "e":
-                if self.commands.switch_processing_mode():
-                    print("✅ 处理模式切换成功，请重新创建合并计划")
-                else:
-                    print("❌ 处理模式切换取消")
-            elif choice == "f":
-                self._execute_finalize_merge()
-            elif choice == "0":
+            sys.stdout.writelines(_SETTINGS_MENU_LINES)
+
+            choice = input("\n请选择设置项 (a-f, 0): ").strip().casefold()
+
+            if choice == "0":
                 break
-            else:
+
+            # 单字符选项直接查表，无需逐个比较
+            if len(choice) != 1 or choice not in settings_actions:
                 DisplayHelper.print_warning("无效选择")
+            else:
+                self._run_action(settings_actions[choice])
 
-            if choice != "0":
-                input("\n按回车键继续...")
+            input("\n按回车键继续...")
+
+    def _switch_merge_strategy(self):
+        """切换合并策略（在系统设置中）"""
+        if self.commands.switch_merge_strategy():
+            print("✅ 策略切换成功")
+        else:
+            print("❌ 策略切换取消")
+
+    def _manage_ignore_rules(self):
+        """管理忽略规则（在系统设置中）"""
+        print("🚫 忽略规则管理功能开发中，请手动编辑 .merge_ignore 文件")
+
+    def _switch_processing_mode(self):
+        """切换处理模式（在系统设置中）"""
+        if self.commands.switch_processing_mode():
+            print("✅ 处理模式切换成功，请重新创建合并计划")
+        else:
+            print("❌ 处理模式切换取消")
 
     def _show_help(self):
         """显示帮助信息"""
@@ -9,13 +9,22 @@ import os
 import subprocess
 import time
 import json
+import atexit
+import importlib.util
+import queue
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional, Tuple
+from types import MappingProxyType
+from dataclasses import dataclass
+from typing import List, Dict, Optional
 
-# 添加项目根目录到Python路径
-sys.path.append(str(Path(__file__).parent))
+# 添加项目根目录到Python路径（已存在时不重复添加）
+_PROJECT_ROOT_STR = str(Path(__file__).resolve().parent)
+if _PROJECT_ROOT_STR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_STR)
 
 
 @dataclass
@@ -26,6 +35,10 @@ class TestEnvironmentStatus:
     git_available: bool = False
     python_available: bool = False
     dependencies_available: bool = False
+
+    def to_dict(self) -> Dict:
+        """转换为可JSON序列化的字典（字段均为基本类型，浅拷贝即可）"""
+        return dict(self.__dict__)
     
 
 @dataclass
@@ -37,6 +50,10 @@ class TestResult:
     error_message: str = ""
     category: str = "unknown"
 
+    def to_dict(self) -> Dict:
+        """转换为可JSON序列化的字典"""
+        return dict(self.__dict__)
+
 
 @dataclass  
 class UnifiedTestReport:
@@ -52,46 +69,130 @@ class UnifiedTestReport:
     test_mode: str
     recommendations: List[str]
 
+    def to_dict(self) -> Dict:
+        """转换为可JSON序列化的字典，避免 dataclasses.asdict 的递归深拷贝"""
+        return {
+            **self.__dict__,
+            "environment_status": self.environment_status.to_dict(),
+            "test_results": [result.to_dict() for result in self.test_results],
+        }
+
+
+# 失败信息只保留子进程stderr末尾的字节数
+_STDERR_TAIL_BYTES = 4096
+
+
+def _run_quiet(cmd, cwd, timeout, capture_stdout=False) -> subprocess.CompletedProcess:
+    """运行子进程：默认丢弃stdout，stderr只保留末尾部分并解码为文本"""
+    proc = subprocess.run(
+        cmd, cwd=cwd,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE, timeout=timeout
+    )
+    stdout = (
+        proc.stdout.decode("utf-8", errors="replace") if capture_stdout else None
+    )
+    stderr_tail = proc.stderr[-_STDERR_TAIL_BYTES:].decode("utf-8", errors="replace")
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr_tail)
+
+
+def _perf_counter() -> int:
+    """单调计时（纳秒整数）"""
+    return time.perf_counter_ns()
+
+
+# 项目路径常量
+_PROJECT_ROOT = Path(_PROJECT_ROOT_STR)
+_MAIN_TEST_RUNNER = _PROJECT_ROOT / "tests" / "run_tests.py"
+_TEST_ENV_DIR = _PROJECT_ROOT / "test-environment"
+_BATCH_TEST_SCRIPT = _TEST_ENV_DIR / "batch_test.sh"
+
+# 场景映射到主项目测试类别的显示名称
+_SCENARIO_MAPPING = MappingProxyType({
+    "config": "配置管理",
+    "performance": "性能测试",
+    "git": "Git操作",
+    "merge": "合并策略",
+    "integration": "集成测试",
+})
+
+# 依赖检测时需要能找到的核心模块
+_CORE_MODULES = ("core.git_operations", "utils.config_manager")
+
+# 并发测试阶段的线程池大小（完整模式最多同时运行4项）
+_STAGE_WORKERS = 4
+
+# 测试建议规则: (判定函数(环境状态, 通过数, 失败数, 成功率), 建议文本)，按顺序匹配
+_REC_RULES = (
+    # 基于环境状态的建议
+    (lambda env, passed, failed, rate: not env.test_environment_available,
+     "建议初始化test-environment submodule以获得完整测试覆盖"),
+    (lambda env, passed, failed, rate: not env.git_available,
+     "建议安装Git工具以支持完整的版本控制测试"),
+    # 基于测试结果的建议
+    (lambda env, passed, failed, rate: failed > 0,
+     "需要修复{failed}个失败的测试项"),
+    (lambda env, passed, failed, rate: rate < 80,
+     "测试成功率较低，建议检查核心功能实现"),
+    (lambda env, passed, failed, rate: 80 <= rate < 95,
+     "测试成功率良好，建议进一步优化提升稳定性"),
+    (lambda env, passed, failed, rate: rate >= 95,
+     "测试覆盖优秀，系统状态良好"),
+)
+
+# 环境检测结果在进程生命周期内不变，首次检测后缓存
+_ENV_CACHE: Optional[TestEnvironmentStatus] = None
+
 
 class EnvironmentDetector:
     """环境检测器"""
     
     @staticmethod
     def detect_environment() -> TestEnvironmentStatus:
-        """检测测试环境状态"""
+        """检测测试环境状态（结果在进程内缓存）"""
+        global _ENV_CACHE
+        if _ENV_CACHE is None:
+            _ENV_CACHE = EnvironmentDetector._detect_environment_uncached()
+        return _ENV_CACHE
+
+    @staticmethod
+    def clear_cache():
+        """清除缓存的检测结果，下次调用时重新检测"""
+        global _ENV_CACHE
+        _ENV_CACHE = None
+
+    @staticmethod
+    def _detect_environment_uncached() -> TestEnvironmentStatus:
+        """实际执行环境检测"""
         status = TestEnvironmentStatus()
         
         # 检查主项目测试
-        main_test_runner = Path(__file__).parent / "tests" / "run_tests.py"
-        status.main_tests_available = main_test_runner.exists()
+        status.main_tests_available = _MAIN_TEST_RUNNER.exists()
         
         # 检查test-environment submodule
-        test_env_dir = Path(__file__).parent / "test-environment"
-        batch_test_script = test_env_dir / "batch_test.sh"
-        status.test_environment_available = (
-            test_env_dir.exists() and 
-            batch_test_script.exists() and
-            batch_test_script.is_file()
-        )
-        
-        # 检查Git可用性
+        # 目录项自带文件类型信息，无需对 batch_test.sh 再逐个 stat
         try:
-            subprocess.run(["git", "--version"], 
-                         capture_output=True, check=True)
-            status.git_available = True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            status.git_available = False
+            with os.scandir(_TEST_ENV_DIR) as entries:
+                status.test_environment_available = any(
+                    entry.name == _BATCH_TEST_SCRIPT.name and entry.is_file()
+                    for entry in entries
+                )
+        except (FileNotFoundError, NotADirectoryError):
+            status.test_environment_available = False
+        
+        # 检查Git可用性（在PATH中查找即可，无需启动子进程）
+        status.git_available = shutil.which("git") is not None
             
         # 检查Python可用性
         status.python_available = True  # 既然能运行这个脚本，Python肯定可用
         
-        # 检查依赖可用性
+        # 检查依赖可用性（只查找模块，不执行导入）
         try:
-            # 检查核心模块是否可导入
-            from core.git_operations import GitOperations
-            from utils.config_manager import ProjectConfigManager
-            status.dependencies_available = True
-        except ImportError:
+            status.dependencies_available = all(
+                importlib.util.find_spec(module) is not None
+                for module in _CORE_MODULES
+            )
+        except (ImportError, ValueError):
             status.dependencies_available = False
             
         return status
@@ -101,10 +202,17 @@ class UnifiedTestRunner:
     """统一测试运行器"""
     
     def __init__(self):
-        self.project_root = Path(__file__).parent
+        self.project_root = _PROJECT_ROOT
         self.env_status = EnvironmentDetector.detect_environment()
         self.test_results: List[TestResult] = []
         self.start_time = time.time()
+
+        # 临时目录的后台清理队列，避免删除操作计入测试耗时
+        self._cleanup_paths: "queue.Queue[Path]" = queue.Queue()
+        self._cleanup_thread: Optional[threading.Thread] = None
+
+        # 测试阶段执行线程池，首次使用时创建，多次运行间复用
+        self._stage_executor: Optional[ThreadPoolExecutor] = None
         
     def print_environment_status(self):
         """打印环境状态"""
@@ -127,30 +235,28 @@ class UnifiedTestRunner:
         print()
         
     def run_quick_test(self) -> List[TestResult]:
-        """快速测试 (< 30秒)"""
+        """快速测试 (< 30秒)，两项健康检查并发执行"""
         print("🚀 运行快速测试 (< 30秒)")
         print("-" * 40)
-        results = []
+        stages = []
         
         # 1. 主项目健康检查
         if self.env_status.main_tests_available:
-            result = self._run_main_health_check()
-            results.append(result)
+            stages.append(("主项目健康检查", self._run_main_health_check))
         else:
-            results.append(TestResult(
+            stages.append(("主项目健康检查", lambda: TestResult(
                 "主项目健康检查", False, 0, "主项目测试不可用", "health"
-            ))
+            )))
             
         # 2. test-environment基础检查  
         if self.env_status.test_environment_available:
-            result = self._run_test_environment_health()
-            results.append(result)
+            stages.append(("test-environment健康检查", self._run_test_environment_health))
         else:
-            results.append(TestResult(
+            stages.append(("test-environment健康检查", lambda: TestResult(
                 "test-environment健康检查", False, 0, "test-environment不可用", "health"
-            ))
+            )))
             
-        return results
+        return self._run_stages_concurrently(stages, show_progress=False)
         
     def run_scenario_test(self, scenarios: List[str]) -> List[TestResult]:
         """运行指定场景测试"""
@@ -158,11 +264,9 @@ class UnifiedTestRunner:
         print("-" * 40)
         results = []
         
-        # 主项目特定测试
-        if self.env_status.main_tests_available:
-            for scenario in scenarios:
-                result = self._run_main_specific_test(scenario)
-                results.append(result)
+        # 主项目特定测试（所有场景在同一个子进程中运行）
+        if self.env_status.main_tests_available and scenarios:
+            results.extend(self._run_main_specific_tests(scenarios))
                 
         # test-environment场景测试
         if self.env_status.test_environment_available:
@@ -172,48 +276,100 @@ class UnifiedTestRunner:
         return results
         
     def run_full_test(self) -> List[TestResult]:
-        """完整测试套件"""
+        """完整测试套件，相互独立的测试项并发执行
+
+        先运行低成本的健康检查；健康检查失败时跳过对应的完整测试，
+        避免在已知损坏的环境上等待长时间的超时。
+        """
         print("🌟 运行完整测试套件")
         print("-" * 40)
-        results = []
         
-        # 计算总的测试项数
-        total_tests = 0
+        # 0. 健康检查
+        health_stages = []
         if self.env_status.main_tests_available:
-            total_tests += 1
+            health_stages.append(("主项目健康检查", self._run_main_health_check))
         if self.env_status.test_environment_available:
-            total_tests += 1
-        total_tests += 1  # 性能测试
+            health_stages.append(("test-environment健康检查", self._run_test_environment_health))
+        results = self._run_stages_concurrently(health_stages, show_progress=False)
+        health_passed = {result.name: result.passed for result in results}
         
-        current_test = 0
+        # 计划中的完整测试：可运行的为 (名称, 可调用对象)，被跳过的直接为 TestResult
+        planned = []
         
         # 1. 主项目完整测试
         if self.env_status.main_tests_available:
-            current_test += 1
-            print(f"📋 [{current_test}/{total_tests}] 运行主项目完整测试...")
-            result = self._run_main_full_test()
-            results.append(result)
-            icon = "✅" if result.passed else "❌"
-            print(f"    {icon} 完成 ({result.duration:.1f}s)")
+            if health_passed.get("主项目健康检查"):
+                planned.append(("主项目完整测试", self._run_main_full_test))
+            else:
+                planned.append(TestResult(
+                    "主项目完整测试", False, 0, "跳过：健康检查失败", "full"
+                ))
             
         # 2. test-environment完整测试
         if self.env_status.test_environment_available:
-            current_test += 1
-            print(f"📋 [{current_test}/{total_tests}] 运行test-environment完整测试...")
-            result = self._run_test_environment_full()
-            results.append(result)
-            icon = "✅" if result.passed else "❌"
-            print(f"    {icon} 完成 ({result.duration:.1f}s)")
+            if health_passed.get("test-environment健康检查"):
+                planned.append(("test-environment完整测试", self._run_test_environment_full))
+            else:
+                planned.append(TestResult(
+                    "test-environment完整测试", False, 0, "跳过：健康检查失败", "full"
+                ))
             
         # 3. 性能测试
-        current_test += 1
-        print(f"📋 [{current_test}/{total_tests}] 运行性能测试...")
-        result = self._run_performance_test()
-        results.append(result)
-        icon = "✅" if result.passed else "❌"
-        print(f"    {icon} 完成 ({result.duration:.1f}s)")
+        planned.append(("性能测试", self._run_performance_test))
+        
+        for item in planned:
+            if isinstance(item, TestResult):
+                print(f"⏭️ {item.name}: {item.error_message}")
+        
+        stage_results = iter(self._run_stages_concurrently(
+            [item for item in planned if not isinstance(item, TestResult)]
+        ))
+        for item in planned:
+            results.append(item if isinstance(item, TestResult) else next(stage_results))
+        
+        return results
+
+    def _run_stages_concurrently(self, stages, show_progress=True) -> List[TestResult]:
+        """并发执行相互独立的测试项
+
+        Args:
+            stages: (显示名称, 返回TestResult的可调用对象) 列表
+            show_progress: 是否打印启动与完成进度
+
+        Returns:
+            List[TestResult]: 按 stages 顺序排列的测试结果
+        """
+        total = len(stages)
+        if not total:
+            return []
+        if show_progress:
+            for index, (label, _) in enumerate(stages, 1):
+                print(f"📋 [{index}/{total}] 运行{label}...")
+
+        results = [None] * total
+        executor = self._get_stage_executor()
+        future_to_index = {
+            executor.submit(run): index
+            for index, (_, run) in enumerate(stages)
+        }
+        for future in as_completed(future_to_index):
+            index = future_to_index[future]
+            result = future.result()
+            results[index] = result
+            if show_progress:
+                icon = "✅" if result.passed else "❌"
+                print(f"    {icon} {stages[index][0]}完成 ({result.duration:.1f}s)")
         
         return results
+
+    def _get_stage_executor(self) -> ThreadPoolExecutor:
+        """获取共享的测试阶段线程池，首次调用时创建并注册退出时关闭"""
+        if self._stage_executor is None:
+            self._stage_executor = ThreadPoolExecutor(
+                max_workers=_STAGE_WORKERS, thread_name_prefix="test-stage"
+            )
+            atexit.register(self._stage_executor.shutdown, wait=False)
+        return self._stage_executor
         
     def run_core_only_test(self) -> List[TestResult]:
         """仅主项目测试（降级模式）"""
@@ -240,149 +396,145 @@ class UnifiedTestRunner:
             
         return results
         
-    def _run_main_health_check(self) -> TestResult:
-        """运行主项目健康检查"""
-        start_time = time.time()
-        
+    def _timed_run(self, name: str, category: str, check,
+                   timeout_message: Optional[str] = None,
+                   error_prefix: str = "执行异常") -> TestResult:
+        """计时执行单项测试
+
+        check() 返回 (是否通过, 信息)；异常统一转换为失败结果。
+        """
+        t0 = _perf_counter()
         try:
-            result = subprocess.run([
-                sys.executable, "run_tests.py", "--health"
-            ], cwd=self.project_root, capture_output=True, text=True, timeout=60)
-            
-            duration = time.time() - start_time
-            
-            if result.returncode == 0:
-                return TestResult(
-                    "主项目健康检查", True, duration, "", "health"
-                )
-            else:
-                return TestResult(
-                    "主项目健康检查", False, duration, 
-                    result.stderr or "健康检查失败", "health"
-                )
-                
-        except subprocess.TimeoutExpired:
-            return TestResult(
-                "主项目健康检查", False, time.time() - start_time, 
-                "测试超时（60秒）", "health"
-            )
+            passed, message = check()
+        except subprocess.TimeoutExpired as e:
+            message = timeout_message or f"{error_prefix}: {e}"
+            return TestResult(name, False, (_perf_counter() - t0) / 1e9, message, category)
         except Exception as e:
             return TestResult(
-                "主项目健康检查", False, time.time() - start_time,
-                f"执行异常: {e}", "health"
+                name, False, (_perf_counter() - t0) / 1e9, f"{error_prefix}: {e}", category
             )
+        return TestResult(name, passed, (_perf_counter() - t0) / 1e9, message, category)
+
+    def _run_main_health_check(self) -> TestResult:
+        """运行主项目健康检查"""
+        def check():
+            result = _run_quiet([
+                sys.executable, "run_tests.py", "--health"
+            ], cwd=self.project_root, timeout=60)
+            if result.returncode == 0:
+                return True, ""
+            return False, result.stderr or "健康检查失败"
+
+        return self._timed_run(
+            "主项目健康检查", "health", check, timeout_message="测试超时（60秒）"
+        )
             
     def _run_test_environment_health(self) -> TestResult:
         """运行test-environment健康检查"""
-        start_time = time.time()
-        
-        try:
+        def check():
             test_env_dir = self.project_root / "test-environment"
             
             # 简化的健康检查：验证基础结构和关键文件
             checks_passed = 0
             total_checks = 4
             
+            # 每个目录读取一次目录项，代替逐个文件 stat
             # 1. 检查目录存在
-            if test_env_dir.exists():
+            try:
+                env_entries = {entry.name for entry in os.scandir(test_env_dir)}
                 checks_passed += 1
+            except (FileNotFoundError, NotADirectoryError):
+                env_entries = set()
             
             # 2. 检查README文件存在  
-            readme_file = test_env_dir / "README.md"
-            if readme_file.exists():
+            if "README.md" in env_entries:
                 checks_passed += 1
                 
             # 3. 检查test-scripts目录存在
-            scripts_dir = test_env_dir / "test-scripts"
-            if scripts_dir.exists():
-                checks_passed += 1
-                
             # 4. 检查至少有一个核心脚本存在
-            core_script = test_env_dir / "test-scripts" / "create_test_repo.py"
-            if core_script.exists():
+            if "test-scripts" in env_entries:
                 checks_passed += 1
-            
-            duration = time.time() - start_time
+                try:
+                    script_entries = {
+                        entry.name for entry in os.scandir(test_env_dir / "test-scripts")
+                    }
+                except (FileNotFoundError, NotADirectoryError):
+                    script_entries = set()
+                if "create_test_repo.py" in script_entries:
+                    checks_passed += 1
             
             if checks_passed >= 3:  # 至少3/4检查通过
-                return TestResult(
-                    "test-environment健康检查", True, duration, 
-                    f"健康检查通过 ({checks_passed}/{total_checks})", "health"
-                )
-            else:
-                return TestResult(
-                    "test-environment健康检查", False, duration,
-                    f"健康检查不足 ({checks_passed}/{total_checks})", "health"
-                )
-                
-        except Exception as e:
-            return TestResult(
-                "test-environment健康检查", False, time.time() - start_time,
-                f"执行异常: {e}", "health"
-            )
+                return True, f"健康检查通过 ({checks_passed}/{total_checks})"
+            return False, f"健康检查不足 ({checks_passed}/{total_checks})"
+
+        return self._timed_run("test-environment健康检查", "health", check)
             
-    def _run_main_specific_test(self, scenario: str) -> TestResult:
-        """运行主项目特定测试"""
-        start_time = time.time()
-        
-        # 场景映射到主项目测试类别
-        scenario_mapping = {
-            "config": "配置管理",
-            "performance": "性能测试",  
-            "git": "Git操作",
-            "merge": "合并策略",
-            "integration": "集成测试"
-        }
-        
-        test_name = scenario_mapping.get(scenario, scenario)
+    def _run_main_specific_tests(self, scenarios: List[str]) -> List[TestResult]:
+        """运行主项目特定测试
+
+        所有场景通过一次 tests/run_tests.py --category a,b,c 调用完成，
+        每个场景各返回一个结果，耗时记为整批耗时。
+        """
+        t0 = _perf_counter()
+        test_names = [_SCENARIO_MAPPING.get(scenario, scenario) for scenario in scenarios]
         
         try:
             # 运行主项目分类测试
-            result = subprocess.run([
-                sys.executable, "tests/run_tests.py", "--category", scenario
-            ], cwd=self.project_root, capture_output=True, text=True, timeout=300)
-            
-            duration = time.time() - start_time
-            
-            if result.returncode == 0:
-                return TestResult(
-                    f"主项目{test_name}测试", True, duration, "", "scenario"
-                )
-            else:
-                return TestResult(
-                    f"主项目{test_name}测试", False, duration,
-                    result.stderr or f"{test_name}测试失败", "scenario"
-                )
+            result = _run_quiet([
+                sys.executable, "tests/run_tests.py", "--category", ",".join(scenarios)
+            ], cwd=self.project_root, timeout=300 * len(scenarios), capture_stdout=True)
+            
+            duration = (_perf_counter() - t0) / 1e9
+            
+            # 解析每个类别的结果行: CATEGORY_RESULT:<类别>:PASS|FAIL
+            category_passed = {}
+            for line in result.stdout.splitlines():
+                if line.startswith("CATEGORY_RESULT:"):
+                    _, category, outcome = line.rsplit(":", 2)
+                    category_passed[category] = outcome == "PASS"
+            
+            results = []
+            for scenario, test_name in zip(scenarios, test_names):
+                if category_passed.get(scenario, False):
+                    results.append(TestResult(
+                        f"主项目{test_name}测试", True, duration, "", "scenario"
+                    ))
+                else:
+                    results.append(TestResult(
+                        f"主项目{test_name}测试", False, duration,
+                        result.stderr or f"{test_name}测试失败", "scenario"
+                    ))
+            return results
                 
         except Exception as e:
-            return TestResult(
-                f"主项目{test_name}测试", False, time.time() - start_time,
-                f"执行异常: {e}", "scenario"
-            )
+            duration = (_perf_counter() - t0) / 1e9
+            return [
+                TestResult(
+                    f"主项目{test_name}测试", False, duration,
+                    f"执行异常: {e}", "scenario"
+                )
+                for test_name in test_names
+            ]
             
     def _run_test_environment_scenarios(self, scenarios: List[str]) -> TestResult:
         """运行test-environment场景测试"""
-        start_time = time.time()
-        
-        try:
+        def check():
             test_env_dir = self.project_root / "test-environment"
             
             # 简化的场景测试：验证场景配置文件和脚本存在
-            success = True
             error_messages = []
             scenarios_checked = 0
             
             # 检查场景设置脚本是否存在
             setup_script = test_env_dir / "test-scripts" / "setup_scenarios.py"
             if not setup_script.exists():
-                success = False
                 error_messages.append("setup_scenarios.py脚本不存在")
             else:
                 # 测试场景脚本的基本可用性
                 try:
-                    result = subprocess.run([
+                    result = _run_quiet([
                         sys.executable, "test-scripts/setup_scenarios.py", "--help"
-                    ], cwd=test_env_dir, capture_output=True, text=True, timeout=15)
+                    ], cwd=test_env_dir, timeout=15)
                     
                     if result.returncode == 0:
                         scenarios_checked += 1
@@ -401,63 +553,32 @@ class UnifiedTestRunner:
             else:
                 error_messages.append("test-data目录不存在")
             
-            duration = time.time() - start_time
-            
             if scenarios_checked >= 1:  # 至少一个场景组件可用
-                return TestResult(
-                    f"test-environment场景测试", True, duration, 
-                    f"场景验证通过 ({scenarios_checked}/2)", "scenario"
-                )
-            else:
-                return TestResult(
-                    f"test-environment场景测试", False, duration,
-                    "; ".join(error_messages), "scenario"
-                )
-                
-        except Exception as e:
-            return TestResult(
-                f"test-environment场景测试", False, time.time() - start_time,
-                f"执行异常: {e}", "scenario"
-            )
+                return True, f"场景验证通过 ({scenarios_checked}/2)"
+            return False, "; ".join(error_messages)
+
+        return self._timed_run("test-environment场景测试", "scenario", check)
             
     def _run_main_full_test(self) -> TestResult:
         """运行主项目完整测试"""
-        start_time = time.time()
-        
-        try:
-            result = subprocess.run([
+        def check():
+            result = _run_quiet([
                 sys.executable, "run_tests.py", "--full"
-            ], cwd=self.project_root, capture_output=True, text=True, timeout=600)
-            
-            duration = time.time() - start_time
-            
+            ], cwd=self.project_root, timeout=600)
             if result.returncode == 0:
-                return TestResult(
-                    "主项目完整测试", True, duration, "", "full"
-                )
-            else:
-                return TestResult(
-                    "主项目完整测试", False, duration,
-                    result.stderr or "完整测试失败", "full"
-                )
-                
-        except Exception as e:
-            return TestResult(
-                "主项目完整测试", False, time.time() - start_time,
-                f"执行异常: {e}", "full"
-            )
+                return True, ""
+            return False, result.stderr or "完整测试失败"
+
+        return self._timed_run("主项目完整测试", "full", check)
             
     def _run_test_environment_full(self) -> TestResult:
         """运行test-environment完整测试"""
-        start_time = time.time()
-        
-        try:
+        def check():
             test_env_dir = self.project_root / "test-environment"
             
             # 运行实际的test-environment核心功能测试
             # 避免batch_test.sh的外部路径依赖，直接运行核心测试
             
-            success = True
             error_messages = []
             tests_passed = 0
             total_tests = 0
@@ -485,9 +606,9 @@ class UnifiedTestRunner:
                 if script_path.exists():
                     try:
                         # 测试脚本的基本可执行性
-                        result = subprocess.run([
+                        result = _run_quiet([
                             sys.executable, f"test-scripts/{script_name}", "--help"
-                        ], cwd=test_env_dir, capture_output=True, text=True, timeout=15)
+                        ], cwd=test_env_dir, timeout=15)
                         
                         if result.returncode == 0:
                             tests_passed += 1
@@ -512,21 +633,17 @@ class UnifiedTestRunner:
                 temp_repo_path = test_env_dir / "test-repos" / temp_repo_name
                 
                 # 创建测试仓库（快速模式）
-                result = subprocess.run([
+                result = _run_quiet([
                     sys.executable, "test-scripts/create_test_repo.py",
                     "--name", temp_repo_name,
                     "--type", "simple",
                     "--contributors", "Alice,Bob"
-                ], cwd=test_env_dir, capture_output=True, text=True, timeout=45)
+                ], cwd=test_env_dir, timeout=45)
                 
                 if result.returncode == 0 and temp_repo_path.exists():
                     tests_passed += 1
-                    # 清理测试仓库
-                    try:
-                        import shutil
-                        shutil.rmtree(temp_repo_path)
-                    except:
-                        pass  # 清理失败不影响测试结果
+                    # 清理测试仓库（后台执行，清理失败不影响测试结果）
+                    self._schedule_cleanup(temp_repo_path)
                 else:
                     error_messages.append(f"测试仓库创建失败: {result.stderr if result.stderr else '未知错误'}")
                     
@@ -535,96 +652,81 @@ class UnifiedTestRunner:
             except Exception as e:
                 error_messages.append(f"测试仓库创建异常: {e}")
             
-            duration = time.time() - start_time
-            success = tests_passed >= (total_tests * 0.75)  # 75%通过率认为成功
+            # 75%通过率认为成功
+            if tests_passed >= (total_tests * 0.75):
+                return True, f"通过 {tests_passed}/{total_tests} 项测试"
+            return False, f"仅通过 {tests_passed}/{total_tests} 项测试: " + "; ".join(error_messages[:3])
+
+        return self._timed_run("test-environment完整测试", "full", check)
             
-            if success:
-                return TestResult(
-                    "test-environment完整测试", True, duration, 
-                    f"通过 {tests_passed}/{total_tests} 项测试", "full"
-                )
-            else:
-                return TestResult(
-                    "test-environment完整测试", False, duration,
-                    f"仅通过 {tests_passed}/{total_tests} 项测试: " + "; ".join(error_messages[:3]), "full"
-                )
-                
-        except Exception as e:
-            return TestResult(
-                "test-environment完整测试", False, time.time() - start_time,
-                f"执行异常: {e}", "full"
+    def _schedule_cleanup(self, path: Path):
+        """将目录加入后台清理队列，首次调用时启动清理线程"""
+        if self._cleanup_thread is None:
+            self._cleanup_thread = threading.Thread(
+                target=self._cleanup_worker, name="test-cleanup", daemon=True
             )
-            
+            self._cleanup_thread.start()
+            atexit.register(self._drain_cleanup)
+        self._cleanup_paths.put(path)
+
+    def _cleanup_worker(self):
+        """后台清理线程：逐个删除队列中的目录"""
+        while True:
+            path = self._cleanup_paths.get()
+            try:
+                shutil.rmtree(path, ignore_errors=True)
+            finally:
+                self._cleanup_paths.task_done()
+
+    def _drain_cleanup(self, timeout: float = 10.0):
+        """退出前等待清理队列处理完毕（最多等待 timeout 秒）"""
+        deadline = time.time() + timeout
+        while self._cleanup_paths.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.05)
+
     def _run_performance_test(self) -> TestResult:
         """运行性能测试"""
-        start_time = time.time()
-        
-        try:
+        def check():
             performance_script = self.project_root / "test_performance_optimization.py"
-            if performance_script.exists():
-                result = subprocess.run([
-                    sys.executable, str(performance_script)
-                ], cwd=self.project_root, capture_output=True, text=True, timeout=300)
-                
-                duration = time.time() - start_time
-                
-                if result.returncode == 0:
-                    return TestResult(
-                        "性能优化测试", True, duration, "", "performance"
-                    )
-                else:
-                    return TestResult(
-                        "性能优化测试", False, duration,
-                        result.stderr or "性能测试失败", "performance"
-                    )
-            else:
-                return TestResult(
-                    "性能优化测试", False, 0, "性能测试脚本不存在", "performance"
-                )
-                
-        except Exception as e:
-            return TestResult(
-                "性能优化测试", False, time.time() - start_time,
-                f"执行异常: {e}", "performance"
-            )
+            if not performance_script.exists():
+                return False, "性能测试脚本不存在"
+            result = _run_quiet([
+                sys.executable, str(performance_script)
+            ], cwd=self.project_root, timeout=300)
+            if result.returncode == 0:
+                return True, ""
+            return False, result.stderr or "性能测试失败"
+
+        return self._timed_run("性能优化测试", "performance", check)
             
     def _run_builtin_mock_tests(self) -> TestResult:
         """运行内置模拟测试（降级模式）"""
-        start_time = time.time()
-        
-        try:
+        def check():
             # 简单的模拟测试，验证核心功能
             from core.git_operations import GitOperations
             from utils.config_manager import ProjectConfigManager
             
             # 基本导入测试
-            git_ops = GitOperations(".")
-            config_mgr = ProjectConfigManager(".")
-            
-            duration = time.time() - start_time
-            return TestResult(
-                "内置模拟测试", True, duration, "", "mock"
-            )
-            
-        except Exception as e:
-            return TestResult(
-                "内置模拟测试", False, time.time() - start_time,
-                f"模拟测试失败: {e}", "mock"
-            )
+            GitOperations(".")
+            ProjectConfigManager(".")
+            return True, ""
+
+        return self._timed_run("内置模拟测试", "mock", check, error_prefix="模拟测试失败")
             
     def generate_report(self, test_mode: str) -> UnifiedTestReport:
         """生成统一测试报告"""
         total_duration = time.time() - self.start_time
-        passed_tests = sum(1 for r in self.test_results if r.passed)
-        failed_tests = len(self.test_results) - passed_tests
-        success_rate = (passed_tests / len(self.test_results) * 100) if self.test_results else 0
+        total_tests = len(self.test_results)
+        passed_tests = sum(r.passed for r in self.test_results)
+        failed_tests = total_tests - passed_tests
+        success_rate = (passed_tests / total_tests * 100) if total_tests else 0.0
         
         # 生成建议
-        recommendations = self._generate_recommendations()
+        recommendations = self._generate_recommendations(passed_tests, failed_tests, success_rate)
         
         return UnifiedTestReport(
             timestamp=datetime.now().isoformat(),
-            total_tests=len(self.test_results),
+            total_tests=total_tests,
             passed_tests=passed_tests,
             failed_tests=failed_tests,
             success_rate=success_rate,
@@ -635,31 +737,13 @@ class UnifiedTestRunner:
             recommendations=recommendations
         )
         
-    def _generate_recommendations(self) -> List[str]:
-        """生成测试建议"""
-        recommendations = []
-        
-        # 基于环境状态的建议
-        if not self.env_status.test_environment_available:
-            recommendations.append("建议初始化test-environment submodule以获得完整测试覆盖")
-            
-        if not self.env_status.git_available:
-            recommendations.append("建议安装Git工具以支持完整的版本控制测试")
-            
-        # 基于测试结果的建议  
-        failed_results = [r for r in self.test_results if not r.passed]
-        if failed_results:
-            recommendations.append(f"需要修复{len(failed_results)}个失败的测试项")
-            
-        success_rate = (sum(1 for r in self.test_results if r.passed) / len(self.test_results) * 100) if self.test_results else 0
-        if success_rate < 80:
-            recommendations.append("测试成功率较低，建议检查核心功能实现")
-        elif success_rate < 95:
-            recommendations.append("测试成功率良好，建议进一步优化提升稳定性")
-        else:
-            recommendations.append("测试覆盖优秀，系统状态良好")
-            
-        return recommendations
+    def _generate_recommendations(self, passed: int, failed: int, rate: float) -> List[str]:
+        """生成测试建议（统计值由 generate_report 计算后传入）"""
+        return [
+            message.format(failed=failed)
+            for predicate, message in _REC_RULES
+            if predicate(self.env_status, passed, failed, rate)
+        ]
         
     def print_detailed_report(self, report: UnifiedTestReport):
         """打印详细测试报告"""
@@ -707,12 +791,18 @@ class UnifiedTestRunner:
                 
         print("=" * 80)
         
-    def save_report(self, report: UnifiedTestReport, file_path: str):
-        """保存测试报告到文件"""
+    def save_report(self, report: UnifiedTestReport, file_path: str, compact: bool = False):
+        """保存测试报告到文件
+
+        Args:
+            compact: 紧凑格式（无缩进、ASCII转义），供CI等程序读取
+        """
         try:
-            report_dict = asdict(report)
             with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(report_dict, f, indent=2, ensure_ascii=False)
+                if compact:
+                    json.dump(report.to_dict(), f, separators=(",", ":"), ensure_ascii=True)
+                else:
+                    json.dump(report.to_dict(), f, indent=2, ensure_ascii=False)
             print(f"📄 测试报告已保存: {file_path}")
         except Exception as e:
             print(f"⚠️ 保存报告失败: {e}")
@@ -741,6 +831,9 @@ def main():
   
   # 生成详细报告
   python unified_test_runner.py --full --save-report test_report.json
+  
+  # 生成紧凑报告 (供CI读取)
+  python unified_test_runner.py --quick --save-report report.json --compact-report
         """
     )
     
@@ -749,6 +842,7 @@ def main():
     parser.add_argument("--core-only", action="store_true", help="仅主项目测试 (降级模式)")
     parser.add_argument("--scenario", help="指定场景测试，逗号分隔 (如: config,performance)")
     parser.add_argument("--save-report", help="保存测试报告到文件")
+    parser.add_argument("--compact-report", action="store_true", help="以紧凑JSON格式保存报告 (配合--save-report)")
     parser.add_argument("--quiet", action="store_true", help="静默模式，只显示结果")
     
     args = parser.parse_args()
@@ -799,7 +893,7 @@ def main():
     
     # 保存报告
     if args.save_report:
-        runner.save_report(report, args.save_report)
+        runner.save_report(report, args.save_report, compact=args.compact_report)
     
     # 返回适当的退出码
     if report.failed_tests > 0:
@@ -8,6 +8,17 @@ import os
 from pathlib import Path
 from datetime import datetime
 from config import WORK_DIR_NAME
+from utils.file_helper import load_json_file, dump_json_file, ensure_dir
+
+# 进程级配置缓存: 配置文件路径 -> ((mtime_ns, size), config)，跨实例共享
+# 配置是扁平字典，存取时做浅拷贝，避免实例间互相影响
+_CONFIG_CACHE = {}
+
+# 兼容的配置文件版本
+_SUPPORTED_VERSIONS = frozenset({"1.0", "2.0"})
+
+# 配置文件必须包含的字段
+_REQUIRED_FIELDS = frozenset({"source_branch", "target_branch", "version"})
 
 
 class ProjectConfigManager:
@@ -22,26 +33,38 @@ class ProjectConfigManager:
         self.config_file = self.work_dir / self.CONFIG_FILE_NAME
         self._config_cache = None
 
+    def _ensure_work_dir(self):
+        """确保工作目录存在，同一目录在进程内只创建一次"""
+        ensure_dir(self.work_dir)
+
     def load_config(self):
         """加载项目配置"""
         if self._config_cache is not None:
             return self._config_cache
 
-        if not self.config_file.exists():
-            return None
-
+        # 直接 stat，文件不存在时由 FileNotFoundError 判断，省去单独的 exists() 检查
+        cache_key = str(self.config_file)
         try:
-            with open(self.config_file, "r", encoding="utf-8") as f:
-                config = json.load(f)
+            st = os.stat(self.config_file)
+            stat_key = (st.st_mtime_ns, st.st_size)
+            cached = _CONFIG_CACHE.get(cache_key)
+            if cached is not None and cached[0] == stat_key:
+                self._config_cache = dict(cached[1])
+                return self._config_cache
+
+            config = load_json_file(self.config_file)
 
             # 验证配置版本和必要字段
             if not self._validate_config(config):
                 print("⚠️ 配置文件格式不正确，将忽略现有配置")
                 return None
 
+            _CONFIG_CACHE[cache_key] = (stat_key, dict(config))
             self._config_cache = config
             return config
 
+        except FileNotFoundError:
+            return None
         except (json.JSONDecodeError, IOError) as e:
             print(f"⚠️ 读取配置文件失败: {e}")
             return None
@@ -49,7 +72,7 @@ class ProjectConfigManager:
     def save_config(self, source_branch, target_branch, repo_path=".", max_files_per_group=5, merge_strategy=None):
         """保存项目配置"""
         # 确保工作目录存在
-        self.work_dir.mkdir(exist_ok=True)
+        self._ensure_work_dir()
 
         # 加载现有合并策略（如果存在）
         if merge_strategy is None:
@@ -72,10 +95,9 @@ class ProjectConfigManager:
         }
 
         try:
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            dump_json_file(config, self.config_file)
 
-            self._config_cache = config
+            self._remember_config(config)
             print(f"✅ 项目配置已保存到: {self.config_file}")
             return True
 
@@ -83,6 +105,16 @@ class ProjectConfigManager:
             print(f"❌ 保存配置文件失败: {e}")
             return False
 
+    def _remember_config(self, config):
+        """写入配置文件后同步实例缓存和进程级缓存"""
+        self._config_cache = config
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
+            _CONFIG_CACHE.pop(str(self.config_file), None)
+            return
+        _CONFIG_CACHE[str(self.config_file)] = ((st.st_mtime_ns, st.st_size), dict(config))
+
     def get_config_value(self, key, default=None):
         """获取配置值"""
         config = self.load_config()
@@ -115,19 +147,25 @@ class ProjectConfigManager:
             return False
 
         # 更新字段
+        changed = False
         for key, value in kwargs.items():
-            if key in config:
+            if key in config and config[key] != value:
                 config[key] = value
+                changed = True
+
+        # 字段均未变化时不重写文件，也不刷新时间戳
+        if not changed:
+            print("ℹ️ 配置未变化，无需更新")
+            return True
 
         # 只有在不需要保留时间戳时才更新
         if not preserve_timestamp:
             config["saved_at"] = datetime.now().isoformat()
 
         try:
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            dump_json_file(config, self.config_file)
 
-            self._config_cache = config
+            self._remember_config(config)
             print(f"✅ 配置已更新")
             return True
 
@@ -158,6 +196,7 @@ class ProjectConfigManager:
             try:
                 self.config_file.unlink()
                 self._config_cache = None
+                _CONFIG_CACHE.pop(str(self.config_file), None)
                 print("✅ 项目配置已重置")
                 return True
             except OSError as e:
@@ -169,20 +208,13 @@ class ProjectConfigManager:
 
     def _validate_config(self, config):
         """验证配置文件格式"""
-        if not isinstance(config, dict):
-            return False
-
-        required_fields = ["source_branch", "target_branch", "version"]
-        for field in required_fields:
-            if field not in config:
-                return False
-
-        # 检查版本兼容性
-        config_version = config.get("version", "1.0")
-        if config_version not in ["1.0", "2.0"]:
-            return False
-
-        return True
+        return (
+            isinstance(config, dict)
+            and _REQUIRED_FIELDS.issubset(config)
+            # 检查版本兼容性（版本号须为字符串，避免不可哈希的值）
+            and isinstance(config["version"], str)
+            and config["version"] in _SUPPORTED_VERSIONS
+        )
 
     def export_config(self, export_path):
         """导出配置到指定路径"""
@@ -195,8 +227,7 @@ class ProjectConfigManager:
             export_file = Path(export_path)
             export_file.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(export_file, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            dump_json_file(config, export_file)
 
             print(f"✅ 配置已导出到: {export_file}")
             return True
@@ -213,8 +244,7 @@ class ProjectConfigManager:
                 print(f"❌ 导入文件不存在: {import_path}")
                 return False
 
-            with open(import_file, "r", encoding="utf-8") as f:
-                config = json.load(f)
+            config = load_json_file(import_file)
 
             if not self._validate_config(config):
                 print("❌ 导入的配置文件格式不正确")
@@ -224,12 +254,11 @@ class ProjectConfigManager:
             config["saved_at"] = datetime.now().isoformat()
 
             # 确保工作目录存在
-            self.work_dir.mkdir(exist_ok=True)
+            self._ensure_work_dir()
 
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            dump_json_file(config, self.config_file)
 
-            self._config_cache = config
+            self._remember_config(config)
             print(f"✅ 配置已从 {import_path} 导入")
             return True
 
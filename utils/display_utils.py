@@ -4,11 +4,40 @@ Git Merge Orchestrator - 通用显示工具
 """
 
 import json
+import sys
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
 from typing import List, Dict, Any, Optional
 
+from utils.file_helper import ensure_dir
+
+# 文件状态图标
+_STATUS_ICONS = {
+    "pending": "⏳",
+    "assigned": "📋",
+    "in_progress": "🔄",
+    "completed": "✅",
+}
+
+# 文件状态显示名称
+_STATUS_NAMES = {
+    "pending": "待处理",
+    "assigned": "已分配",
+    "in_progress": "进行中",
+    "completed": "已完成",
+}
+
+# 导出文件中单个文件条目的格式：序号、路径、状态及四个可选行
+_EXPORT_ENTRY_FORMAT = "%4d. %s\n      状态: %s\n%s%s%s%s\n"
+
+# 导出时每批写出的文件条目数（约1MB文本），限制内存中拼接的字符串大小
+_EXPORT_FLUSH_FILES = 4096
+
+# 分配原因显示的最大长度，避免过长
+_MAX_REASON_LENGTH = 60
+
 
 class DisplayMode(Enum):
     """显示模式枚举"""
@@ -26,7 +55,9 @@ class FileListDisplayer:
     def __init__(self, work_dir: Path = None):
         self.work_dir = work_dir or Path(".merge_work")
         self.export_dir = self.work_dir / "file_lists"
-        self.export_dir.mkdir(exist_ok=True)
+        ensure_dir(self.export_dir)
+        # 最近一次统计结果: (files列表, 列表长度, (状态, 负责人, 目录) 计数)
+        self._stats_cache = (None, 0, None)
 
     def display_file_list(
         self,
@@ -70,34 +101,33 @@ class FileListDisplayer:
         print("4. 💾 导出到文件")
         print("5. 📊 仅显示统计信息")
 
+        handlers = {
+            "1": lambda: self._display_summary(files),
+            "2": lambda: self._display_paginated(files),
+            "3": lambda: self._display_all_files(files),
+            "4": lambda: self._export_and_summarize(files, title, context),
+            "5": lambda: self._display_statistics_only(files),
+        }
+
         while True:
             try:
-                choice = input("请选择 (1-5): ").strip()
-
-                if choice == "1":
-                    self._display_summary(files)
-                    break
-                elif choice == "2":
-                    self._display_paginated(files)
-                    break
-                elif choice == "3":
-                    self._display_all_files(files)
+                handler = handlers.get(input("请选择 (1-5): ").strip())
+                if handler:
+                    handler()
                     break
-                elif choice == "4":
-                    export_path = self._export_to_file(files, title, context)
-                    print(f"✅ 文件列表已导出到: {export_path}")
-                    # 显示摘要
-                    self._display_summary(files)
-                    break
-                elif choice == "5":
-                    self._display_statistics_only(files)
-                    break
-                else:
-                    print("❌ 无效选择，请输入1-5")
+                print("❌ 无效选择，请输入1-5")
             except (KeyboardInterrupt, EOFError):
                 print("\n⏭️ 跳过显示")
                 break
 
+    def _export_and_summarize(
+        self, files: List[Dict[str, Any]], title: str, context: str = None
+    ) -> None:
+        """导出到文件后显示摘要"""
+        export_path = self._export_to_file(files, title, context)
+        print(f"✅ 文件列表已导出到: {export_path}")
+        self._display_summary(files)
+
     def _display_summary(self, files: List[Dict[str, Any]]) -> None:
         """显示摘要：前10+后10+统计"""
         total = len(files)
@@ -110,8 +140,7 @@ class FileListDisplayer:
 
         # 显示前10个
         print(f"\n🔼 前10个文件:")
-        for i, file_info in enumerate(files[:10], 1):
-            self._display_single_file(i, file_info)
+        self._display_file_range(files[:10], 1)
 
         # 显示省略信息
         if total > 20:
@@ -121,8 +150,7 @@ class FileListDisplayer:
         if total > 10:
             print(f"\n🔽 后10个文件:")
             start_idx = max(10, total - 10)
-            for i, file_info in enumerate(files[start_idx:], start_idx + 1):
-                self._display_single_file(i, file_info)
+            self._display_file_range(files[start_idx:], start_idx + 1)
 
         # 显示详细统计
         self._display_statistics(files)
@@ -145,8 +173,7 @@ class FileListDisplayer:
             )
             print("-" * 50)
 
-            for i, file_info in enumerate(current_files, start_idx + 1):
-                self._display_single_file(i, file_info)
+            self._display_file_range(current_files, start_idx + 1)
 
             # 分页控制
             if current_page < total_pages:
@@ -172,46 +199,49 @@ class FileListDisplayer:
         """显示所有文件"""
         print(f"\n📄 完整文件列表:")
 
-        for i, file_info in enumerate(files, 1):
-            self._display_single_file(i, file_info)
+        self._display_file_range(files, 1)
 
         self._display_statistics(files)
 
-    def _display_single_file(self, index: int, file_info: Dict[str, Any]) -> None:
-        """显示单个文件信息"""
+    def _display_file_range(self, files: List[Dict[str, Any]], start: int) -> None:
+        """显示一段连续的文件，整段格式化后一次写出"""
+        sys.stdout.write(
+            "".join(
+                self._format_single_file(i, file_info)
+                for i, file_info in enumerate(files, start)
+            )
+        )
+
+    def _format_single_file(self, index: int, file_info: Dict[str, Any]) -> str:
+        """格式化单个文件信息，返回以换行结尾的文本块"""
         # 状态图标
-        status_icon = {
-            "pending": "⏳",
-            "assigned": "📋",
-            "in_progress": "🔄",
-            "completed": "✅",
-        }.get(file_info.get("status", "unknown"), "❓")
+        status_icon = _STATUS_ICONS.get(file_info.get("status", "unknown"), "❓")
 
         # 基本信息
         path = file_info.get("path", "Unknown")
         assignee = file_info.get("assignee", "未分配")
 
-        print(f"  {index:3d}. {status_icon} {path}")
+        lines = ["  %3d. %s %s\n" % (index, status_icon, path)]
 
         # 负责人信息
         if assignee != "未分配":
-            print(f"       👤 负责人: {assignee}")
+            lines.append(f"       👤 负责人: {assignee}\n")
 
         # 分配原因
         reason = file_info.get("assignment_reason", "")
         if reason:
-            # 限制原因显示长度，避免过长
-            max_reason_length = 60
-            if len(reason) > max_reason_length:
-                reason = reason[:max_reason_length] + "..."
-            print(f"       📝 原因: {reason}")
+            if len(reason) > _MAX_REASON_LENGTH:
+                reason = reason[:_MAX_REASON_LENGTH] + "..."
+            lines.append(f"       📝 原因: {reason}\n")
 
         # 其他信息
         if file_info.get("priority"):
-            print(f"       ⭐ 优先级: {file_info['priority']}")
+            lines.append(f"       ⭐ 优先级: {file_info['priority']}\n")
 
         if file_info.get("completed_at"):
-            print(f"       ⏰ 完成时间: {file_info['completed_at']}")
+            lines.append(f"       ⏰ 完成时间: {file_info['completed_at']}\n")
+
+        return "".join(lines)
 
     def _display_statistics(self, files: List[Dict[str, Any]]) -> None:
         """显示详细统计信息"""
@@ -220,48 +250,18 @@ class FileListDisplayer:
 
         print(f"\n📊 详细统计信息:")
 
-        # 状态统计
-        status_stats = {}
-        assignee_stats = {}
-        directory_stats = {}
-
-        for file_info in files:
-            # 状态统计
-            status = file_info.get("status", "unknown")
-            status_stats[status] = status_stats.get(status, 0) + 1
-
-            # 负责人统计
-            assignee = file_info.get("assignee", "未分配")
-            assignee_stats[assignee] = assignee_stats.get(assignee, 0) + 1
-
-            # 目录统计
-            path = file_info.get("path", "")
-            if "/" in path:
-                directory = "/".join(path.split("/")[:-1])
-            else:
-                directory = "根目录"
-            directory_stats[directory] = directory_stats.get(directory, 0) + 1
+        status_stats, assignee_stats, directory_stats = self._compute_statistics(files)
 
         # 显示状态分布
         print("📈 状态分布:")
-        status_names = {
-            "pending": "待处理",
-            "assigned": "已分配",
-            "in_progress": "进行中",
-            "completed": "已完成",
-        }
-        for status, count in sorted(
-            status_stats.items(), key=lambda x: x[1], reverse=True
-        ):
-            status_display = status_names.get(status, status)
+        for status, count in status_stats.most_common():
+            status_display = _STATUS_NAMES.get(status, status)
             percentage = (count / len(files)) * 100
             print(f"  {status_display}: {count} 个 ({percentage:.1f}%)")
 
         # 显示负责人分布
         print("\n👥 负责人分布:")
-        for assignee, count in sorted(
-            assignee_stats.items(), key=lambda x: x[1], reverse=True
-        )[:10]:
+        for assignee, count in assignee_stats.most_common(10):
             percentage = (count / len(files)) * 100
             print(f"  {assignee}: {count} 个文件 ({percentage:.1f}%)")
         if len(assignee_stats) > 10:
@@ -269,14 +269,33 @@ class FileListDisplayer:
 
         # 显示目录分布
         print("\n📁 目录分布:")
-        for directory, count in sorted(
-            directory_stats.items(), key=lambda x: x[1], reverse=True
-        )[:10]:
+        for directory, count in directory_stats.most_common(10):
             percentage = (count / len(files)) * 100
             print(f"  {directory}: {count} 个文件 ({percentage:.1f}%)")
         if len(directory_stats) > 10:
             print(f"  ... 还有 {len(directory_stats) - 10} 个目录")
 
+    def _compute_statistics(self, files: List[Dict[str, Any]]):
+        """统计状态、负责人和目录分布
+
+        结果按 files 列表对象缓存，摘要、统计和导出对同一列表只统计一次。
+        """
+        cached_files, cached_len, cached_stats = self._stats_cache
+        if cached_files is files and cached_len == len(files):
+            return cached_stats
+
+        # Counter 直接消费可迭代对象时在C层计数，比逐个 += 1 更快
+        status_stats = Counter(file_info.get("status", "unknown") for file_info in files)
+        assignee_stats = Counter(file_info.get("assignee", "未分配") for file_info in files)
+        directory_stats = Counter(
+            path.rpartition("/")[0] if "/" in path else "根目录"
+            for path in (file_info.get("path", "") for file_info in files)
+        )
+
+        stats = (status_stats, assignee_stats, directory_stats)
+        self._stats_cache = (files, len(files), stats)
+        return stats
+
     def _display_statistics_only(self, files: List[Dict[str, Any]]) -> None:
         """仅显示统计信息"""
         print(f"\n📊 统计信息摘要:")
@@ -301,72 +320,69 @@ class FileListDisplayer:
         export_path = self.export_dir / filename
 
         with open(export_path, "w", encoding="utf-8") as f:
-            # 文件头
-            f.write(f"Git Merge Orchestrator - 文件列表导出\n")
-            f.write(f"=" * 60 + "\n")
-            f.write(f"标题: {title}\n")
-            if context:
-                f.write(f"上下文: {context}\n")
-            f.write(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"总文件数: {len(files)}\n")
-            f.write(f"=" * 60 + "\n\n")
-
-            # 详细文件列表
-            for i, file_info in enumerate(files, 1):
-                f.write(f"{i:4d}. {file_info.get('path', 'Unknown')}\n")
-                f.write(f"      状态: {file_info.get('status', 'unknown')}\n")
-
-                assignee = file_info.get("assignee")
-                if assignee:
-                    f.write(f"      负责人: {assignee}\n")
-
-                reason = file_info.get("assignment_reason")
-                if reason:
-                    f.write(f"      分配原因: {reason}\n")
-
-                priority = file_info.get("priority")
-                if priority:
-                    f.write(f"      优先级: {priority}\n")
-
-                completed_at = file_info.get("completed_at")
-                if completed_at:
-                    f.write(f"      完成时间: {completed_at}\n")
-
-                f.write("\n")
-
-            # 统计信息
-            f.write("\n" + "=" * 60 + "\n")
-            f.write("统计信息\n")
-            f.write("=" * 60 + "\n")
-
-            # 这里可以添加统计信息的文本版本
-            # 状态统计
-            status_stats = {}
-            assignee_stats = {}
-
-            for file_info in files:
-                status = file_info.get("status", "unknown")
-                status_stats[status] = status_stats.get(status, 0) + 1
-
-                assignee = file_info.get("assignee", "未分配")
-                assignee_stats[assignee] = assignee_stats.get(assignee, 0) + 1
-
-            f.write("\n状态分布:\n")
-            for status, count in sorted(
-                status_stats.items(), key=lambda x: x[1], reverse=True
-            ):
-                percentage = (count / len(files)) * 100
-                f.write(f"  {status}: {count} 个 ({percentage:.1f}%)\n")
-
-            f.write("\n负责人分布:\n")
-            for assignee, count in sorted(
-                assignee_stats.items(), key=lambda x: x[1], reverse=True
-            ):
-                percentage = (count / len(files)) * 100
-                f.write(f"  {assignee}: {count} 个文件 ({percentage:.1f}%)\n")
+            self._write_export(f, files, title, context)
 
         return str(export_path)
 
+    def _write_export(
+        self, f, files: List[Dict[str, Any]], title: str, context: Optional[str]
+    ) -> None:
+        """写入导出内容：内存中拼接，每 _EXPORT_FLUSH_FILES 个文件写出一次"""
+        separator = "=" * 60 + "\n"
+
+        # 文件头
+        parts = [
+            "Git Merge Orchestrator - 文件列表导出\n",
+            separator,
+            f"标题: {title}\n",
+        ]
+        if context:
+            parts.append(f"上下文: {context}\n")
+        parts.append(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append(f"总文件数: {len(files)}\n")
+        parts.append(separator + "\n")
+
+        # 详细文件列表：每个文件按模板一次格式化，可选字段为空时不输出对应行
+        for i, file_info in enumerate(files, 1):
+            assignee = file_info.get("assignee")
+            reason = file_info.get("assignment_reason")
+            priority = file_info.get("priority")
+            completed_at = file_info.get("completed_at")
+            parts.append(
+                _EXPORT_ENTRY_FORMAT
+                % (
+                    i,
+                    file_info.get("path", "Unknown"),
+                    file_info.get("status", "unknown"),
+                    f"      负责人: {assignee}\n" if assignee else "",
+                    f"      分配原因: {reason}\n" if reason else "",
+                    f"      优先级: {priority}\n" if priority else "",
+                    f"      完成时间: {completed_at}\n" if completed_at else "",
+                )
+            )
+
+            if i % _EXPORT_FLUSH_FILES == 0:
+                f.write("".join(parts))
+                parts.clear()
+
+        # 统计信息
+        status_stats, assignee_stats, _ = self._compute_statistics(files)
+        parts.append("\n" + separator)
+        parts.append("统计信息\n")
+        parts.append(separator)
+
+        parts.append("\n状态分布:\n")
+        for status, count in status_stats.most_common():
+            percentage = (count / len(files)) * 100
+            parts.append(f"  {status}: {count} 个 ({percentage:.1f}%)\n")
+
+        parts.append("\n负责人分布:\n")
+        for assignee, count in assignee_stats.most_common():
+            percentage = (count / len(files)) * 100
+            parts.append(f"  {assignee}: {count} 个文件 ({percentage:.1f}%)\n")
+
+        f.write("".join(parts))
+
 
 # 便捷函数
 def display_files_interactive(
@@ -10,6 +10,103 @@ from collections import defaultdict
 from datetime import datetime
 from config import WORK_DIR_NAME, PLAN_FILE_NAME, GROUP_TYPES
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_ORJSON_DUMP_OPTIONS = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) if orjson else 0
+_ORJSON_COMPACT_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def _alpha_bucket(char):
+    """按文件名首字符归类：字母(小写)、数字(0-9)或 other"""
+    lower = char.lower()
+    if lower.isalpha():
+        return lower
+    if lower.isdigit():
+        return "0-9"
+    return "other"
+
+
+# ASCII 首字符的分桶查找表，非 ASCII 字符仍走 _alpha_bucket
+_ASCII_ALPHA_BUCKETS = tuple(_alpha_bucket(chr(code)) for code in range(128))
+
+# 进程级只读计划缓存: 计划文件路径 -> ((mtime_ns, size), plan)，跨 FileHelper 实例共享
+_PLAN_CACHE = {}
+
+
+# 本进程内已确认存在的目录，避免反复发起 mkdir 系统调用
+_ENSURED_DIRS = set()
+
+
+def ensure_dir(path):
+    """确保目录存在（mkdir exist_ok），同一路径在进程内只创建一次
+
+    已确认的目录若在进程运行期间被外部删除，不会再次创建。
+    """
+    key = os.fspath(path)
+    if key not in _ENSURED_DIRS:
+        Path(path).mkdir(exist_ok=True)
+        _ENSURED_DIRS.add(key)
+
+
+def load_json_file(path):
+    """读取JSON文件，安装了 orjson 时使用其解析器"""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dump_json_file(data, path, compact=False):
+    """以2空格缩进写入JSON文件，安装了 orjson 时使用其序列化器
+
+    compact=True 时不缩进、分隔符不留空格，适合只由程序读取的文件。
+    先在内存中完成序列化，再一次性写入，避免 json.dump 的大量小块写入。
+    内容写入同目录下的临时文件后再替换目标文件，中途崩溃不会留下截断的JSON。
+    """
+    content = None
+    if orjson is not None:
+        try:
+            content = orjson.dumps(
+                data,
+                option=_ORJSON_COMPACT_OPTIONS if compact else _ORJSON_DUMP_OPTIONS,
+            )
+        except TypeError:
+            # orjson 不支持的类型（如超出64位的整数）回退到标准库
+            content = None
+    if content is None:
+        if compact:
+            text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        else:
+            text = json.dumps(data, indent=2, ensure_ascii=False)
+        content = text.encode("utf-8")
+
+    _atomic_write_bytes(path, content)
+
+
+def _atomic_write_bytes(path, content):
+    """写入临时文件后通过 os.replace 原子替换目标文件"""
+    tmp_path = f"{os.fspath(path)}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 
 class FileHelper:
     """文件操作助手类"""
@@ -18,7 +115,11 @@ class FileHelper:
         self.repo_path = Path(repo_path)
         self.max_files_per_group = max_files_per_group
         self.work_dir = self.repo_path / WORK_DIR_NAME
-        self.work_dir.mkdir(exist_ok=True)
+        ensure_dir(self.work_dir)
+        # 只读计划的组索引: (plan, (组名 -> 组, 小写负责人 -> 组列表))
+        self._group_index = (None, None)
+        # 只读计划的完成统计: (plan, stats)
+        self._completion_stats = (None, None)
 
     @property
     def plan_file_path(self):
@@ -30,13 +131,71 @@ class FileHelper:
         if not self.plan_file_path.exists():
             return None
 
-        with open(self.plan_file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return self._normalize_plan(load_json_file(self.plan_file_path))
+
+    @staticmethod
+    def _normalize_plan(plan):
+        """补齐旧版计划中缺失的组 file_count 字段，之后可直接读取该字段"""
+        if isinstance(plan, dict):
+            for group in plan.get("groups", ()):
+                if "file_count" not in group:
+                    group["file_count"] = len(group.get("files", []))
+        return plan
+
+    def read_plan(self):
+        """只读方式加载合并计划，文件未变化（mtime与大小一致）时复用进程级缓存
+
+        返回的对象被多个调用方共享，调用方不得修改；需要修改请使用 load_plan。
+        """
+        try:
+            st = os.stat(self.plan_file_path)
+        except OSError:
+            return None
+
+        cache_key = str(self.plan_file_path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        cached = _PLAN_CACHE.get(cache_key)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+
+        plan = self._normalize_plan(load_json_file(self.plan_file_path))
+        _PLAN_CACHE[cache_key] = (stat_key, plan)
+        return plan
+
+    def iter_groups(self):
+        """只读方式逐个返回计划中的组，计划不存在时返回None
+
+        缓存命中时直接遍历缓存；否则安装了 ijson 时流式解析，调用方找到目标后
+        停止迭代即可跳过后续内容；两者都不可用时退回 read_plan。
+        """
+        try:
+            st = os.stat(self.plan_file_path)
+        except OSError:
+            return None
+
+        cached = _PLAN_CACHE.get(str(self.plan_file_path))
+        if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+            return iter(cached[1].get("groups", []))
+
+        if ijson is None:
+            plan = self.read_plan()
+            return iter(plan.get("groups", [])) if plan is not None else None
+
+        return self._stream_groups()
+
+    def _stream_groups(self):
+        """使用 ijson 流式解析计划中的组"""
+        with open(self.plan_file_path, "rb") as f:
+            for group in ijson.items(f, "groups.item", use_float=True):
+                if "file_count" not in group:
+                    group["file_count"] = len(group.get("files", []))
+                yield group
 
     def save_plan(self, plan):
         """保存合并计划"""
-        with open(self.plan_file_path, "w", encoding="utf-8") as f:
-            json.dump(plan, f, indent=2, ensure_ascii=False)
+        dump_json_file(plan, self.plan_file_path)
+        # 调用方仍持有 plan 并可能继续修改，不缓存该对象，只使旧缓存失效
+        _PLAN_CACHE.pop(str(self.plan_file_path), None)
 
     def create_merge_plan_structure(self, source_branch, target_branch, integration_branch, changed_files, groups):
         """创建合并计划结构"""
@@ -70,20 +229,11 @@ class FileHelper:
         """迭代式文件分组，避免递归深度问题"""
         print(f"🔄 使用迭代算法处理 {len(file_paths)} 个文件...")
 
-        # 按目录层次分析文件
+        # 按顶级目录分桶：只用 partition 取首段，完整拆分推迟到需要逐层细分的大组
         path_analysis = {}
         for file_path in file_paths:
-            parts = file_path.split("/")
-            depth = len(parts) - 1
-
-            if depth == 0:
-                key = "root"
-            else:
-                key = parts[0]
-
-            if key not in path_analysis:
-                path_analysis[key] = []
-            path_analysis[key].append(file_path)
+            head, sep, _ = file_path.partition("/")
+            path_analysis.setdefault(head if sep else "root", []).append(file_path)
 
         print(f"📊 发现 {len(path_analysis)} 个顶级目录/分组")
 
@@ -93,64 +243,62 @@ class FileHelper:
 
             if len(files) <= self.max_files_per_group:
                 groups.append({"name": base_path, "files": files, "file_count": len(files), "type": "simple_group"})
+            elif base_path == "root":
+                groups.extend(self._split_by_alphabet(base_path, files))
             else:
-                sub_groups = self._split_large_group(base_path, files)
-                groups.extend(sub_groups)
+                # 每个路径只拆分一次，后续按层级索引复用
+                entries = [(file_path.split("/"), file_path) for file_path in files]
+                groups.extend(self._split_large_group(base_path, entries))
 
         print(f"✅ 分组完成：共 {len(groups)} 个组")
         return groups
 
-    def _split_large_group(self, base_path, files):
-        """分割大文件组为小组"""
-        groups = []
-
-        if base_path == "root":
-            return self._split_by_alphabet(base_path, files)
+    def _split_large_group(self, base_path, entries):
+        """按子目录逐层分割大文件组
 
-        # 非根目录：先按子目录分组
-        subdir_groups = defaultdict(list)
-        direct_files = []
-
-        for file_path in files:
-            if file_path.startswith(base_path + "/"):
-                relative_path = file_path[len(base_path + "/") :]
-                if "/" in relative_path:
-                    next_dir = relative_path.split("/")[0]
-                    subdir_groups[f"{base_path}/{next_dir}"].append(file_path)
+        entries 为 (路径分段, 路径) 列表，且均位于 base_path 目录下。
+        使用显式栈按深度优先顺序处理子目录，每层只按分段索引归类一次，
+        不做递归和前缀字符串比较。
+        """
+        groups = []
+        # 栈元素: (目录路径, 目录深度, entries)；子目录逆序入栈以保持原有输出顺序
+        stack = [(base_path, 1, entries)]
+
+        while stack:
+            dir_path, depth, dir_entries = stack.pop()
+
+            if len(dir_entries) <= self.max_files_per_group:
+                files = [file_path for _, file_path in dir_entries]
+                groups.append({"name": dir_path, "files": files, "file_count": len(files), "type": "subdir_group"})
+                continue
+
+            subdir_groups = {}
+            direct_files = []
+            child_depth = depth + 1
+            for entry in dir_entries:
+                parts = entry[0]
+                if len(parts) > child_depth:
+                    subdir_groups.setdefault(parts[depth], []).append(entry)
                 else:
-                    direct_files.append(file_path)
-            else:
-                direct_files.append(file_path)
-
-        # 处理直接文件
-        if direct_files:
-            if len(direct_files) <= self.max_files_per_group:
-                groups.append(
-                    {
-                        "name": f"{base_path}/direct",
-                        "files": direct_files,
-                        "file_count": len(direct_files),
-                        "type": "direct_files",
-                    }
-                )
-            else:
-                batch_groups = self._split_into_batches(f"{base_path}/direct", direct_files)
-                groups.extend(batch_groups)
+                    direct_files.append(entry[1])
+
+            # 处理直接文件
+            if direct_files:
+                if len(direct_files) <= self.max_files_per_group:
+                    groups.append(
+                        {
+                            "name": f"{dir_path}/direct",
+                            "files": direct_files,
+                            "file_count": len(direct_files),
+                            "type": "direct_files",
+                        }
+                    )
+                else:
+                    groups.extend(self._split_into_batches(f"{dir_path}/direct", direct_files))
 
-        # 处理子目录
-        for subdir_path, subdir_files in subdir_groups.items():
-            if len(subdir_files) <= self.max_files_per_group:
-                groups.append(
-                    {
-                        "name": subdir_path,
-                        "files": subdir_files,
-                        "file_count": len(subdir_files),
-                        "type": "subdir_group",
-                    }
-                )
-            else:
-                sub_groups = self._split_large_group(subdir_path, subdir_files)
-                groups.extend(sub_groups)
+            # 子目录入栈
+            for next_dir, subdir_entries in reversed(list(subdir_groups.items())):
+                stack.append((f"{dir_path}/{next_dir}", child_depth, subdir_entries))
 
         return groups
 
@@ -158,15 +306,13 @@ class FileHelper:
         """按字母分组文件"""
         alpha_groups = defaultdict(list)
         for file_path in files:
-            filename = file_path.split("/")[-1]
-            first_char = filename[0].lower()
-
-            if first_char.isalpha():
-                alpha_groups[first_char].append(file_path)
-            elif first_char.isdigit():
-                alpha_groups["0-9"].append(file_path)
+            first_char = file_path.rpartition("/")[2][0]
+            code = ord(first_char)
+            if code < 128:
+                bucket = _ASCII_ALPHA_BUCKETS[code]
             else:
-                alpha_groups["other"].append(file_path)
+                bucket = _alpha_bucket(first_char)
+            alpha_groups[bucket].append(file_path)
 
         groups = []
         for alpha, alpha_files in alpha_groups.items():
@@ -214,8 +360,38 @@ class FileHelper:
         """获取分组类型的描述"""
         return GROUP_TYPES.get(group_type, "未知类型")
 
+    def _is_read_only_plan(self, plan):
+        """plan 是否为 read_plan 缓存中的只读计划对象"""
+        cached = _PLAN_CACHE.get(str(self.plan_file_path))
+        return cached is not None and cached[1] is plan
+
+    def _read_only_group_index(self, plan):
+        """返回只读计划的组索引；plan 不是 read_plan 缓存的对象时返回None
+
+        load_plan 返回的计划可能被调用方修改，对其建立索引会过期，因此只为
+        进程级缓存中的只读计划建立索引，计划文件变化或保存后自动失效。
+        """
+        if not self._is_read_only_plan(plan):
+            return None
+
+        indexed_plan, index = self._group_index
+        if indexed_plan is not plan:
+            by_name = {}
+            by_assignee = defaultdict(list)
+            for group in plan.get("groups", []):
+                # 组名重复时保留第一个，与线性查找一致
+                by_name.setdefault(group["name"], group)
+                by_assignee[(group.get("assignee") or "").lower()].append(group)
+            index = (by_name, by_assignee)
+            self._group_index = (plan, index)
+        return index
+
     def find_group_by_name(self, plan, group_name):
         """根据组名查找组"""
+        index = self._read_only_group_index(plan)
+        if index is not None:
+            return index[0].get(group_name)
+
         for group in plan["groups"]:
             if group["name"] == group_name:
                 return group
@@ -223,6 +399,10 @@ class FileHelper:
 
     def get_assignee_groups(self, plan, assignee_name):
         """获取指定负责人的所有组"""
+        index = self._read_only_group_index(plan)
+        if index is not None:
+            return list(index[1].get(assignee_name.lower(), ()))
+
         assignee_groups = []
         for group in plan["groups"]:
             if group.get("assignee", "").lower() == assignee_name.lower():
@@ -286,17 +466,32 @@ class FileHelper:
                 "completed_files": 0,
             }
 
-        total_groups = len(plan["groups"])
-        assigned_groups = sum(1 for g in plan["groups"] if g.get("assignee"))
-        completed_groups = sum(1 for g in plan["groups"] if g.get("status") == "completed")
+        # 只读计划的统计结果按计划对象缓存，计划文件变化或保存后自动失效
+        cacheable = self._is_read_only_plan(plan)
+        if cacheable and self._completion_stats[0] is plan:
+            return dict(self._completion_stats[1])
+
+        groups = plan["groups"]
+        total_groups = len(groups)
+        assigned_groups = completed_groups = 0
+        assigned_files = completed_files = 0
+        for g in groups:
+            assignee = g.get("assignee")
+            completed = g.get("status") == "completed"
+            if not (assignee or completed):
+                continue
+            # 计划加载时已补齐 file_count
+            file_count = g["file_count"]
+            if assignee:
+                assigned_groups += 1
+                assigned_files += file_count
+            if completed:
+                completed_groups += 1
+                completed_files += file_count
 
         total_files = plan.get("total_files", 0)
-        assigned_files = sum(g.get("file_count", len(g.get("files", []))) for g in plan["groups"] if g.get("assignee"))
-        completed_files = sum(
-            g.get("file_count", len(g.get("files", []))) for g in plan["groups"] if g.get("status") == "completed"
-        )
 
-        return {
+        stats = {
             "total_groups": total_groups,
             "assigned_groups": assigned_groups,
             "completed_groups": completed_groups,
@@ -304,3 +499,6 @@ class FileHelper:
             "assigned_files": assigned_files,
             "completed_files": completed_files,
         }
+        if cacheable:
+            self._completion_stats = (plan, stats)
+        return dict(stats)
@@ -4,12 +4,24 @@ Git Merge Orchestrator - 忽略规则管理器
 """
 
 import os
+import atexit
+import posixpath
 import re
+import sys
 import fnmatch
+import threading
+import weakref
 from pathlib import Path
 from typing import List, Dict, Set, Optional, Union
 import json
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+
+try:
+    import re2
+except ImportError:
+    re2 = None
 
 from config import (
     DEFAULT_IGNORE_PATTERNS,
@@ -17,6 +29,50 @@ from config import (
     WORK_DIR_NAME,
     IGNORE_FILE_NAME,
 )
+from utils.file_helper import dump_json_file, ensure_dir
+
+# 需要持久化到配置文件的规则来源
+_PERSISTED_SOURCES = frozenset({"user_added", "config"})
+
+# 配置写入的防抖延迟（秒）：窗口内的多次规则修改合并为一次写入
+_SAVE_DELAY = 0.5
+
+# 有尚未写入配置的管理器，读取配置前和进程退出时统一写入
+_PENDING_SAVES = weakref.WeakSet()
+
+
+def _flush_pending_saves():
+    """写入所有管理器尚未保存的配置"""
+    for manager in list(_PENDING_SAVES):
+        manager.flush()
+
+
+atexit.register(_flush_pending_saves)
+
+# 匹配结果缓存的最大条目数
+_MATCH_CACHE_SIZE = 20000
+
+# 目录前缀树中表示"模式在此结束"的键（路径片段均为字符串，不会冲突）
+_TRIE_END = None
+
+# RE2 不支持的正则结构（环视、原子组），出现时合并正则仍使用 re
+_RE2_UNSUPPORTED = ("(?=", "(?!", "(?<", "(?>")
+
+# 未转义的 \Z（re 的串尾锚点），RE2 中对应写法为 \z
+_PY_END_ANCHOR = re.compile(r"(?<!\\)((?:\\\\)*)\\Z")
+
+# 用户正则开头的全局内联标志，如 (?i)；其中 i/m/s 可改写为只作用于自身的 (?i:...)
+_LEADING_FLAGS = re.compile(r"(?:\(\?[a-zA-Z]+\))+")
+_SCOPABLE_FLAGS = frozenset("ims")
+
+# 与 fnmatch.fnmatch 保持一致: 大小写不敏感的平台上合并后的正则也忽略大小写
+_GLOB_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+
+
+@lru_cache(maxsize=4096)
+def _glob_regex(pattern: str):
+    """将 glob 模式编译为正则并缓存，规则重新编译时无需再次 translate"""
+    return re.compile(fnmatch.translate(pattern), _GLOB_FLAGS)
 
 
 class IgnoreManager:
@@ -30,6 +86,9 @@ class IgnoreManager:
             repo_path: 仓库根目录路径
         """
         self.repo_path = Path(repo_path).resolve()
+        # 仓库根目录的字符串前缀，用于不访问文件系统的路径规范化
+        self._repo_path_str = str(self.repo_path).replace("\\", "/")
+        self._repo_prefix_str = self._repo_path_str.rstrip("/") + "/"
         self.work_dir = self.repo_path / WORK_DIR_NAME
         self.ignore_file = self.repo_path / IGNORE_FILE_NAME
         self.config_file = self.work_dir / "ignore_config.json"
@@ -38,6 +97,20 @@ class IgnoreManager:
         self.rules: List[Dict] = []
         self.compiled_patterns: Dict = {}
 
+        # 当前规则集的专用匹配函数及其结果缓存 (规范化路径, 是否目录) -> bool，
+        # 均在 _rebuild_matchers 中生成，规则变更后随之替换
+        self._match_fn = None
+        self._match_cached = None
+        # 文件系统目录判断缓存: 规范化路径 -> bool
+        self._directory_cache: Dict[str, bool] = {}
+        # 延迟编译标记，见 _ensure_compiled
+        self._rules_dirty = False
+        self._matchers_dirty = False
+        # 延迟保存状态，见 _save_config / flush
+        self._config_dirty = False
+        self._save_timer = None
+        self._save_lock = threading.Lock()
+
         # 统计信息
         self.stats = {
             "total_rules": 0,
@@ -51,29 +124,31 @@ class IgnoreManager:
 
     def _load_ignore_rules(self):
         """加载忽略规则 - 从多个源加载"""
+        # 同一次加载的规则共用一个创建时间
+        now_iso = datetime.now().isoformat()
+
         try:
             # 1. 加载默认规则
-            self._load_default_rules()
+            self._load_default_rules(now_iso)
 
             # 2. 加载项目级忽略文件
-            self._load_ignore_file()
+            self._load_ignore_file(now_iso)
 
             # 3. 加载配置文件中的自定义规则
             self._load_config_rules()
 
-            # 4. 编译规则
-            self._compile_rules()
-
-            # 5. 更新统计信息
+            # 4. 更新统计信息
             self._update_stats()
 
         except Exception as e:
             print(f"⚠️ 加载忽略规则失败: {e}")
             # 使用默认规则作为后备
-            self._load_default_rules()
-            self._compile_rules()
+            self._load_default_rules(now_iso)
 
-    def _load_default_rules(self):
+        # 5. 编译推迟到第一次匹配时进行，不做过滤的命令无需编译正则
+        self._rules_dirty = True
+
+    def _load_default_rules(self, now_iso: str):
         """加载默认忽略规则"""
         self.rules = []
         for pattern in DEFAULT_IGNORE_PATTERNS:
@@ -84,11 +159,11 @@ class IgnoreManager:
                     "enabled": True,
                     "source": "default",
                     "description": f"默认规则: {pattern}",
-                    "created_at": datetime.now().isoformat(),
+                    "created_at": now_iso,
                 }
             )
 
-    def _load_ignore_file(self):
+    def _load_ignore_file(self, now_iso: str):
         """加载项目级.merge_ignore文件"""
         if not self.ignore_file.exists():
             return
@@ -123,7 +198,7 @@ class IgnoreManager:
                             "source": "ignore_file",
                             "description": f"项目规则: {pattern}",
                             "line_number": line_num,
-                            "created_at": datetime.now().isoformat(),
+                            "created_at": now_iso,
                         }
                     )
 
@@ -132,6 +207,9 @@ class IgnoreManager:
 
     def _load_config_rules(self):
         """加载配置文件中的自定义规则"""
+        # 其他管理器可能有尚未写入的规则修改，先落盘再读取
+        _flush_pending_saves()
+
         if not self.config_file.exists():
             return
 
@@ -162,38 +240,272 @@ class IgnoreManager:
             "prefix": [],
             "suffix": [],
         }
+        # 默认规则、忽略文件和配置文件可能重复提供同一规则，只编译一次
+        self._compiled_keys = set()
 
         for rule in self.rules:
-            if not rule.get("enabled", True):
+            self._compile_single_rule(rule)
+
+        self._rebuild_matchers()
+        self._rules_dirty = False
+
+    def _compile_single_rule(self, rule: Dict):
+        """将单条规则加入 compiled_patterns，派生的匹配结构需另行重建"""
+        if not rule.get("enabled", True):
+            return
+
+        pattern = rule["pattern"]
+        rule_type = rule["type"]
+
+        try:
+            key = (rule_type, pattern)
+            if key in self._compiled_keys:
+                return
+            self._compiled_keys.add(key)
+            pattern = sys.intern(pattern)
+
+            if rule_type == "glob":
+                # glob模式直接存储
+                self.compiled_patterns["glob"].append(pattern)
+
+            elif rule_type == "regex":
+                # 编译正则表达式
+                compiled_regex = re.compile(pattern)
+                self.compiled_patterns["regex"].append(compiled_regex)
+
+            elif rule_type == "exact":
+                # 精确匹配使用集合
+                self.compiled_patterns["exact"].add(pattern)
+
+            elif rule_type == "prefix":
+                # 前缀匹配
+                self.compiled_patterns["prefix"].append(pattern)
+
+            elif rule_type == "suffix":
+                # 后缀匹配
+                self.compiled_patterns["suffix"].append(pattern)
+
+        except Exception as e:
+            print(f"⚠️ 编译规则失败 {pattern}: {e}")
+
+    def _rebuild_matchers(self):
+        """根据 compiled_patterns 重建前缀树、合并正则等匹配结构，并重置结果缓存"""
+        self._directory_cache.clear()
+
+        # str.startswith/endswith 接受元组，在 C 层一次测试全部候选
+        self._prefix_tuple = tuple(self.compiled_patterns["prefix"])
+        self._suffix_tuple = tuple(self.compiled_patterns["suffix"])
+
+        self._build_dir_tries()
+        self._build_glob_regexes()
+        self._build_mega_regex()
+        self._match_fn = self._build_match_fn()
+        self._match_cached = lru_cache(maxsize=_MATCH_CACHE_SIZE)(self._match_fn)
+        self._matchers_dirty = False
+
+    def _ensure_compiled(self):
+        """
+        规则变更后延迟编译: add_rule 只追加单条规则，remove_rule/toggle_rule
+        标记需要全量重编译，实际工作推迟到下一次匹配时一并完成
+        """
+        if self._rules_dirty:
+            self._compile_rules()
+        elif self._matchers_dirty:
+            self._rebuild_matchers()
+
+    def _build_dir_tries(self):
+        """
+        将非 **/ 开头的目录模式按路径片段构建为前缀树
+
+        这类模式按字面匹配，不使用通配符，因此可以用前缀树替代逐条扫描:
+        - _dir_trie: 所有此类模式，从路径开头匹配
+        - _nested_dir_trie: 多级模式 (如 app/settings/)，可从任意片段开始匹配
+        其余 glob 模式保留在 _glob_fallback 中逐条匹配。
+        """
+        self._dir_trie = {}
+        self._nested_dir_trie = {}
+        self._glob_fallback = []
+
+        for pattern in self.compiled_patterns["glob"]:
+            if not pattern.endswith("/") or pattern.startswith("**/"):
+                self._glob_fallback.append(pattern)
                 continue
 
-            pattern = rule["pattern"]
-            rule_type = rule["type"]
+            parts = pattern.rstrip("/").split("/")
+            tries = [self._dir_trie]
+            if len(parts) > 1:
+                tries.append(self._nested_dir_trie)
+            for trie in tries:
+                node = trie
+                for part in parts:
+                    node = node.setdefault(part, {})
+                node[_TRIE_END] = True
+
+    def _build_glob_regexes(self):
+        """
+        将前缀树之外的 glob 模式通过 fnmatch.translate 合并为正则，一次匹配代替逐条 fnmatch
 
-            try:
-                if rule_type == "glob":
-                    # glob模式直接存储
-                    self.compiled_patterns["glob"].append(pattern)
+        - _glob_file_re: 匹配完整路径的文件模式（含/的模式，以及不含/的通配模式）
+        - _glob_name_re: 不含/的模式，只对文件名（最后一个片段）匹配。单独成一个
+          正则而不用前瞻截取文件名，合并正则和它都能交给 RE2
+        - _glob_dir_re / _glob_dir_names: **/name/ 模式，逐个路径片段匹配
+        """
+        path_parts = []
+        name_parts = []
+        dir_parts = []
+        dir_names = set()
+
+        for pattern in self._glob_fallback:
+            if pattern.endswith("/"):
+                directory_name = pattern.rstrip("/")[3:]
+                dir_names.add(directory_name)
+                dir_parts.append(_glob_regex(directory_name).pattern)
+            elif "/" in pattern:
+                path_parts.append(_glob_regex(pattern).pattern)
+            else:
+                name_parts.append(_glob_regex(pattern).pattern)
+                name_parts.append(re.escape(pattern) + r"\Z")
+                if "*" in pattern or "?" in pattern:
+                    path_parts.append(_glob_regex(pattern).pattern)
+
+        self._glob_file_re = (
+            re.compile("|".join(f"(?:{part})" for part in path_parts), _GLOB_FLAGS)
+            if path_parts
+            else None
+        )
+        self._glob_name_re = None
+        if name_parts:
+            flag = "i" if _GLOB_FLAGS else ""
+            name_source = r"(?%s:%s)" % (flag, "|".join(name_parts))
+            self._glob_name_re = self._compile_with_re2(name_source) or re.compile(
+                name_source
+            )
+        self._glob_dir_re = (
+            re.compile("|".join(dir_parts), _GLOB_FLAGS) if dir_parts else None
+        )
+        self._glob_dir_names = frozenset(dir_names)
 
-                elif rule_type == "regex":
-                    # 编译正则表达式
-                    compiled_regex = re.compile(pattern)
-                    self.compiled_patterns["regex"].append(compiled_regex)
+    def _build_mega_regex(self):
+        """
+        将纯字符串层面的匹配合并为一个正则，一次 match 代替多轮匹配
+
+        合并内容: 完整路径的文件 glob 以及可合并的用户正则（加 .*? 前缀，
+        等价于 search）。只匹配文件名的 glob 由 _glob_name_re 单独匹配。
+        精确、前缀、后缀匹配由集合和 str.startswith/endswith
+        的元组形式在 C 层完成，比正则更快，不参与合并。用户正则同时
+        合并为 _fused_user_regex 供 _match_regex 使用；不可合并的保留在
+        _unfused_regex 中单独匹配。目录前缀树和 **/name/ 模式需要按路径
+        片段匹配，不参与合并。
+        """
+        patterns = self.compiled_patterns
+        parts = []
+
+        if self._glob_file_re is not None:
+            flag = "i" if _GLOB_FLAGS else ""
+            parts.append(r"(?%s:%s)" % (flag, self._glob_file_re.pattern))
+
+        self._unfused_regex = []
+        user_sources = []
+        for compiled_regex in patterns["regex"]:
+            source = self._fusable_regex_source(compiled_regex)
+            if source is None:
+                self._unfused_regex.append(compiled_regex)
+            else:
+                user_sources.append(source)
 
-                elif rule_type == "exact":
-                    # 精确匹配使用集合
-                    self.compiled_patterns["exact"].add(pattern)
+        self._fused_user_regex = (
+            re.compile("|".join(f"(?:{source})" for source in user_sources))
+            if user_sources
+            else None
+        )
 
-                elif rule_type == "prefix":
-                    # 前缀匹配
-                    self.compiled_patterns["prefix"].append(pattern)
+        user_parts = [f"(?s:.*?)(?:{source})" for source in user_sources]
+        source = "|".join(parts + user_parts)
+        if not source:
+            self._mega_re = None
+        elif user_parts:
+            self._mega_re = re.compile(source)
+        else:
+            self._mega_re = self._compile_with_re2(source) or re.compile(source)
 
-                elif rule_type == "suffix":
-                    # 后缀匹配
-                    self.compiled_patterns["suffix"].append(pattern)
+    @staticmethod
+    def _fusable_regex_source(compiled_regex):
+        """
+        返回可安全并入合并正则的用户正则源码，不可合并时返回None
 
-            except Exception as e:
-                print(f"⚠️ 编译规则失败 {pattern}: {e}")
+        含分组的正则合并后反向引用编号会改变；开头的 i/m/s 全局标志
+        改写为局部标志 (?ims:...)，其他标志（如 x 的注释会吞掉右括号）不合并。
+        """
+        if compiled_regex.groups:
+            return None
+
+        pattern = compiled_regex.pattern
+        leading = _LEADING_FLAGS.match(pattern)
+        if leading is None:
+            return pattern if compiled_regex.flags == re.UNICODE else None
+
+        flags = set(leading.group()) - set("(?)")
+        if not flags <= _SCOPABLE_FLAGS:
+            return None
+        return f"(?{''.join(sorted(flags))}:{pattern[leading.end():]})"
+
+    @staticmethod
+    def _compile_with_re2(source: str):
+        """
+        尝试用 RE2（线性时间匹配）编译合并正则，不可用时返回None
+
+        只用于由 re.escape 和 fnmatch.translate 生成的源码；用户正则的
+        \\w、$ 等语义在 RE2 中与 re 不同，不交给 RE2。
+        """
+        if re2 is None or any(token in source for token in _RE2_UNSUPPORTED):
+            return None
+        try:
+            return re2.compile(_PY_END_ANCHOR.sub(r"\1\\z", source))
+        except re2.error:
+            return None
+
+    def _trie_lookup(
+        self,
+        path: str,
+        is_directory: Optional[bool] = None,
+        parts: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        在目录前缀树中查找路径，语义与 _match_exact_directory 一致
+
+        is_directory 不为True时，仅在路径恰好等于某个目录模式时才检查文件系统；
+        parts 为调用方已切分好的路径片段，避免重复 split
+        """
+        if parts is None:
+            parts = path.split("/")
+        last = len(parts) - 1
+
+        # 从路径开头匹配: 文件位于目录下，或路径本身就是该目录
+        node = self._dir_trie
+        for i, part in enumerate(parts):
+            node = node.get(part)
+            if node is None:
+                break
+            if _TRIE_END in node:
+                if i < last or is_directory:
+                    return True
+                # 路径恰好等于目录模式时以文件系统为准: 传入的类型可能来自
+                # 扩展名判断，conf.d、v1.2 这类带点的目录会被误判为文件
+                if self._stat_is_directory(path):
+                    return True
+
+        # 多级模式可以出现在路径的任意位置
+        if self._nested_dir_trie:
+            for start in range(1, len(parts)):
+                node = self._nested_dir_trie
+                for part in parts[start:]:
+                    node = node.get(part)
+                    if node is None:
+                        break
+                    if _TRIE_END in node:
+                        return True
+
+        return False
 
     def should_ignore(self, file_path: Union[str, Path]) -> bool:
         """
@@ -205,31 +517,109 @@ class IgnoreManager:
         Returns:
             bool: True表示应该忽略
         """
+        self._ensure_compiled()
+
         if isinstance(file_path, Path):
             file_path = str(file_path)
 
         # 规范化路径 (使用相对路径进行匹配)
+        normalized_path = self._normalize_path(file_path)
+
+        # 检查路径是否为目录
+        is_directory = self._is_directory_path(file_path, normalized_path)
+
+        return self._match_cached(normalized_path, is_directory)
+
+    def should_ignore_from_entry(self, entry: os.DirEntry) -> bool:
+        """
+        检查 os.scandir 返回的目录项是否应该被忽略
+
+        目录项自带类型信息（DirEntry.is_dir() 通常无需额外 stat），
+        遍历目录时使用可以省去 should_ignore 中的文件系统判断。
+
+        Args:
+            entry: os.scandir 返回的目录项
+
+        Returns:
+            bool: True表示应该忽略
+        """
+        self._ensure_compiled()
+
+        normalized_path = self._normalize_path(entry.path)
+        try:
+            is_directory = entry.is_dir()
+        except OSError:
+            is_directory = False
+
+        return self._match_cached(normalized_path, is_directory)
+
+    def _normalize_path(self, file_path: str) -> str:
+        """
+        将路径规范化为相对仓库根目录、以/分隔的字符串
+
+        常见情况（相对路径、仓库内的绝对路径）只做字符串运算；
+        含有 .. 或位于仓库前缀之外的绝对路径才回退到 Path.resolve()。
+        """
+        path_str = file_path.replace("\\", "/")
+        if ".." not in path_str:
+            path_str = posixpath.normpath(path_str)
+            if not os.path.isabs(path_str):
+                return path_str
+            if path_str.startswith(self._repo_prefix_str):
+                return path_str[len(self._repo_prefix_str) :]
+            if path_str == self._repo_path_str:
+                return "."
+
         try:
             abs_path = Path(file_path).resolve()
             if abs_path.is_relative_to(self.repo_path):
                 rel_path = abs_path.relative_to(self.repo_path)
-                normalized_path = str(rel_path).replace("\\", "/")
-            else:
-                normalized_path = str(Path(file_path)).replace("\\", "/")
+                return str(rel_path).replace("\\", "/")
         except:
-            normalized_path = str(Path(file_path)).replace("\\", "/")
+            pass
+        return str(Path(file_path)).replace("\\", "/")
 
-        # 检查路径是否为目录
-        is_directory = self._is_directory_path(file_path, normalized_path)
+    def _match_normalized(self, normalized_path: str, is_directory: bool) -> bool:
+        """对规范化路径按类型进行匹配，传递目录信息用于更精确的匹配"""
+        return self._match_fn(normalized_path, is_directory)
 
-        # 按类型进行匹配，传递目录信息用于更精确的匹配
-        return (
-            self._match_exact(normalized_path)
-            or self._match_glob_with_type(normalized_path, is_directory)
-            or self._match_regex(normalized_path)
-            or self._match_prefix(normalized_path)
-            or self._match_suffix(normalized_path)
+    def _build_match_fn(self):
+        """
+        为当前规则集生成专用的匹配函数
+
+        编译结果在规则再次变更前保持不变，因此把集合、元组、合并正则等
+        绑定为闭包变量，并省略没有规则的匹配步骤；热路径上没有属性查找
+        和字典索引。
+        """
+        exact = self.compiled_patterns["exact"]
+        prefixes = self._prefix_tuple
+        suffixes = self._suffix_tuple
+        mega_match = self._mega_re.match if self._mega_re is not None else None
+        name_match = (
+            self._glob_name_re.match if self._glob_name_re is not None else None
+        )
+        match_segments = (
+            self._match_segments
+            if self._dir_trie or self._glob_dir_re is not None
+            else None
         )
+        unfused_searches = tuple(r.search for r in self._unfused_regex)
+
+        def match(path: str, is_directory: bool) -> bool:
+            if path in exact or path.startswith(prefixes) or path.endswith(suffixes):
+                return True
+            if mega_match is not None and mega_match(path):
+                return True
+            if name_match is not None and name_match(posixpath.basename(path)):
+                return True
+            if match_segments is not None and match_segments(path, is_directory):
+                return True
+            for search in unfused_searches:
+                if search(path):
+                    return True
+            return False
+
+        return match
 
     def _is_directory_path(self, original_path: str, normalized_path: str) -> bool:
         """
@@ -246,27 +636,66 @@ class IgnoreManager:
         if normalized_path.endswith("/") or original_path.endswith("/"):
             return True
 
-        # 方法2: 检查实际文件系统（如果文件存在）
-        try:
-            full_path = self.repo_path / normalized_path
-            if full_path.exists():
-                return full_path.is_dir()
-        except:
-            pass
+        # 方法2: 文件名带扩展名，按文件处理，无需访问文件系统
+        # （.git、.idea 这类以点开头的名称不算扩展名，仍需检查）
+        if "." in posixpath.basename(normalized_path).lstrip("."):
+            return False
 
-        # 方法3: 启发式判断 - 更保守的方法
-        # 只有在明确指示为目录时才返回True，否则假设为文件
-        # 这避免了将无扩展名文件误判为目录
+        # 方法3: 无法从字符串判断时才检查实际文件系统
+        return self._stat_is_directory(normalized_path)
 
-        return False
+    def _stat_is_directory(self, normalized_path: str) -> bool:
+        """
+        按文件系统判断路径是否为目录（结果按路径缓存）
+
+        不存在的路径假设为文件，避免将无扩展名文件误判为目录
+        """
+        cached = self._directory_cache.get(normalized_path)
+        if cached is not None:
+            return cached
+
+        # os.path.isdir 只需一次 stat，路径不存在时返回False
+        is_directory = os.path.isdir(os.path.join(self.repo_path, normalized_path))
+        self._directory_cache[normalized_path] = is_directory
+        return is_directory
 
     def _match_glob_with_type(self, path: str, is_directory: bool) -> bool:
         """带类型信息的glob匹配"""
-        for pattern in self.compiled_patterns["glob"]:
-            if self._match_single_pattern_with_type(path, pattern, is_directory):
+        if self._dir_trie and self._trie_lookup(path, is_directory):
+            return True
+
+        if self._glob_file_re is not None and self._glob_file_re.match(path):
+            return True
+
+        if self._glob_name_re is not None and self._glob_name_re.match(
+            posixpath.basename(path)
+        ):
+            return True
+
+        return self._glob_dir_re is not None and self._match_dir_globs(path)
+
+    def _match_dir_globs(self, path: str, parts: Optional[List[str]] = None) -> bool:
+        """**/name/ 模式：除最后一个片段外（路径以/结尾时包括最后一个）逐片段匹配"""
+        if parts is None:
+            parts = path.split("/")
+        count = len(parts) if path.endswith("/") else len(parts) - 1
+        for part in islice(parts, count):
+            if part in self._glob_dir_names or self._glob_dir_re.fullmatch(part):
                 return True
         return False
 
+    def _match_segments(self, path: str, is_directory: Optional[bool] = None) -> bool:
+        """按路径片段匹配（目录前缀树和 **/name/ 模式），路径只切分一次"""
+        has_trie = bool(self._dir_trie)
+        has_dir_globs = self._glob_dir_re is not None
+        if not (has_trie or has_dir_globs):
+            return False
+
+        parts = path.split("/")
+        return (has_trie and self._trie_lookup(path, is_directory, parts)) or (
+            has_dir_globs and self._match_dir_globs(path, parts)
+        )
+
     def _match_single_pattern_with_type(
         self, path: str, pattern: str, is_directory: bool
     ) -> bool:
@@ -274,12 +703,12 @@ class IgnoreManager:
         # 目录模式处理
         if pattern.endswith("/"):
             # 目录模式：只能匹配目录或目录内的文件，不能匹配同名文件
-            return self._match_directory_pattern(path, pattern)
+            return self._match_directory_pattern(path, pattern, is_directory)
         else:
             # 文件模式：可以匹配文件或目录（取决于具体实现）
-            # 但是对于通配符模式，优先使用fnmatch
+            # 但是对于通配符模式，优先使用glob正则匹配
             if "**" in pattern or "*" in pattern or "?" in pattern:
-                if fnmatch.fnmatch(path, pattern):
+                if _glob_regex(pattern).match(path):
                     return True
 
             # 精确文件匹配
@@ -310,16 +739,19 @@ class IgnoreManager:
     def _match_single_pattern(self, path: str, pattern: str) -> bool:
         """匹配单个glob模式"""
         # 直接glob匹配（处理通配符模式）
-        if fnmatch.fnmatch(path, pattern):
+        if _glob_regex(pattern).match(path):
             return True
 
         # 目录模式处理
         if pattern.endswith("/"):
-            return self._match_directory_pattern(path, pattern)
+            is_directory = self._is_directory_path(path, path)
+            return self._match_directory_pattern(path, pattern, is_directory)
         else:
             return self._match_file_pattern(path, pattern)
 
-    def _match_directory_pattern(self, path: str, pattern: str) -> bool:
+    def _match_directory_pattern(
+        self, path: str, pattern: str, is_directory: bool
+    ) -> bool:
         """匹配目录模式"""
         pattern_without_slash = pattern.rstrip("/")
 
@@ -330,9 +762,13 @@ class IgnoreManager:
             return self._match_nested_directory(path, clean_pattern)
         else:
             # 精确模式：只匹配根目录或指定位置
-            return self._match_exact_directory(path, pattern_without_slash)
+            return self._match_exact_directory(
+                path, pattern_without_slash, is_directory
+            )
 
-    def _match_exact_directory(self, path: str, pattern: str) -> bool:
+    def _match_exact_directory(
+        self, path: str, pattern: str, is_directory: bool
+    ) -> bool:
         """精确目录匹配 - 只匹配根目录或精确路径位置"""
         # 情况1: 文件在目录下 (settings/ 匹配 settings/config.json)
         if path.startswith(pattern + "/"):
@@ -347,14 +783,7 @@ class IgnoreManager:
         # 情况2.5: 路径本身就是目录名（用于匹配目录本身）
         # 只有在路径明确是目录时才匹配，避免误匹配同名文件
         if path == pattern:
-            full_path = self.repo_path / path
-            try:
-                if full_path.exists():
-                    return full_path.is_dir()
-            except:
-                pass
-            # 对于不存在的路径，不进行匹配（保守策略）
-            return False
+            return is_directory
 
         # 情况3: 支持部分路径匹配 (如 app/settings/ 模式)
         if "/" in pattern:
@@ -387,7 +816,7 @@ class IgnoreManager:
                     return True
 
             # 支持通配符匹配目录名
-            if fnmatch.fnmatch(part, directory_name):
+            if _glob_regex(directory_name).match(part):
                 if i < len(path_parts) - 1 or path.endswith("/"):
                     return True
 
@@ -399,31 +828,26 @@ class IgnoreManager:
         if "/" not in pattern:
             filename = os.path.basename(path)
             # 精确匹配文件名
-            return filename == pattern or fnmatch.fnmatch(filename, pattern)
+            return (
+                filename == pattern or _glob_regex(pattern).match(filename) is not None
+            )
         else:
             # 包含路径的精确匹配
-            return fnmatch.fnmatch(path, pattern)
+            return _glob_regex(pattern).match(path) is not None
 
     def _match_regex(self, path: str) -> bool:
         """正则表达式匹配"""
-        for compiled_regex in self.compiled_patterns["regex"]:
-            if compiled_regex.search(path):
-                return True
-        return False
+        if self._fused_user_regex is not None and self._fused_user_regex.search(path):
+            return True
+        return any(r.search(path) for r in self._unfused_regex)
 
     def _match_prefix(self, path: str) -> bool:
         """前缀匹配"""
-        for prefix in self.compiled_patterns["prefix"]:
-            if path.startswith(prefix):
-                return True
-        return False
+        return path.startswith(self._prefix_tuple)
 
     def _match_suffix(self, path: str) -> bool:
         """后缀匹配"""
-        for suffix in self.compiled_patterns["suffix"]:
-            if path.endswith(suffix):
-                return True
-        return False
+        return path.endswith(self._suffix_tuple)
 
     def filter_files(self, file_list: List[str]) -> List[str]:
         """
@@ -435,17 +859,57 @@ class IgnoreManager:
         Returns:
             List[str]: 过滤后的文件列表
         """
-        filtered_files = []
-        ignored_count = 0
+        self._ensure_compiled()
+
+        # 批量处理：路径只规范化一次，之后按匹配类型对剩余路径逐轮筛选，
+        # 每轮只调用一个匹配器，结果与逐个调用 should_ignore 一致
+        normalize = self._normalize_path
+        remaining = [
+            (file_path, normalize(os.fspath(file_path))) for file_path in file_list
+        ]
+        exact = self.compiled_patterns["exact"]
+        if exact:
+            remaining = [item for item in remaining if item[1] not in exact]
+
+        if self._prefix_tuple:
+            prefixes = self._prefix_tuple
+            remaining = [item for item in remaining if not item[1].startswith(prefixes)]
+
+        if self._suffix_tuple:
+            suffixes = self._suffix_tuple
+            remaining = [item for item in remaining if not item[1].endswith(suffixes)]
+
+        if self._mega_re is not None:
+            mega_match = self._mega_re.match
+            remaining = [item for item in remaining if not mega_match(item[1])]
+
+        if self._glob_name_re is not None:
+            name_match = self._glob_name_re.match
+            basename = posixpath.basename
+            remaining = [
+                item for item in remaining if not name_match(basename(item[1]))
+            ]
 
-        for file_path in file_list:
-            if self.should_ignore(file_path):
-                ignored_count += 1
-            else:
-                filtered_files.append(file_path)
+        if self._dir_trie or self._glob_dir_re is not None:
+            # 目录判断与 should_ignore 相同，基于原始路径（规范化会去掉结尾的/）
+            match_segments = self._match_segments
+            is_directory_path = self._is_directory_path
+            remaining = [
+                item
+                for item in remaining
+                if not match_segments(
+                    item[1], is_directory_path(os.fspath(item[0]), item[1])
+                )
+            ]
+
+        for compiled_regex in self._unfused_regex:
+            search = compiled_regex.search
+            remaining = [item for item in remaining if not search(item[1])]
+
+        filtered_files = [item[0] for item in remaining]
 
         # 更新统计信息
-        self.stats["ignored_files"] = ignored_count
+        self.stats["ignored_files"] = len(file_list) - len(filtered_files)
 
         return filtered_files
 
@@ -482,7 +946,9 @@ class IgnoreManager:
         }
 
         self.rules.append(rule)
-        self._compile_rules()
+        if not self._rules_dirty:
+            self._compile_single_rule(rule)
+            self._matchers_dirty = True
         self._update_stats()
 
         # 保存到配置文件
@@ -515,7 +981,7 @@ class IgnoreManager:
         removed_count = original_count - len(self.rules)
 
         if removed_count > 0:
-            self._compile_rules()
+            self._rules_dirty = True
             self._update_stats()
             self._save_config()
             return True
@@ -539,7 +1005,7 @@ class IgnoreManager:
                     rule["enabled"] = not rule.get("enabled", True)
                     rule["updated_at"] = datetime.now().isoformat()
 
-                    self._compile_rules()
+                    self._rules_dirty = True
                     self._update_stats()
                     self._save_config()
                     return True
@@ -575,27 +1041,47 @@ class IgnoreManager:
         )
 
     def _save_config(self):
-        """保存配置到文件"""
-        try:
-            self.work_dir.mkdir(exist_ok=True)
+        """标记配置需要保存，_SAVE_DELAY 秒后统一写入，批量修改只写一次文件"""
+        with self._save_lock:
+            self._config_dirty = True
+            _PENDING_SAVES.add(self)
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(_SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self):
+        """立即写入尚未保存的配置（进程退出时会自动调用）"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._config_dirty:
+                return
+            self._config_dirty = False
+            _PENDING_SAVES.discard(self)
 
-            # 只保存用户添加的规则
-            user_rules = [
-                r for r in self.rules if r.get("source") in ["user_added", "config"]
-            ]
-
-            config = {
-                "custom_rules": user_rules,
-                "stats": self.stats,
-                "version": "1.0",
-                "updated_at": datetime.now().isoformat(),
-            }
+            try:
+                # 只保存用户添加的规则；复制一份快照，定时器线程写入时
+                # 主线程仍可能在修改规则
+                user_rules = [
+                    dict(r)
+                    for r in list(self.rules)
+                    if r.get("source") in _PERSISTED_SOURCES
+                ]
+
+                config = {
+                    "custom_rules": user_rules,
+                    "stats": dict(self.stats),
+                    "version": "1.0",
+                    "updated_at": datetime.now().isoformat(),
+                }
 
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+                ensure_dir(self.work_dir)
+                dump_json_file(config, self.config_file, compact=True)
 
-        except Exception as e:
-            print(f"⚠️ 保存配置失败: {e}")
+            except Exception as e:
+                print(f"⚠️ 保存配置失败: {e}")
 
     def export_ignore_file(self, file_path: Optional[str] = None) -> bool:
         """
@@ -666,34 +1152,38 @@ class IgnoreManager:
             "source": "test",
         }
 
-        # 保存当前规则
-        original_rules = self.rules.copy()
+        # 先写入尚未保存的配置，并在临时替换规则期间持有保存锁，
+        # 防止防抖定时器把只含测试规则的规则集写入配置文件
+        self.flush()
+        with self._save_lock:
+            # 保存当前规则
+            original_rules = self.rules.copy()
 
-        try:
-            # 临时添加测试规则
-            self.rules = [temp_rule]
-            self._compile_rules()
+            try:
+                # 临时添加测试规则
+                self.rules = [temp_rule]
+                self._compile_rules()
 
-            # 测试文件
-            matched_files = []
-            unmatched_files = []
-
-            for file_path in test_files:
-                if self.should_ignore(file_path):
-                    matched_files.append(file_path)
-                else:
-                    unmatched_files.append(file_path)
-
-            return {
-                "pattern": pattern,
-                "type": rule_type,
-                "matched_files": matched_files,
-                "unmatched_files": unmatched_files,
-                "match_count": len(matched_files),
-                "total_count": len(test_files),
-            }
+                # 测试文件
+                matched_files = []
+                unmatched_files = []
 
-        finally:
-            # 恢复原始规则
-            self.rules = original_rules
-            self._compile_rules()
+                for file_path in test_files:
+                    if self.should_ignore(file_path):
+                        matched_files.append(file_path)
+                    else:
+                        unmatched_files.append(file_path)
+
+                return {
+                    "pattern": pattern,
+                    "type": rule_type,
+                    "matched_files": matched_files,
+                    "unmatched_files": unmatched_files,
+                    "match_count": len(matched_files),
+                    "total_count": len(test_files),
+                }
+
+            finally:
+                # 恢复原始规则，下一次匹配时再重新编译
+                self.rules = original_rules
+                self._rules_dirty = True
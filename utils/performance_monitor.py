@@ -3,12 +3,21 @@ Git Merge Orchestrator - 性能监控模块
 提供性能监控装饰器和统计功能
 """
 
+import os
 import time
 import functools
 import logging
+import logging.handlers
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
+# 设置 GMO_VERBOSE 环境变量时才输出"开始执行"等过程信息
+_VERBOSE = bool(os.environ.get("GMO_VERBOSE"))
+
+# PerformanceStats 中每个操作保留的最近记录条数
+_RECENT_RECORDS = 1024
+
 # 设置性能日志
 performance_logger = logging.getLogger("performance")
 performance_logger.setLevel(logging.INFO)
@@ -19,7 +28,17 @@ log_file.parent.mkdir(exist_ok=True)
 
 file_handler = logging.FileHandler(log_file)
 file_handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
-performance_logger.addHandler(file_handler)
+
+# 日志先缓存在内存中批量写入文件；遇到 ERROR 或进程退出时立即刷新
+buffered_handler = logging.handlers.MemoryHandler(
+    capacity=1024, flushLevel=logging.ERROR, target=file_handler
+)
+performance_logger.addHandler(buffered_handler)
+
+
+def _elapsed_seconds(start_ns):
+    """根据 perf_counter_ns 起点计算耗时（秒）"""
+    return (time.perf_counter_ns() - start_ns) / 1e9
 
 
 def performance_monitor(operation_name=None):
@@ -36,27 +55,28 @@ def performance_monitor(operation_name=None):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             func_name = operation_name or f"{func.__name__}"
-            start_time = time.time()
-
-            print(f"⏱️ 开始执行: {func_name}")
+            if _VERBOSE:
+                print(f"⏱️ 开始执行: {func_name}")
 
+            start_ns = time.perf_counter_ns()
             try:
                 result = func(*args, **kwargs)
-                elapsed = time.time() - start_time
+            except Exception as e:
+                elapsed = _elapsed_seconds(start_ns)
+                print(f"❌ {func_name} 执行失败，耗时: {elapsed:.2f}秒，错误: {e}")
+                performance_logger.error("%s - 失败: %.2f秒 - %s", func_name, elapsed, e)
+                raise
 
-                # 控制台输出
-                print(f"⚡ {func_name} 完成，耗时: {elapsed:.2f}秒")
+            elapsed = _elapsed_seconds(start_ns)
 
-                # 日志记录
-                performance_logger.info(f"{func_name} - 耗时: {elapsed:.2f}秒")
+            # 控制台输出
+            print(f"⚡ {func_name} 完成，耗时: {elapsed:.2f}秒")
 
-                return result
+            # 日志记录
+            if performance_logger.isEnabledFor(logging.INFO):
+                performance_logger.info("%s - 耗时: %.2f秒", func_name, elapsed)
 
-            except Exception as e:
-                elapsed = time.time() - start_time
-                print(f"❌ {func_name} 执行失败，耗时: {elapsed:.2f}秒，错误: {e}")
-                performance_logger.error(f"{func_name} - 失败: {elapsed:.2f}秒 - {str(e)}")
-                raise
+            return result
 
         return wrapper
 
@@ -75,27 +95,33 @@ def timing_context(operation_name):
     class TimingContext:
         def __init__(self, name):
             self.name = name
-            self.start_time = None
+            self.start_ns = None
 
         def __enter__(self):
-            self.start_time = time.time()
-            print(f"⏱️ 开始: {self.name}")
+            if _VERBOSE:
+                print(f"⏱️ 开始: {self.name}")
+            self.start_ns = time.perf_counter_ns()
             return self
 
         def __exit__(self, exc_type, exc_val, exc_tb):
-            elapsed = time.time() - self.start_time
+            elapsed = _elapsed_seconds(self.start_ns)
             if exc_type is None:
                 print(f"⚡ {self.name} 完成，耗时: {elapsed:.2f}秒")
-                performance_logger.info(f"{self.name} - 耗时: {elapsed:.2f}秒")
+                if performance_logger.isEnabledFor(logging.INFO):
+                    performance_logger.info("%s - 耗时: %.2f秒", self.name, elapsed)
             else:
                 print(f"❌ {self.name} 失败，耗时: {elapsed:.2f}秒")
-                performance_logger.error(f"{self.name} - 失败: {elapsed:.2f}秒")
+                performance_logger.error("%s - 失败: %.2f秒", self.name, elapsed)
 
     return TimingContext(operation_name)
 
 
 class PerformanceStats:
-    """性能统计收集器"""
+    """性能统计收集器
+
+    每个操作维护 count/total/min/max 累计值，get_summary 无需遍历历史记录；
+    明细只保留最近 _RECENT_RECORDS 条，长时间运行时内存不会无限增长。
+    """
 
     def __init__(self):
         self.stats = {}
@@ -103,40 +129,54 @@ class PerformanceStats:
 
     def start_operation(self, operation_name):
         """开始记录操作"""
-        self.start_times[operation_name] = time.time()
+        self.start_times[operation_name] = time.perf_counter_ns()
 
     def end_operation(self, operation_name, additional_info=None):
         """结束记录操作"""
-        if operation_name in self.start_times:
-            elapsed = time.time() - self.start_times[operation_name]
+        start_ns = self.start_times.pop(operation_name, None)
+        if start_ns is None:
+            return None
+
+        elapsed = _elapsed_seconds(start_ns)
+
+        op_stats = self.stats.get(operation_name)
+        if op_stats is None:
+            op_stats = self.stats[operation_name] = {
+                "count": 0,
+                "total": 0.0,
+                "min": elapsed,
+                "max": elapsed,
+                "recent": deque(maxlen=_RECENT_RECORDS),
+            }
 
-            if operation_name not in self.stats:
-                self.stats[operation_name] = []
+        op_stats["count"] += 1
+        op_stats["total"] += elapsed
+        if elapsed < op_stats["min"]:
+            op_stats["min"] = elapsed
+        if elapsed > op_stats["max"]:
+            op_stats["max"] = elapsed
 
-            stats_entry = {"duration": elapsed, "timestamp": datetime.now().isoformat()}
+        stats_entry = {"duration": elapsed, "timestamp": datetime.now().isoformat()}
 
-            if additional_info:
-                stats_entry.update(additional_info)
+        if additional_info:
+            stats_entry.update(additional_info)
 
-            self.stats[operation_name].append(stats_entry)
-            del self.start_times[operation_name]
+        op_stats["recent"].append(stats_entry)
 
-            return elapsed
-        return None
+        return elapsed
 
     def get_summary(self):
         """获取性能摘要"""
-        summary = {}
-        for operation, records in self.stats.items():
-            durations = [r["duration"] for r in records]
-            summary[operation] = {
-                "count": len(durations),
-                "total_time": sum(durations),
-                "avg_time": sum(durations) / len(durations),
-                "min_time": min(durations),
-                "max_time": max(durations),
+        return {
+            operation: {
+                "count": op_stats["count"],
+                "total_time": op_stats["total"],
+                "avg_time": op_stats["total"] / op_stats["count"],
+                "min_time": op_stats["min"],
+                "max_time": op_stats["max"],
             }
-        return summary
+            for operation, op_stats in self.stats.items()
+        }
 
     def print_summary(self):
         """打印性能摘要"""
@@ -3,26 +3,143 @@ Git Merge Orchestrator - 进度指示器工具
 为长时间运行的操作提供用户友好的进度反馈
 """
 
+import itertools
+import os
+import re
 import time
 import sys
 import threading
+import weakref
+from collections import deque
 from typing import Optional, Callable, Any
-from datetime import datetime
+
+# ANSI转义序列
+_ANSI_RE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
+# 旋转帧的最小宽度，保证各帧长度一致，避免显示残留
+_MIN_FRAME_WIDTH = 50
+# 补齐用的空格，按需切片，避免每帧重新分配
+_FRAME_PADDING = b" " * _MIN_FRAME_WIDTH
+
+# ETA估算：每步耗时指数移动平均的平滑系数，以及开始显示ETA所需的最少步数
+_ETA_ALPHA = 0.2
+_ETA_MIN_STEPS = 3
+
+# 步骤总结中保留的最近步骤数，长时间运行时内存保持恒定
+_STEP_HISTORY = 1000
+
+# 旋转字符（预先编码为UTF-8，帧直接以字节拼接）
+_SPINNER_BYTES = tuple(
+    c.encode("utf-8") for c in ("⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏")
+)
+
+# 终端上的旋转动画刷新间隔（秒）
+_SPIN_INTERVAL = 0.1
+
+
+def _stdout_is_tty() -> bool:
+    """标准输出是否为交互式终端（重定向到文件/管道时为False）"""
+    isatty = getattr(sys.stdout, "isatty", None)
+    try:
+        return bool(isatty and isatty())
+    except ValueError:
+        # 标准输出已关闭
+        return False
+
+
+def _stdout_fd() -> Optional[int]:
+    """标准输出未被替换时返回其文件描述符，否则返回None"""
+    if sys.stdout is None or sys.stdout is not sys.__stdout__:
+        return None
+    try:
+        return sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _write_fd(fd: int, data: bytes):
+    """写入全部数据（处理终端的部分写入）"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+class _SpinnerScheduler:
+    """进程内共享的旋转动画调度线程
+
+    所有活动的 ProgressIndicator 共用一个后台线程，每个周期只读取一次
+    单调时钟，并把各指示器的帧拼接后一次写出；没有活动指示器时线程退出。
+    """
+
+    def __init__(self):
+        self._indicators = weakref.WeakSet()
+        # 同时保护注册表与帧输出：注销返回后不会再写出该指示器的帧
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # 标准输出的文件描述符，帧直接 os.write，绕过 TextIOWrapper
+        self._fd: Optional[int] = None
+
+    def register(self, indicator: "ProgressIndicator"):
+        """注册指示器，必要时启动调度线程"""
+        with self._lock:
+            self._indicators.add(indicator)
+            if self._thread is None:
+                # 先写出文本层中尚未输出的内容，保证帧不会越过之前的输出
+                sys.stdout.flush()
+                self._fd = _stdout_fd()
+                self._thread = threading.Thread(
+                    target=self._run, name="progress-spinner", daemon=True
+                )
+                self._thread.start()
+
+    def unregister(self, indicator: "ProgressIndicator"):
+        """注销指示器，最后一个注销时唤醒线程使其立即退出"""
+        with self._lock:
+            self._indicators.discard(indicator)
+            if not self._indicators:
+                self._wakeup.set()
+
+    def _run(self):
+        """调度循环"""
+        while True:
+            with self._lock:
+                if not self._indicators:
+                    self._thread = None
+                    return
+
+                self._wakeup.clear()
+                now = time.monotonic()
+                frames = b"".join(
+                    indicator._render_frame(now) for indicator in self._indicators
+                )
+                try:
+                    if self._fd is not None and sys.stdout is sys.__stdout__:
+                        _write_fd(self._fd, frames)
+                    else:
+                        # 标准输出已被替换为非文件对象，走文本层写入
+                        sys.stdout.write(frames.decode("utf-8"))
+                        sys.stdout.flush()
+                except OSError:
+                    # 终端已关闭（如管道断开），丢弃本帧
+                    pass
+
+            self._wakeup.wait(_SPIN_INTERVAL)
+
+
+_SPINNER_SCHEDULER = _SpinnerScheduler()
 
 
 class ProgressIndicator:
     """进度指示器类 - 支持多种进度显示模式"""
 
     def __init__(self, message: str = "处理中", show_spinner: bool = True):
-        self.message = message
-        self.show_spinner = show_spinner
+        self._set_message(message)
+        # 输出被重定向时旋转动画只会写入大量无用的帧，退化为首尾各打印一次
+        self.show_spinner = show_spinner and _stdout_is_tty()
         self.is_running = False
-        self.spinner_thread: Optional[threading.Thread] = None
         self.start_time: Optional[float] = None
-
-        # 旋转字符
-        self.spinner_chars = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-        self.spinner_index = 0
+        self._spinner_cycle = itertools.cycle(_SPINNER_BYTES)
 
     def start(self):
         """开始显示进度指示器"""
@@ -30,12 +147,10 @@ class ProgressIndicator:
             return
 
         self.is_running = True
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
 
         if self.show_spinner:
-            self.spinner_thread = threading.Thread(target=self._spin)
-            self.spinner_thread.daemon = True
-            self.spinner_thread.start()
+            _SPINNER_SCHEDULER.register(self)
         else:
             print(f"🚀 {self.message}...")
 
@@ -48,60 +163,63 @@ class ProgressIndicator:
 
         self.is_running = False
 
-        if self.spinner_thread and self.spinner_thread.is_alive():
-            self.spinner_thread.join(timeout=0.1)
-
-        # 清除旋转字符
         if self.show_spinner:
-            sys.stdout.write("\r" + " " * (len(self.message) + 10) + "\r")
-            sys.stdout.flush()
+            _SPINNER_SCHEDULER.unregister(self)
 
         # 显示结果消息，清理ANSI转义序列
-        elapsed_time = time.time() - self.start_time if self.start_time else 0
+        elapsed_time = time.monotonic() - self.start_time if self.start_time else 0
 
         if error_message:
             clean_error = self._clean_ansi_text(error_message)
-            print(f"❌ {clean_error} (耗时: {elapsed_time:.1f}秒)")
+            result = f"❌ {clean_error} (耗时: {elapsed_time:.1f}秒)\n"
         elif success_message:
             clean_success = self._clean_ansi_text(success_message)
-            print(f"✅ {clean_success} (耗时: {elapsed_time:.1f}秒)")
+            result = f"✅ {clean_success} (耗时: {elapsed_time:.1f}秒)\n"
         else:
-            clean_message = self._clean_ansi_text(self.message)
-            print(f"✅ {clean_message}完成 (耗时: {elapsed_time:.1f}秒)")
-
-    def _spin(self):
-        """旋转动画循环"""
-        while self.is_running:
-            char = self.spinner_chars[self.spinner_index]
-            elapsed = time.time() - self.start_time if self.start_time else 0
-
-            # 显示旋转字符和经过时间，清理ANSI转义序列
-            display_text = (
-                f"\r{char} {self._clean_ansi_text(self.message)}... ({elapsed:.1f}s)"
-            )
+            result = f"✅ {self._clean_message}完成 (耗时: {elapsed_time:.1f}秒)\n"
 
-            # 确保输出行长度一致，避免显示残留
-            min_width = 50
-            if len(display_text) < min_width:
-                display_text += " " * (min_width - len(display_text))
-
-            sys.stdout.write(display_text)
-            sys.stdout.flush()
+        # 清除旋转字符与结果消息合并为一次写入
+        if self.show_spinner:
+            result = "\r" + " " * (len(self.message) + 10) + "\r" + result
+        sys.stdout.write(result)
+        sys.stdout.flush()
 
-            self.spinner_index = (self.spinner_index + 1) % len(self.spinner_chars)
-            time.sleep(0.1)
+    def _set_message(self, message: str):
+        """设置消息，并预先计算每帧都要用到的清理后文本与编码后字节"""
+        self.message = message
+        self._clean_message = self._clean_ansi_text(message)
+        self._frame_message = f" {self._clean_message}... (".encode("utf-8")
+        # 帧中除耗时数字外的字符数：回车、旋转字符、消息部分与结尾的 "s)"
+        self._frame_fixed_width = len(self._clean_message) + 10
+
+    def _render_frame(self, now: float) -> bytes:
+        """生成当前动画帧并前进一格，由 _SpinnerScheduler 在每个周期调用"""
+        elapsed = b"%.1f" % (now - self.start_time if self.start_time else 0)
+
+        # 整帧（回车、旋转字符、消息、耗时、补齐空格）拼成一个字节串，
+        # 每帧只写一次，避免多次小写入与 flush 交错造成闪烁
+        padding = max(0, _MIN_FRAME_WIDTH - self._frame_fixed_width - len(elapsed))
+        return b"".join(
+            (
+                b"\r",
+                next(self._spinner_cycle),
+                self._frame_message,
+                elapsed,
+                b"s)",
+                _FRAME_PADDING[:padding],
+            )
+        )
 
     def _clean_ansi_text(self, text: str) -> str:
         """清理文本中的ANSI转义序列，避免显示冲突"""
-        import re
-
-        # 移除ANSI转义序列
-        ansi_escape = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-        return ansi_escape.sub("", text)
+        # 绝大多数消息不含转义字符，直接返回
+        if "\x1B" not in text:
+            return text
+        return _ANSI_RE.sub("", text)
 
     def update_message(self, new_message: str):
         """更新进度消息"""
-        self.message = new_message
+        self._set_message(new_message)
 
 
 class ProgressTracker:
@@ -111,22 +229,43 @@ class ProgressTracker:
         self.total_steps = total_steps
         self.current_step = 0
         self.description = description
-        self.start_time = time.time()
-        self.step_messages = []
+        self.start_time = time.monotonic()
+        # 只保留最近的步骤记录；批量模式下不逐步记录，仅累计耗时统计
+        self.step_messages = deque(maxlen=_STEP_HISTORY)
+        self._step_time_count = 0
+        self._step_time_sum = 0.0
+        self._step_time_sumsq = 0.0
+        self._step_time_min = float("inf")
+        self._step_time_max = 0.0
 
         # 大量任务优化
         self.batch_mode = total_steps > 1000
-        self.last_update_time = time.time()
-        self.update_interval = 1.0 if self.batch_mode else 0.1  # 批量模式减少更新频率
+        self.last_update_time = time.monotonic()
+        # 批量模式或输出非终端（CI日志、管道）时限制更新频率
+        self.throttled = self.batch_mode or not _stdout_is_tty()
+        self.update_interval = 1.0 if self.throttled else 0.1
+
+        # 每步耗时的指数移动平均，用于ETA估算
+        self._ema_step_time = 0.0
+        self._last_step_time = self.start_time
 
     def step(self, message: str = ""):
         """执行下一步"""
         self.current_step += 1
-        current_time = time.time()
+        current_time = time.monotonic()
+
+        # 每步都更新耗时均值（开销很小）：前几步用算术平均作为初值，
+        # 之后改用指数移动平均，早期个别慢步骤的影响会逐渐衰减
+        step_time = current_time - self._last_step_time
+        self._last_step_time = current_time
+        if self.current_step <= _ETA_MIN_STEPS:
+            self._ema_step_time = (current_time - self.start_time) / self.current_step
+        else:
+            self._ema_step_time += _ETA_ALPHA * (step_time - self._ema_step_time)
 
         # 大量任务时，限制更新频率以提高性能
         should_display = (
-            not self.batch_mode
+            not self.throttled
             or (current_time - self.last_update_time) >= self.update_interval
             or self.current_step == self.total_steps
             or self.current_step % max(1, self.total_steps // 100)  # 总是显示最后一步
@@ -137,12 +276,10 @@ class ProgressTracker:
             # 计算进度百分比
             progress = (self.current_step / self.total_steps) * 100
 
-            # 计算预计剩余时间
-            elapsed = current_time - self.start_time
-            if self.current_step > 0:
-                avg_time_per_step = elapsed / self.current_step
-                remaining_steps = self.total_steps - self.current_step
-                eta = avg_time_per_step * remaining_steps
+            # 计算预计剩余时间（步数太少时估算不可靠，不显示）
+            remaining_steps = self.total_steps - self.current_step
+            if self.current_step >= _ETA_MIN_STEPS and remaining_steps > 0:
+                eta = self._ema_step_time * remaining_steps
             else:
                 eta = 0
 
@@ -150,35 +287,47 @@ class ProgressTracker:
             progress_bar = self._create_progress_bar(progress)
             step_msg = f" - {message}" if message else ""
 
+            # 进度行与ETA行拼成一个字符串，单次 print 输出
             if self.batch_mode:
                 # 批量模式：更简洁的显示
-                print(
+                output = (
                     f"📊 {self.description}: {self.current_step}/{self.total_steps} "
                     f"{progress_bar} {progress:.1f}%"
                 )
                 if eta > 0 and self.current_step < self.total_steps:
                     eta_msg = self._format_time(eta)
-                    print(f"   ⏱️ ETA: {eta_msg}")
+                    output += f"\n   ⏱️ ETA: {eta_msg}"
             else:
                 # 普通模式：详细显示
-                print(
+                output = (
                     f"📍 步骤 {self.current_step}/{self.total_steps}: {self.description} "
                     f"{progress_bar} {progress:.0f}%{step_msg}"
                 )
                 if eta > 0 and self.current_step < self.total_steps:
-                    print(f"   ⏱️ 预计剩余时间: {eta:.1f}秒")
+                    output += f"\n   ⏱️ 预计剩余时间: {eta:.1f}秒"
+            # 直接写入整段文本（含换行），print 会把正文与换行拆成两次写入
+            sys.stdout.write(output + "\n")
 
             self.last_update_time = current_time
 
-        # 记录步骤信息（始终记录，用于统计）
-        self.step_messages.append(
-            {
-                "step": self.current_step,
-                "message": message,
-                "timestamp": datetime.now(),
-                "elapsed": current_time - self.start_time,
-            }
-        )
+        # 记录步骤信息（用于统计）
+        self._step_time_count += 1
+        self._step_time_sum += step_time
+        self._step_time_sumsq += step_time * step_time
+        if step_time < self._step_time_min:
+            self._step_time_min = step_time
+        if step_time > self._step_time_max:
+            self._step_time_max = step_time
+
+        if not self.batch_mode:
+            self.step_messages.append(
+                {
+                    "step": self.current_step,
+                    "message": message,
+                    "duration": step_time,
+                    "elapsed": current_time - self.start_time,
+                }
+            )
 
     def _format_time(self, seconds: float) -> str:
         """格式化时间显示"""
@@ -201,20 +350,42 @@ class ProgressTracker:
 
     def finish(self, success_message: str = ""):
         """完成进度跟踪"""
-        total_time = time.time() - self.start_time
+        total_time = time.monotonic() - self.start_time
         final_message = success_message or f"{self.description}完成"
-        print(f"✅ {final_message} (总耗时: {total_time:.1f}秒)")
-
-        # 显示步骤总结
-        if len(self.step_messages) > 1:
-            print(f"📊 步骤耗时总结:")
-            prev_elapsed = 0
-            for step_info in self.step_messages:
-                step_time = step_info["elapsed"] - prev_elapsed
-                print(
-                    f"   步骤{step_info['step']}: {step_time:.1f}s - {step_info['message']}"
-                )
-                prev_elapsed = step_info["elapsed"]
+        lines = [f"✅ {final_message} (总耗时: {total_time:.1f}秒)"]
+
+        # 显示步骤总结：批量模式下逐步输出会有成千上万行，改为汇总统计
+        if self._step_time_count > 1:
+            if self.batch_mode:
+                lines.append(f"📊 {self._step_time_stats_text()}")
+            else:
+                lines.append("📊 步骤耗时总结:")
+                if self._step_time_count > len(self.step_messages):
+                    # 早期步骤已被丢弃，先给出全部步骤的统计
+                    lines.append(f"   {self._step_time_stats_text()}")
+                    lines.append(f"   最近 {len(self.step_messages)} 步:")
+                for step_info in self.step_messages:
+                    lines.append(
+                        f"   步骤{step_info['step']}: {step_info['duration']:.1f}s"
+                        f" - {step_info['message']}"
+                    )
+
+        # 汇总全部行后一次写出
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.flush()
+
+    def _step_time_stats_text(self) -> str:
+        """由累计值生成步骤耗时统计（平均、标准差、最短、最长）"""
+        count = self._step_time_count
+        mean = self._step_time_sum / count
+        variance = max(0.0, self._step_time_sumsq / count - mean * mean)
+        return (
+            f"步骤耗时统计 ({count} 步): 平均 {mean * 1000:.1f}ms, "
+            f"标准差 {variance ** 0.5 * 1000:.1f}ms, "
+            f"最短 {self._step_time_min * 1000:.1f}ms, "
+            f"最长 {self._step_time_max * 1000:.1f}ms"
+        )
 
 
 def with_progress(message: str = "处理中", show_spinner: bool = True):
@@ -3,14 +3,87 @@ Git Merge Orchestrator - 智能缓存管理器
 实现LRU缓存和多层缓存策略以优化大型项目性能
 """
 
+import atexit
 import json
 import hashlib
+import os
+import queue
+import sqlite3
 import threading
+import time
+import weakref
 from collections import OrderedDict
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 文件缓存条目上限，超出后只保留最新的 _FILE_CACHE_KEEP 条
+_FILE_CACHE_LIMIT = 5000
+_FILE_CACHE_KEEP = 4000
+
+# 写入线程收到第一条待写条目后的合并等待时间（秒）
+_WRITE_COALESCE_DELAY = 0.05
+
+# 缓存预热的线程数（I/O密集任务可以使用更多线程）与进度输出间隔（文件数）
+_WARM_UP_WORKERS = min(16, (os.cpu_count() or 1) * 4)
+_WARM_UP_REPORT_INTERVAL = 500
+
+# 仍有待写入文件缓存条目的管理器，进程退出前统一写完
+_PENDING_WRITES = weakref.WeakSet()
+
+
+def _flush_pending_writes():
+    """等待所有管理器的文件缓存写入完成"""
+    for manager in list(_PENDING_WRITES):
+        manager.flush()
+
+
+atexit.register(_flush_pending_writes)
+
+
+@lru_cache(maxsize=4096)
+def _hashed_cache_key(namespace: str, content: str) -> str:
+    """由命名空间和标识内容派生缓存键，热点循环中重复的键直接命中缓存"""
+    # 仅用于派生键，无需密码学强度；BLAKE2b 比 MD5 更快
+    digest = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def _serialize_identifier(identifier: Dict) -> str:
+    """按键排序序列化字典标识，安装了 orjson 时使用其序列化器"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(identifier, option=orjson.OPT_SORT_KEYS).decode()
+        except TypeError:
+            # orjson 不支持的类型或非字符串键回退到标准库
+            pass
+    return json.dumps(identifier, sort_keys=True)
+
+
+def _encode_payload(data: Any) -> str:
+    """将缓存数据序列化为紧凑JSON，安装了 orjson 时使用其序列化器"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # orjson 不支持的类型（如超出64位的整数）回退到标准库
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _decode_payload(payload: str) -> Any:
+    """解析缓存数据"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
 
 class LRUCache:
     """LRU (Least Recently Used) 缓存实现"""
@@ -22,12 +95,19 @@ class LRUCache:
 
     def get(self, key: str) -> Optional[Any]:
         """获取缓存值"""
+        # OrderedDict 的单次查找在GIL下是原子的，未命中时无需加锁
+        value = self.cache.get(key)
+        if value is None:
+            return None
+
         with self.lock:
-            if key in self.cache:
+            try:
                 # 移动到最后（最近使用）
                 self.cache.move_to_end(key)
-                return self.cache[key]
-            return None
+            except KeyError:
+                # 查找后已被其他线程淘汰，仍返回已取得的值
+                pass
+        return value
 
     def put(self, key: str, value: Any) -> None:
         """设置缓存值"""
@@ -53,17 +133,16 @@ class LRUCache:
 
     def size(self) -> int:
         """获取缓存大小"""
-        with self.lock:
-            return len(self.cache)
+        return len(self.cache)
 
     def get_stats(self) -> Dict[str, Any]:
-        """获取缓存统计信息"""
-        with self.lock:
-            return {
-                "size": len(self.cache),
-                "capacity": self.capacity,
-                "usage_rate": len(self.cache) / self.capacity * 100,
-            }
+        """获取缓存统计信息（只读快照，无需加锁）"""
+        size = len(self.cache)
+        return {
+            "size": size,
+            "capacity": self.capacity,
+            "usage_rate": size / self.capacity * 100,
+        }
 
 
 class SmartCacheManager:
@@ -76,28 +155,69 @@ class SmartCacheManager:
 
         # 多层缓存
         self.memory_cache = LRUCache(1000)  # 内存缓存
-        self.file_cache_path = self.cache_dir / "persistent_cache.json"
-
-        # 缓存统计
+        self.file_cache_path = self.cache_dir / "persistent_cache.db"
+        self._db_lock = threading.Lock()
+        self._db = self._open_file_cache()
+        # 文件缓存条目数的上界估计（覆盖写入也会计数），超限时再精确统计
+        self._file_cache_rows = self._count_file_cache_rows()
+
+        # 文件缓存写入队列，由单个后台线程批量消费
+        self._write_queue = queue.Queue()
+        if self._db is not None:
+            threading.Thread(
+                target=self._writer_loop, name="smart-cache-writer", daemon=True
+            ).start()
+
+        # 缓存统计：仅用于展示，计数不加锁（多线程并发时允许偶尔漏计）。
+        # 命中总数由 get_stats 从两层命中数求和，每次命中只需一次计数
         self.stats = {
-            "hits": 0,
             "misses": 0,
             "puts": 0,
             "memory_hits": 0,
             "file_hits": 0,
         }
 
-        self.lock = threading.Lock()
+    def _open_file_cache(self) -> Optional[sqlite3.Connection]:
+        """打开SQLite文件缓存，失败时返回None（仅使用内存缓存）"""
+        try:
+            db = sqlite3.connect(
+                str(self.file_cache_path), check_same_thread=False, isolation_level=None
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cache"
+                " (key TEXT PRIMARY KEY, data TEXT NOT NULL, timestamp REAL NOT NULL)"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS cache_timestamp ON cache (timestamp)"
+            )
+            return db
+        except sqlite3.Error as e:
+            print(f"⚠️ 文件缓存打开失败: {e}")
+            return None
+
+    def _count_file_cache_rows(self) -> int:
+        """统计文件缓存条目数"""
+        if self._db is None:
+            return 0
+        try:
+            with self._db_lock:
+                return self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        except sqlite3.Error:
+            return 0
 
     def _generate_cache_key(self, namespace: str, identifier: Union[str, Dict]) -> str:
         """生成缓存键"""
-        if isinstance(identifier, dict):
+        if isinstance(identifier, str):
+            content = identifier
+        elif isinstance(identifier, dict):
             # 对字典进行序列化和哈希
-            content = json.dumps(identifier, sort_keys=True)
+            content = _serialize_identifier(identifier)
         else:
             content = str(identifier)
 
-        return f"{namespace}:{hashlib.md5(content.encode()).hexdigest()}"
+        return _hashed_cache_key(namespace, content)
 
     def get(
         self, namespace: str, identifier: Union[str, Dict], max_age_hours: int = 24
@@ -110,9 +230,7 @@ class SmartCacheManager:
         if memory_result is not None:
             cache_data, timestamp = memory_result
             if self._is_cache_valid(timestamp, max_age_hours):
-                with self.lock:
-                    self.stats["hits"] += 1
-                    self.stats["memory_hits"] += 1
+                self.stats["memory_hits"] += 1
                 return cache_data
 
         # 2. 检查文件缓存
@@ -122,20 +240,18 @@ class SmartCacheManager:
             if self._is_cache_valid(timestamp, max_age_hours):
                 # 提升到内存缓存
                 self.memory_cache.put(cache_key, (cache_data, timestamp))
-                with self.lock:
-                    self.stats["hits"] += 1
-                    self.stats["file_hits"] += 1
+                self.stats["file_hits"] += 1
                 return cache_data
 
         # 缓存未命中
-        with self.lock:
-            self.stats["misses"] += 1
+        self.stats["misses"] += 1
         return None
 
     def put(self, namespace: str, identifier: Union[str, Dict], data: Any) -> None:
         """存储缓存数据"""
         cache_key = self._generate_cache_key(namespace, identifier)
-        timestamp = datetime.now().isoformat()
+        # 时间戳使用 epoch 秒，有效期检查只需一次浮点减法
+        timestamp = time.time()
 
         # 存储到内存缓存
         self.memory_cache.put(cache_key, (data, timestamp))
@@ -143,30 +259,45 @@ class SmartCacheManager:
         # 异步存储到文件缓存
         self._put_to_file_cache_async(cache_key, data, timestamp)
 
-        with self.lock:
-            self.stats["puts"] += 1
+        self.stats["puts"] += 1
 
-    def _is_cache_valid(self, timestamp: str, max_age_hours: int) -> bool:
+    def _is_cache_valid(self, timestamp: float, max_age_hours: int) -> bool:
         """检查缓存是否有效"""
-        try:
-            cached_time = datetime.fromisoformat(timestamp)
-            age = datetime.now() - cached_time
-            return age < timedelta(hours=max_age_hours)
-        except:
-            return False
+        if not isinstance(timestamp, float):
+            timestamp = self._coerce_timestamp(timestamp)
+            if timestamp is None:
+                return False
+        return time.time() - timestamp < max_age_hours * 3600
+
+    @staticmethod
+    def _coerce_timestamp(timestamp: Any) -> Optional[float]:
+        """将旧格式（ISO字符串）或整数时间戳转换为 epoch 秒，无法识别时返回None"""
+        if isinstance(timestamp, int):
+            return float(timestamp)
+        if isinstance(timestamp, str):
+            try:
+                return float(timestamp)
+            except ValueError:
+                pass
+            try:
+                return datetime.fromisoformat(timestamp).timestamp()
+            except ValueError:
+                pass
+        return None
 
     def _get_from_file_cache(self, cache_key: str) -> Optional[tuple]:
         """从文件缓存获取数据"""
-        try:
-            if not self.file_cache_path.exists():
-                return None
+        if self._db is None:
+            return None
 
-            with open(self.file_cache_path, "r", encoding="utf-8") as f:
-                file_cache = json.load(f)
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT data, timestamp FROM cache WHERE key = ?", (cache_key,)
+                ).fetchone()
 
-            if cache_key in file_cache:
-                cache_entry = file_cache[cache_key]
-                return cache_entry["data"], cache_entry["timestamp"]
+            if row is not None:
+                return _decode_payload(row[0]), row[1]
 
         except Exception as e:
             print(f"⚠️ 文件缓存读取失败: {e}")
@@ -174,115 +305,175 @@ class SmartCacheManager:
         return None
 
     def _put_to_file_cache_async(
-        self, cache_key: str, data: Any, timestamp: str
+        self, cache_key: str, data: Any, timestamp: float
     ) -> None:
-        """异步存储到文件缓存"""
-
-        def save_to_file():
+        """异步存储到文件缓存（放入写入队列，由后台线程写入）"""
+        if self._db is None:
+            return
+
+        _PENDING_WRITES.add(self)
+        self._write_queue.put((cache_key, data, timestamp))
+
+    def _writer_loop(self) -> None:
+        """后台写入线程：取出队列中积压的全部条目，合并到一个事务写入"""
+        while True:
+            batch = [self._write_queue.get()]
+            # 稍作等待，让连续的 put 合并到同一批次（同一个事务）
+            time.sleep(_WRITE_COALESCE_DELAY)
             try:
-                # 读取现有缓存
-                file_cache = {}
-                if self.file_cache_path.exists():
-                    with open(self.file_cache_path, "r", encoding="utf-8") as f:
-                        file_cache = json.load(f)
-
-                # 添加新缓存项
-                file_cache[cache_key] = {"data": data, "timestamp": timestamp}
-
-                # 限制文件缓存大小
-                if len(file_cache) > 5000:
-                    # 删除最旧的缓存项
-                    sorted_items = sorted(
-                        file_cache.items(), key=lambda x: x[1]["timestamp"]
-                    )
-                    # 保留最新的4000项
-                    file_cache = dict(sorted_items[-4000:])
-
-                # 写回文件
-                with open(self.file_cache_path, "w", encoding="utf-8") as f:
-                    json.dump(file_cache, f, ensure_ascii=False, indent=2)
+                while True:
+                    batch.append(self._write_queue.get_nowait())
+            except queue.Empty:
+                pass
 
+            try:
+                self._write_batch(batch)
             except Exception as e:
                 print(f"⚠️ 文件缓存写入失败: {e}")
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
 
-        # 使用线程异步执行
-        import threading
+    def _write_batch(self, batch: list) -> None:
+        """把一批 (cache_key, data, timestamp) 写入文件缓存"""
+        # 同一批次中重复的键只写最后一次
+        latest = {cache_key: (data, timestamp) for cache_key, data, timestamp in batch}
 
-        threading.Thread(target=save_to_file, daemon=True).start()
+        rows = []
+        for cache_key, (data, timestamp) in latest.items():
+            try:
+                payload = _encode_payload(data)
+            except (TypeError, ValueError) as e:
+                print(f"⚠️ 文件缓存写入失败: {e}")
+                continue
+            rows.append((cache_key, payload, timestamp))
+
+        with self._db_lock:
+            # 批量 upsert 放在一个事务中，无需读取和重写整个缓存
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO cache (key, data, timestamp)"
+                    " VALUES (?, ?, ?)",
+                    rows,
+                )
+            except sqlite3.Error:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+            self._file_cache_rows += len(rows)
+            if self._file_cache_rows > _FILE_CACHE_LIMIT:
+                self._evict_oldest_locked()
+
+    def flush(self) -> None:
+        """等待已提交的文件缓存写入全部完成"""
+        self._write_queue.join()
+        _PENDING_WRITES.discard(self)
+
+    def _evict_oldest_locked(self) -> None:
+        """删除最旧的缓存项，只保留最新的 _FILE_CACHE_KEEP 项（调用方需持有 _db_lock）"""
+        self._file_cache_rows = self._db.execute(
+            "SELECT COUNT(*) FROM cache"
+        ).fetchone()[0]
+        if self._file_cache_rows <= _FILE_CACHE_LIMIT:
+            return
+
+        self._db.execute(
+            "DELETE FROM cache WHERE key IN"
+            " (SELECT key FROM cache ORDER BY timestamp LIMIT ?)",
+            (self._file_cache_rows - _FILE_CACHE_KEEP,),
+        )
+        self._file_cache_rows = _FILE_CACHE_KEEP
 
     def clear_expired(self, max_age_hours: int = 24) -> int:
         """清理过期缓存"""
         cleared_count = 0
 
-        try:
-            if not self.file_cache_path.exists():
-                return 0
+        if self._db is None:
+            return 0
 
-            with open(self.file_cache_path, "r", encoding="utf-8") as f:
-                file_cache = json.load(f)
-
-            # 过滤有效缓存
-            valid_cache = {}
-            for key, entry in file_cache.items():
-                if self._is_cache_valid(entry["timestamp"], max_age_hours):
-                    valid_cache[key] = entry
-                else:
-                    cleared_count += 1
-
-            # 写回文件
-            with open(self.file_cache_path, "w", encoding="utf-8") as f:
-                json.dump(valid_cache, f, ensure_ascii=False, indent=2)
+        try:
+            # 过期判断直接交给时间戳索引上的范围删除
+            cutoff = time.time() - max_age_hours * 3600
+            with self._db_lock:
+                cleared_count = self._db.execute(
+                    "DELETE FROM cache WHERE timestamp <= ?", (cutoff,)
+                ).rowcount
+                self._file_cache_rows = max(
+                    0, self._file_cache_rows - cleared_count
+                )
 
         except Exception as e:
             print(f"⚠️ 清理缓存失败: {e}")
 
         return cleared_count
 
-    def get_stats(self) -> Dict[str, Any]:
-        """获取缓存统计信息"""
-        memory_stats = self.memory_cache.get_stats()
-
-        with self.lock:
-            total_requests = self.stats["hits"] + self.stats["misses"]
-            hit_rate = (
-                (self.stats["hits"] / total_requests * 100) if total_requests > 0 else 0
-            )
-
-            return {
-                "total_requests": total_requests,
-                "hit_rate": round(hit_rate, 2),
-                "memory_cache": memory_stats,
-                "stats": dict(self.stats),
-            }
+    def get_stats(self, detailed: bool = True) -> Dict[str, Any]:
+        """获取缓存统计信息
+
+        Args:
+            detailed: 为False时只返回请求总数与命中率，跳过内存缓存统计与
+                各项计数的快照，适合频繁轮询
+        """
+        memory_hits = self.stats["memory_hits"]
+        file_hits = self.stats["file_hits"]
+        misses = self.stats["misses"]
+        hits = memory_hits + file_hits
+        total_requests = hits + misses
+        hit_rate = round(hits / total_requests * 100, 2) if total_requests else 0
+
+        if not detailed:
+            return {"total_requests": total_requests, "hit_rate": hit_rate}
+
+        return {
+            "total_requests": total_requests,
+            "hit_rate": hit_rate,
+            "memory_cache": self.memory_cache.get_stats(),
+            "stats": {
+                "hits": hits,
+                "misses": misses,
+                "puts": self.stats["puts"],
+                "memory_hits": memory_hits,
+                "file_hits": file_hits,
+            },
+        }
 
     def warm_up_cache(self, file_paths: list, contributor_analyzer) -> None:
         """预热缓存 - 预先计算常用数据"""
         print(f"🔥 开始缓存预热，处理 {len(file_paths)} 个文件...")
 
-        # 分批预热，避免内存占用过大
-        batch_size = 100
-        warmed_count = 0
+        # 跳过内存缓存中已有的文件
+        pending_files = [
+            file_path
+            for file_path in file_paths
+            if self.memory_cache.get(
+                self._generate_cache_key("file_contributors", file_path)
+            )
+            is None
+        ]
 
-        for i in range(0, len(file_paths), batch_size):
-            batch_files = file_paths[i : i + batch_size]
-
-            # 预热文件贡献者缓存
-            for file_path in batch_files:
-                cache_key = f"file_contributors:{file_path}"
-                if self.memory_cache.get(cache_key) is None:
-                    try:
-                        contributors = contributor_analyzer.get_file_contributors(
-                            file_path
-                        )
-                        self.put("file_contributors", file_path, contributors)
-                        warmed_count += 1
-                    except Exception as e:
-                        print(f"⚠️ 预热文件 {file_path} 失败: {e}")
-
-            if i % (batch_size * 5) == 0:  # 每500个文件显示一次进度
-                print(
-                    f"  🔥 已预热 {min(i + batch_size, len(file_paths))}/{len(file_paths)} 个文件..."
-                )
+        def warm_up_file(file_path) -> bool:
+            try:
+                contributors = contributor_analyzer.get_file_contributors(file_path)
+            except Exception as e:
+                print(f"⚠️ 预热文件 {file_path} 失败: {e}")
+                return False
+            self.put("file_contributors", file_path, contributors)
+            return True
+
+        warmed_count = 0
+        if pending_files:
+            # 贡献者分析以git调用为主（I/O密集），用线程池并行执行
+            max_workers = min(_WARM_UP_WORKERS, len(pending_files))
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="cache-warm-up"
+            ) as executor:
+                results = executor.map(warm_up_file, pending_files)
+                for done, warmed in enumerate(results, 1):
+                    warmed_count += warmed
+                    if done % _WARM_UP_REPORT_INTERVAL == 0:
+                        print(f"  🔥 已预热 {done}/{len(pending_files)} 个文件...")
 
         print(f"✅ 缓存预热完成，成功预热 {warmed_count} 个文件")
 
@@ -3,16 +3,82 @@ Git Merge Orchestrator - 测试配置管理器
 负责加载和管理统一测试配置
 """
 
-import json
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 from dataclasses import dataclass
 
+# 直接作为脚本运行（python utils/test_config_manager.py）时，将项目根目录加入搜索路径
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-@dataclass
+from utils.file_helper import load_json_file
+
+# 配置校验规则：必需的配置节与测试模式超时时间下限（秒）
+_REQUIRED_SECTIONS = ("test_modes", "test_categories")
+_MIN_MODE_TIMEOUT_SECONDS = 10
+
+
+def _freeze(value: Any) -> Any:
+    """递归地将 dict 转为只读的 MappingProxyType，list 转为 tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# 配置文件不存在时使用的默认配置；模块导入时构建一次，所有管理器共享，因此冻结为只读
+_DEFAULT_CONFIG = _freeze({
+    "test_modes": {
+        "quick": {
+            "description": "快速测试模式",
+            "timeout_seconds": 30,
+            "include_categories": ["health"],
+            "parallel_execution": True,
+            "skip_long_running_tests": True
+        },
+        "full": {
+            "description": "完整测试套件",
+            "timeout_seconds": 900,
+            "include_categories": ["health", "integration", "performance"],
+            "parallel_execution": False,
+            "skip_long_running_tests": False
+        }
+    },
+    "test_categories": {
+        "health": {
+            "description": "健康检查测试",
+            "priority": "high",
+            "timeout_seconds": 60,
+            "retry_count": 1,
+            "tests": ["主项目健康检查", "环境检查"]
+        }
+    },
+    "thresholds": {
+        "success_rate": {
+            "excellent": 95.0,
+            "good": 80.0
+        }
+    }
+})
+
+
+# 配置对象被缓存并在调用方之间共享，因此声明为不可变；
+# 手写 __slots__（兼容 Python 3.7，dataclass 的 slots 参数需要 3.10）省去实例 __dict__
+@dataclass(frozen=True)
 class TestModeConfig:
     """测试模式配置"""
+    __slots__ = (
+        "description",
+        "timeout_seconds",
+        "include_categories",
+        "parallel_execution",
+        "skip_long_running_tests",
+    )
     description: str
     timeout_seconds: int
     include_categories: List[str]
@@ -20,9 +86,10 @@ class TestModeConfig:
     skip_long_running_tests: bool
 
 
-@dataclass
+@dataclass(frozen=True)
 class TestCategoryConfig:
     """测试类别配置"""
+    __slots__ = ("description", "priority", "timeout_seconds", "retry_count", "tests")
     description: str
     priority: str
     timeout_seconds: int
@@ -30,9 +97,15 @@ class TestCategoryConfig:
     tests: List[str]
 
 
-@dataclass
+@dataclass(frozen=True)
 class ScenarioConfig:
     """场景测试配置"""
+    __slots__ = (
+        "description",
+        "main_test_category",
+        "test_environment_scenarios",
+        "expected_duration_seconds",
+    )
     description: str
     main_test_category: str
     test_environment_scenarios: List[str]
@@ -51,15 +124,62 @@ class TestConfigManager:
         else:
             self.config_file = self.project_root / "test_config.json"
             
+        # 延迟加载：构造时不读取文件，首次查询时才加载
         self._config = None
-        self._load_config()
+        # 加载时配置文件的 (mtime_ns, size)，用于检测文件变化；文件不存在时为 None
+        self._stat_key = None
+        # 常用配置节，每次加载后绑定为属性，查询时省去一次顶层字典查找
+        self._modes = None
+        self._categories = None
+        self._scenarios = None
+        self._thresholds = None
+        # 各配置节的名称快照，随加载一同更新
+        self._mode_names = ()
+        self._category_names = ()
+        self._scenario_names = ()
+        # 类别未配置时的默认重试次数（thresholds.retry.max_retries），加载时预先取出
+        self._default_max_retries = 0
+
+        # 按名称缓存构建好的配置对象，重复查询返回同一实例；重新加载配置时清空
+        self._build_mode = lru_cache(maxsize=None)(self._build_mode_config)
+        self._build_category = lru_cache(maxsize=None)(self._build_category_config)
+        self._build_scenario = lru_cache(maxsize=None)(self._build_scenario_config)
+    
+    @property
+    def _cfg(self) -> Mapping[str, Any]:
+        """配置数据，首次访问时才读取配置文件，文件变化后自动重新加载"""
+        self._maybe_reload()
+        return self._config
+    
+    def _config_stat_key(self) -> Optional[Tuple[int, int]]:
+        """配置文件的 (mtime_ns, size)，文件不可访问时返回 None"""
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _maybe_reload(self):
+        """首次访问或配置文件变化（mtime 或大小不同）时加载配置
+
+        只需一次 stat 调用，文件未变化时不重新解析 JSON。
+        """
+        if self._config is None:
+            self._load_config()
+            return
+        
+        stat_key = self._config_stat_key()
+        if stat_key is not None and stat_key != self._stat_key:
+            self._load_config()
     
     def _load_config(self):
         """加载配置文件"""
+        self._clear_caches()
+        self._stat_key = self._config_stat_key()
         try:
             if self.config_file.exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self._config = json.load(f)
+                # 安装了 orjson 时直接解析字节，省去文本解码
+                self._config = load_json_file(self.config_file)
             else:
                 # 使用默认配置
                 self._config = self._get_default_config()
@@ -67,46 +187,34 @@ class TestConfigManager:
         except Exception as e:
             print(f"❌ 加载配置失败: {e}")
             self._config = self._get_default_config()
+        
+        self._modes = self._config.get("test_modes", {})
+        self._categories = self._config.get("test_categories", {})
+        self._scenarios = self._config.get("scenario_definitions", {})
+        self._thresholds = self._config.get("thresholds", {})
+        self._mode_names = tuple(self._modes)
+        self._category_names = tuple(self._categories)
+        self._scenario_names = tuple(self._scenarios)
+        self._default_max_retries = self._thresholds.get("retry", {}).get("max_retries", 0)
     
-    def _get_default_config(self) -> Dict[str, Any]:
-        """获取默认配置"""
-        return {
-            "test_modes": {
-                "quick": {
-                    "description": "快速测试模式",
-                    "timeout_seconds": 30,
-                    "include_categories": ["health"],
-                    "parallel_execution": True,
-                    "skip_long_running_tests": True
-                },
-                "full": {
-                    "description": "完整测试套件",
-                    "timeout_seconds": 900,
-                    "include_categories": ["health", "integration", "performance"],
-                    "parallel_execution": False,
-                    "skip_long_running_tests": False
-                }
-            },
-            "test_categories": {
-                "health": {
-                    "description": "健康检查测试",
-                    "priority": "high",
-                    "timeout_seconds": 60,
-                    "retry_count": 1,
-                    "tests": ["主项目健康检查", "环境检查"]
-                }
-            },
-            "thresholds": {
-                "success_rate": {
-                    "excellent": 95.0,
-                    "good": 80.0
-                }
-            }
-        }
+    def _clear_caches(self):
+        """清空配置对象缓存"""
+        self._build_mode.cache_clear()
+        self._build_category.cache_clear()
+        self._build_scenario.cache_clear()
+    
+    def _get_default_config(self) -> Mapping[str, Any]:
+        """获取默认配置（模块级只读常量，无需每次重新构建）"""
+        return _DEFAULT_CONFIG
     
     def get_test_mode_config(self, mode: str) -> Optional[TestModeConfig]:
         """获取测试模式配置"""
-        mode_data = self._config.get("test_modes", {}).get(mode)
+        self._maybe_reload()
+        return self._build_mode(mode)
+    
+    def _build_mode_config(self, mode: str) -> Optional[TestModeConfig]:
+        """构建测试模式配置对象"""
+        mode_data = self._modes.get(mode)
         if not mode_data:
             return None
             
@@ -118,9 +226,23 @@ class TestConfigManager:
             skip_long_running_tests=mode_data.get("skip_long_running_tests", False)
         )
     
+    def _mode_data(self, mode: str) -> Dict[str, Any]:
+        """测试模式的原始配置字典，模式不存在时返回空字典
+
+        单字段查询直接读取字典，无需构建 TestModeConfig；
+        缺省值与 _build_mode_config 保持一致。
+        """
+        self._maybe_reload()
+        return self._modes.get(mode) or {}
+    
     def get_test_category_config(self, category: str) -> Optional[TestCategoryConfig]:
         """获取测试类别配置"""
-        category_data = self._config.get("test_categories", {}).get(category)
+        self._maybe_reload()
+        return self._build_category(category)
+    
+    def _build_category_config(self, category: str) -> Optional[TestCategoryConfig]:
+        """构建测试类别配置对象"""
+        category_data = self._categories.get(category)
         if not category_data:
             return None
             
@@ -134,7 +256,12 @@ class TestConfigManager:
     
     def get_scenario_config(self, scenario: str) -> Optional[ScenarioConfig]:
         """获取场景配置"""
-        scenario_data = self._config.get("scenario_definitions", {}).get(scenario)
+        self._maybe_reload()
+        return self._build_scenario(scenario)
+    
+    def _build_scenario_config(self, scenario: str) -> Optional[ScenarioConfig]:
+        """构建场景配置对象"""
+        scenario_data = self._scenarios.get(scenario)
         if not scenario_data:
             return None
             
@@ -147,53 +274,54 @@ class TestConfigManager:
     
     def get_available_test_modes(self) -> List[str]:
         """获取可用的测试模式列表"""
-        return list(self._config.get("test_modes", {}).keys())
+        self._maybe_reload()
+        return list(self._mode_names)
     
     def get_available_test_categories(self) -> List[str]:
         """获取可用的测试类别列表"""
-        return list(self._config.get("test_categories", {}).keys())
+        self._maybe_reload()
+        return list(self._category_names)
     
     def get_available_scenarios(self) -> List[str]:
         """获取可用的场景列表"""
-        return list(self._config.get("scenario_definitions", {}).keys())
+        self._maybe_reload()
+        return list(self._scenario_names)
     
     def get_success_rate_threshold(self, level: str = "good") -> float:
         """获取成功率阈值"""
-        return self._config.get("thresholds", {}).get("success_rate", {}).get(level, 80.0)
+        self._maybe_reload()
+        return self._thresholds.get("success_rate", {}).get(level, 80.0)
     
     def get_timeout_for_mode(self, mode: str) -> int:
         """获取测试模式的超时时间"""
-        mode_config = self.get_test_mode_config(mode)
-        return mode_config.timeout_seconds if mode_config else 300
+        return self._mode_data(mode).get("timeout_seconds", 300)
     
     def get_environment_config(self, env_name: str) -> Optional[Dict[str, Any]]:
         """获取环境配置"""
-        return self._config.get("test_environments", {}).get(env_name)
+        return self._cfg.get("test_environments", {}).get(env_name)
     
     def should_retry_on_failure(self, category: str) -> Tuple[bool, int]:
         """检查是否应该重试失败的测试"""
-        category_config = self.get_test_category_config(category)
-        if category_config:
-            return category_config.retry_count > 0, category_config.retry_count
-        
-        # 默认重试配置
-        retry_config = self._config.get("thresholds", {}).get("retry", {})
-        max_retries = retry_config.get("max_retries", 0)
-        return max_retries > 0, max_retries
+        self._maybe_reload()
+        category_data = self._categories.get(category)
+        if category_data:
+            retry_count = category_data.get("retry_count", 0)
+        else:
+            # 默认重试配置
+            retry_count = self._default_max_retries
+        return retry_count > 0, retry_count
     
     def is_parallel_execution_enabled(self, mode: str) -> bool:
         """检查是否启用并行执行"""
-        mode_config = self.get_test_mode_config(mode)
-        return mode_config.parallel_execution if mode_config else False
+        return self._mode_data(mode).get("parallel_execution", False)
     
     def should_skip_long_running_tests(self, mode: str) -> bool:
         """检查是否跳过长时间运行的测试"""
-        mode_config = self.get_test_mode_config(mode)
-        return mode_config.skip_long_running_tests if mode_config else False
+        return self._mode_data(mode).get("skip_long_running_tests", False)
     
     def get_reporting_config(self) -> Dict[str, Any]:
         """获取报告配置"""
-        return self._config.get("reporting", {
+        return self._cfg.get("reporting", {
             "formats": ["text"],
             "default_format": "text",
             "include_environment_info": True
@@ -201,78 +329,85 @@ class TestConfigManager:
     
     def validate_config(self) -> List[str]:
         """验证配置文件的有效性"""
+        self._maybe_reload()
         issues = []
         
         # 检查必需的节
-        required_sections = ["test_modes", "test_categories"]
-        for section in required_sections:
+        for section in _REQUIRED_SECTIONS:
             if section not in self._config:
                 issues.append(f"缺少必需的配置节: {section}")
         
-        # 检查测试模式配置
-        test_modes = self._config.get("test_modes", {})
+        # 检查测试模式配置（格式不是对象的模式只报告，不做后续检查）
+        test_modes = self._modes
+        if not isinstance(test_modes, Mapping):
+            issues.append("配置节 test_modes 格式无效，应为对象")
+            return issues
+        
+        # 可用类别集合只构建一次，引用检查为哈希查找
+        available_categories = frozenset(self._categories)
+        
+        # 单次遍历完成各项检查；超时问题单独收集，保持原有的报告顺序
+        timeout_issues = []
         for mode_name, mode_config in test_modes.items():
+            if not isinstance(mode_config, Mapping):
+                issues.append(f"测试模式 '{mode_name}' 的配置格式无效，应为对象")
+                continue
+            
             if "include_categories" not in mode_config:
                 issues.append(f"测试模式 '{mode_name}' 缺少 include_categories 配置")
             
             # 检查引用的类别是否存在
-            categories = mode_config.get("include_categories", [])
-            available_categories = self.get_available_test_categories()
-            for category in categories:
+            for category in mode_config.get("include_categories", []):
                 if category not in available_categories:
                     issues.append(f"测试模式 '{mode_name}' 引用了不存在的类别 '{category}'")
-        
-        # 检查超时时间的合理性
-        for mode_name, mode_config in test_modes.items():
+            
+            # 检查超时时间的合理性
             timeout = mode_config.get("timeout_seconds", 0)
-            if timeout <= 0:
-                issues.append(f"测试模式 '{mode_name}' 的超时时间无效: {timeout}")
-            elif timeout < 10:
-                issues.append(f"测试模式 '{mode_name}' 的超时时间过短: {timeout}s")
+            is_number = isinstance(timeout, (int, float)) and not isinstance(timeout, bool)
+            if not is_number or timeout <= 0:
+                timeout_issues.append(f"测试模式 '{mode_name}' 的超时时间无效: {timeout}")
+            elif timeout < _MIN_MODE_TIMEOUT_SECONDS:
+                timeout_issues.append(f"测试模式 '{mode_name}' 的超时时间过短: {timeout}s")
         
+        issues.extend(timeout_issues)
         return issues
     
     def print_config_summary(self):
-        """打印配置摘要"""
-        print("📋 测试配置摘要")
-        print("=" * 50)
+        """打印配置摘要（先拼接全部行，再一次性写出）"""
+        self._maybe_reload()
+        lines = ["📋 测试配置摘要", "=" * 50]
         
-        # 测试模式
-        print(f"🎯 可用测试模式: {', '.join(self.get_available_test_modes())}")
+        # 测试模式（直接使用名称快照，无需复制列表）
+        lines.append(f"🎯 可用测试模式: {', '.join(self._mode_names)}")
         
         # 测试类别
-        print(f"📁 可用测试类别: {', '.join(self.get_available_test_categories())}")
+        lines.append(f"📁 可用测试类别: {', '.join(self._category_names)}")
         
         # 场景
-        scenarios = self.get_available_scenarios()
+        scenarios = self._scenario_names
         if scenarios:
-            print(f"🎬 可用测试场景: {', '.join(scenarios)}")
+            lines.append(f"🎬 可用测试场景: {', '.join(scenarios)}")
         
         # 成功率阈值
-        thresholds = self._config.get("thresholds", {}).get("success_rate", {})
-        print(f"📊 成功率阈值: 优秀 {thresholds.get('excellent', 95)}%, 良好 {thresholds.get('good', 80)}%")
+        thresholds = self._thresholds.get("success_rate", {})
+        lines.append(f"📊 成功率阈值: 优秀 {thresholds.get('excellent', 95)}%, 良好 {thresholds.get('good', 80)}%")
         
         # 验证配置
         issues = self.validate_config()
         if issues:
-            print(f"\n⚠️ 配置问题:")
-            for issue in issues:
-                print(f"   • {issue}")
+            lines.append("\n⚠️ 配置问题:")
+            lines.extend(f"   • {issue}" for issue in issues)
         else:
-            print(f"\n✅ 配置验证通过")
+            lines.append("\n✅ 配置验证通过")
         
-        print("=" * 50)
-
+        lines.append("=" * 50)
+        sys.stdout.write("\n".join(lines) + "\n")
 
-# 全局配置管理器实例
-_test_config_manager = None
 
+@lru_cache(maxsize=None)
 def get_test_config_manager() -> TestConfigManager:
-    """获取全局测试配置管理器实例"""
-    global _test_config_manager
-    if _test_config_manager is None:
-        _test_config_manager = TestConfigManager()
-    return _test_config_manager
+    """获取全局测试配置管理器实例（首次调用时创建，之后返回同一实例）"""
+    return TestConfigManager()
 
 
 def main():